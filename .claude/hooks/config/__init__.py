@@ -8,6 +8,11 @@ from pathlib import Path
 # Path to MCP tools configuration
 MCP_TOOLS_CONFIG_PATH = Path(__file__).parent / "mcp_tools.json"
 
+# Connection pool sizing for the requests adapters and urllib3 pool managers of
+# both HTTP clients; HTTPAdapter's defaults (10/10) would cap keep-alive reuse per host
+HTTP_NUM_POOLS = 20
+HTTP_POOL_MAXSIZE = 50
+
 def load_mcp_tools_config():
     """Load MCP tools configuration"""
     try:
@@ -16,4 +21,4 @@ def load_mcp_tools_config():
     except Exception:
         return {}
 
-__all__ = ['MCP_TOOLS_CONFIG_PATH', 'load_mcp_tools_config']
+__all__ = ['MCP_TOOLS_CONFIG_PATH', 'load_mcp_tools_config', 'HTTP_NUM_POOLS', 'HTTP_POOL_MAXSIZE']
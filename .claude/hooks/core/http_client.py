@@ -8,6 +8,8 @@ import logging
 import time
 from typing import Any
 
+from config import HTTP_NUM_POOLS, HTTP_POOL_MAXSIZE
+
 # HTTP client libraries (optional dependencies)
 try:
     import httpx
@@ -96,7 +98,13 @@ class HTTPClientManager:
                             status_forcelist=[429, 500, 502, 503, 504],
                             allowed_methods=["HEAD", "GET", "OPTIONS"]
                         )
-                        adapter = HTTPAdapter(max_retries=retry_strategy)
+                        # One adapter serves both schemes
+                        adapter = HTTPAdapter(
+                            pool_connections=HTTP_NUM_POOLS,
+                            pool_maxsize=HTTP_POOL_MAXSIZE,
+                            pool_block=False,
+                            max_retries=retry_strategy
+                        )
                         self.requests_session.mount("http://", adapter)
                         self.requests_session.mount("https://", adapter)
                     except Exception:
@@ -113,8 +121,9 @@ class HTTPClientManager:
                     status_forcelist=[429, 500, 502, 503, 504]
                 )
                 self.urllib3_pool = PoolManager(
-                    num_pools=10,
-                    maxsize=10,
+                    num_pools=HTTP_NUM_POOLS,
+                    maxsize=HTTP_POOL_MAXSIZE,
+                    block=False,
                     retries=retry,
                     timeout=urllib3.Timeout(connect=5.0, read=10.0)
                 )
@@ -7,10 +7,12 @@ Consolidates all caching implementations into a single, configurable backend
 import hashlib
 import json
 import logging
+import random
 import threading
 import time
 from abc import ABC, abstractmethod
 from collections import OrderedDict
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any, Protocol
 
@@ -46,82 +48,303 @@ class CacheBackend(ABC):
         pass
 
 
+_Entry = tuple[Any, float]
+
+# Halves every 4-bit sketch counter in one bytes.translate pass
+_HALVE_COUNTERS = bytes(i >> 1 for i in range(256))
+
+
+class _CountMinSketch:
+    """Approximate access frequencies in four rows of saturating 4-bit counters"""
+    
+    __slots__ = ('mask', 'rows', 'additions', 'sample_size')
+    
+    DEPTH = 4
+    MAX_COUNT = 15
+    MIN_WIDTH = 64
+    
+    def __init__(self, capacity: int):
+        width = self.MIN_WIDTH
+        while width < 4 * capacity:
+            width <<= 1
+        self.mask = width - 1
+        self.rows = [bytearray(width) for _ in range(self.DEPTH)]
+        self.additions = 0
+        # Counters are aged once this many increments land, so stale heat fades
+        self.sample_size = 10 * max(capacity, 1)
+    
+    def increment(self, key: str) -> None:
+        """Record one access; row slots come from double hashing a single hash()"""
+        h = hash(key)
+        h1, h2 = h & 0xFFFFFFFF, ((h >> 32) & 0xFFFFFFFF) | 1
+        mask = self.mask
+        for row in self.rows:
+            idx = h1 & mask
+            if row[idx] < 15:  # MAX_COUNT
+                row[idx] += 1
+            h1 += h2
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            for row in self.rows:
+                row[:] = row.translate(_HALVE_COUNTERS)
+            self.additions //= 2
+    
+    def estimate(self, key: str) -> int:
+        """Estimated access count, never below the true (aged) count"""
+        h = hash(key)
+        h1, h2 = h & 0xFFFFFFFF, ((h >> 32) & 0xFFFFFFFF) | 1
+        mask = self.mask
+        count = self.MAX_COUNT
+        for row in self.rows:
+            value = row[h1 & mask]
+            if value < count:
+                count = value
+            h1 += h2
+        return count
+    
+    def clear(self) -> None:
+        for row in self.rows:
+            row[:] = bytes(len(row))
+        self.additions = 0
+
+
+class _LRUShard:
+    """One independently locked slice of an InMemoryCache, evicting least recently used"""
+    
+    __slots__ = ('capacity', 'entries', 'lock', 'hits', 'misses')
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.entries: OrderedDict[str, _Entry] = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def lookup(self, key: str) -> _Entry | None:
+        entry = self.entries.get(key)
+        if entry is not None:
+            # Move to end (most recently used)
+            self.entries.move_to_end(key)
+        return entry
+    
+    def store(self, key: str, entry: _Entry) -> None:
+        entries = self.entries
+        # Evict least recently used entries if at capacity
+        while entries and len(entries) >= self.capacity:
+            entries.popitem(last=False)
+        
+        entries[key] = entry
+        entries.move_to_end(key)
+    
+    def remove(self, key: str) -> bool:
+        return self.entries.pop(key, None) is not None
+    
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+class _TinyLFUShard:
+    """
+    One independently locked slice of an InMemoryCache using W-TinyLFU
+    New keys land in a small LRU window; keys leaving it only displace a
+    main-area entry if the sketch says they are accessed more often. Main
+    victims are the least frequent of a few randomly sampled entries, so no
+    recency list is maintained for the bulk of the cache
+    """
+    
+    __slots__ = ('capacity', 'lock', 'hits', 'misses', 'sketch', 'window',
+                 'window_capacity', 'main', 'main_keys', 'main_pos', 'main_capacity')
+    
+    WINDOW_FRACTION = 0.01
+    EVICTION_SAMPLE = 5
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.sketch = _CountMinSketch(capacity)
+        self.window: OrderedDict[str, _Entry] = OrderedDict()
+        self.window_capacity = min(capacity, max(1, int(capacity * self.WINDOW_FRACTION)))
+        self.main: dict[str, _Entry] = {}
+        self.main_keys: list[str] = []  # Indexable copy of main's keys for O(1) sampling
+        self.main_pos: dict[str, int] = {}
+        self.main_capacity = capacity - self.window_capacity
+    
+    def __len__(self) -> int:
+        return len(self.window) + len(self.main)
+    
+    def lookup(self, key: str) -> _Entry | None:
+        self.sketch.increment(key)
+        entry = self.window.get(key)
+        if entry is not None:
+            self.window.move_to_end(key)
+            return entry
+        return self.main.get(key)
+    
+    def store(self, key: str, entry: _Entry) -> None:
+        self.sketch.increment(key)
+        if key in self.main:
+            self.main[key] = entry
+            return
+        
+        window = self.window
+        window[key] = entry
+        window.move_to_end(key)
+        if len(window) > self.window_capacity:
+            self._admit(*window.popitem(last=False))
+    
+    def _admit(self, key: str, entry: _Entry) -> None:
+        """Move a key evicted from the window into main if it beats the sampled victim"""
+        if len(self.main) < self.main_capacity:
+            self._add_main(key, entry)
+            return
+        if not self.main:
+            return
+        
+        main = self.main
+        sample = random.sample(self.main_keys, min(self.EVICTION_SAMPLE, len(self.main_keys)))
+        estimate = self.sketch.estimate
+        victim = min(sample, key=lambda k: (estimate(k), main[k][1]))
+        if estimate(key) > estimate(victim):
+            self._remove_main(victim)
+            self._add_main(key, entry)
+    
+    def _add_main(self, key: str, entry: _Entry) -> None:
+        self.main[key] = entry
+        self.main_pos[key] = len(self.main_keys)
+        self.main_keys.append(key)
+    
+    def _remove_main(self, key: str) -> None:
+        del self.main[key]
+        # Swap the last key into the freed slot so removal stays O(1)
+        pos = self.main_pos.pop(key)
+        last = self.main_keys.pop()
+        if last != key:
+            self.main_keys[pos] = last
+            self.main_pos[last] = pos
+    
+    def remove(self, key: str) -> bool:
+        if self.window.pop(key, None) is not None:
+            return True
+        if key in self.main:
+            self._remove_main(key)
+            return True
+        return False
+    
+    def clear(self) -> None:
+        self.window.clear()
+        self.main.clear()
+        self.main_keys.clear()
+        self.main_pos.clear()
+        self.sketch.clear()
+
+
+_SHARD_POLICIES: dict[str, type[_LRUShard] | type[_TinyLFUShard]] = {
+    'tinylfu': _TinyLFUShard,
+    'lru': _LRUShard,
+}
+
+
 class InMemoryCache(CacheBackend):
-    """Simple in-memory LRU cache with TTL support"""
+    """
+    In-memory cache with TTL support and a pluggable eviction policy
+    'tinylfu' (default) keeps frequently used keys through one-off scans;
+    'lru' is plain least-recently-used. Keys are spread over independently
+    locked shards so concurrent callers rarely contend; the policy runs per shard
+    """
+    
+    MAX_SHARDS = 16
+    MIN_ENTRIES_PER_SHARD = 64
     
-    def __init__(self, max_size: int = 1000, default_ttl: int = 300):
+    def __init__(self, max_size: int = 1000, default_ttl: int = 300,
+                 time_fn: Callable[[], float] = time.monotonic,
+                 shards: int | None = None,
+                 policy: str = 'tinylfu'):
+        if policy not in _SHARD_POLICIES:
+            raise ValueError(f"Unknown cache policy: {policy}")
         self.max_size = max_size
         self.default_ttl = default_ttl
-        self.cache: OrderedDict[str, tuple[Any, float]] = OrderedDict()
-        self.lock = threading.RLock()
-        self.hits = 0
-        self.misses = 0
+        self.policy = policy
+        self._time = time_fn  # Injectable clock, e.g. a fake one in tests
+        
+        # Small caches stay a single shard so the policy sees every key
+        if shards is None:
+            shards = min(self.MAX_SHARDS, max_size // self.MIN_ENTRIES_PER_SHARD)
+        shards = max(1, min(shards, max_size))
+        base, extra = divmod(max_size, shards)
+        shard_cls = _SHARD_POLICIES[policy]
+        self._shards = [shard_cls(base + (1 if i < extra else 0)) for i in range(shards)]
+    
+    def _shard_for(self, key: str) -> _LRUShard | _TinyLFUShard:
+        """Route a key to its shard"""
+        return self._shards[hash(key) % len(self._shards)]
     
     def _is_expired(self, timestamp: float, ttl: int) -> bool:
         """Check if entry is expired"""
-        return time.time() - timestamp > ttl
-    
-    def _evict_lru(self) -> None:
-        """Evict least recently used entry"""
-        if self.cache:
-            self.cache.popitem(last=False)
+        return self._time() - timestamp > ttl
     
     def get(self, key: str) -> tuple[bool, Any]:
         """Get value from cache"""
-        with self.lock:
-            if key not in self.cache:
-                self.misses += 1
+        shard = self._shard_for(key)
+        with shard.lock:
+            entry = shard.lookup(key)
+            if entry is None:
+                shard.misses += 1
                 return False, None
             
-            value, timestamp = self.cache[key]
+            value, timestamp = entry
             if self._is_expired(timestamp, self.default_ttl):
-                del self.cache[key]
-                self.misses += 1
+                shard.remove(key)
+                shard.misses += 1
                 return False, None
             
-            # Move to end (most recently used)
-            self.cache.move_to_end(key)
-            self.hits += 1
+            shard.hits += 1
             return True, value
     
     def set(self, key: str, value: Any, ttl: int | None = None) -> None:
         """Set value in cache"""
-        with self.lock:
-            # Evict if at capacity
-            while len(self.cache) >= self.max_size:
-                self._evict_lru()
-            
-            self.cache[key] = (value, time.time())
-            self.cache.move_to_end(key)
+        shard = self._shard_for(key)
+        with shard.lock:
+            shard.store(key, (value, self._time()))
     
     def delete(self, key: str) -> bool:
         """Delete key from cache"""
-        with self.lock:
-            if key in self.cache:
-                del self.cache[key]
-                return True
-            return False
+        shard = self._shard_for(key)
+        with shard.lock:
+            return shard.remove(key)
     
     def clear(self) -> None:
         """Clear all cache entries"""
-        with self.lock:
-            self.cache.clear()
-            self.hits = 0
-            self.misses = 0
+        for shard in self._shards:
+            with shard.lock:
+                shard.clear()
+                shard.hits = 0
+                shard.misses = 0
     
     def stats(self) -> dict[str, Any]:
         """Get cache statistics"""
-        with self.lock:
-            total = self.hits + self.misses
-            hit_rate = self.hits / total if total > 0 else 0
-            return {
-                'size': len(self.cache),
-                'max_size': self.max_size,
-                'hits': self.hits,
-                'misses': self.misses,
-                'hit_rate': hit_rate,
-                'evictions': max(0, total - len(self.cache))
-            }
+        size = hits = misses = 0
+        for shard in self._shards:
+            with shard.lock:
+                size += len(shard)
+                hits += shard.hits
+                misses += shard.misses
+        total = hits + misses
+        hit_rate = hits / total if total > 0 else 0
+        return {
+            'size': size,
+            'max_size': self.max_size,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hit_rate,
+            'evictions': max(0, total - size),
+            'shards': len(self._shards),
+            'policy': self.policy
+        }
 
 
 class UnifiedCache:
@@ -195,7 +418,8 @@ def create_cache(
     backend_type: str = "memory",
     max_size: int = 1000,
     default_ttl: int = 300,
-    namespace: str = "default"
+    namespace: str = "default",
+    policy: str = "tinylfu"
 ) -> UnifiedCache:
     """
     Factory function to create cache instances
@@ -205,12 +429,13 @@ def create_cache(
         max_size: Maximum number of entries
         default_ttl: Default TTL in seconds
         namespace: Cache namespace
+        policy: Eviction policy ("tinylfu" or "lru")
     
     Returns:
         UnifiedCache instance
     """
     if backend_type == "memory":
-        backend = InMemoryCache(max_size=max_size, default_ttl=default_ttl)
+        backend = InMemoryCache(max_size=max_size, default_ttl=default_ttl, policy=policy)
     else:
         raise ValueError(f"Unknown backend type: {backend_type}")
     
@@ -13,10 +13,16 @@ import os
 import subprocess
 import threading
 import time
+from collections import ChainMap
+from collections.abc import Mapping
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any
 
+# Start each hook in its own process group without a preexec_fn, which is not
+# thread-safe and forces the slow fork+exec path
+NEW_PROCESS_GROUP_KWARGS: dict[str, Any] = {} if os.name == 'nt' else {'process_group': 0}
+
 
 class ExecutionMode(Enum):
     SEQUENTIAL = "sequential"
@@ -52,7 +58,6 @@ class ParallelHookExecutor:
         self.max_workers = max_workers
         self.max_concurrent = max_concurrent
         self.thread_pool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
-        self.semaphore = asyncio.Semaphore(max_concurrent)
         self.active_commands: dict[str, subprocess.Popen] = {}
         self.results_cache: dict[str, ExecutionResult] = {}
         self.execution_stats = {
@@ -120,11 +125,12 @@ class ParallelHookExecutor:
         # Sort by priority (higher first)
         sorted_commands = sorted(commands, key=lambda x: x.priority, reverse=True)
 
+        # Semaphore is created per call so it binds to the running loop and keeps
+        # the in-flight set bounded to max_concurrent
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+
         # Create execution tasks
-        tasks = []
-        for command in sorted_commands:
-            task = self._create_execution_task(command)
-            tasks.append(task)
+        tasks = [self._create_execution_task(command, semaphore) for command in sorted_commands]
 
         # Execute with controlled concurrency
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -148,20 +154,20 @@ class ParallelHookExecutor:
 
         return processed_results
 
-    async def _create_execution_task(self, command: HookCommand) -> ExecutionResult:
+    async def _create_execution_task(self, command: HookCommand,
+                                     semaphore: asyncio.Semaphore) -> ExecutionResult:
         """Create an async task for command execution"""
-        async with self.semaphore:  # Control concurrency
+        async with semaphore:  # Control concurrency
             return await self._execute_single_command(command)
 
     async def _execute_single_command(self, command: HookCommand) -> ExecutionResult:
         """Execute a single command asynchronously"""
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         try:
-            # Prepare environment
-            env = os.environ.copy()
-            if command.environment:
-                env.update(command.environment)
+            # Overlay overrides on the parent environment without copying it;
+            # subprocess only iterates items(), and None inherits os.environ as-is
+            env = ChainMap(command.environment, os.environ) if command.environment else None
 
             # Execute command
             loop = asyncio.get_event_loop()
@@ -174,7 +180,7 @@ class ParallelHookExecutor:
                 command.working_dir
             )
 
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
 
             return_code, stdout, stderr = result
             success = return_code == 0
@@ -192,7 +198,7 @@ class ParallelHookExecutor:
             )
 
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             self.logger.error(f"Command execution failed: {command.command}, Error: {e}")
 
             return ExecutionResult(
@@ -205,7 +211,7 @@ class ParallelHookExecutor:
                 error=str(e)
             )
 
-    def _run_subprocess(self, command: str, timeout: int, env: dict[str, str],
+    def _run_subprocess(self, command: str, timeout: int, env: Mapping[str, str] | None,
                        working_dir: str | None) -> tuple[int, str, str]:
         """Run subprocess synchronously (called from thread pool)"""
 
@@ -219,7 +225,7 @@ class ParallelHookExecutor:
                 text=True,
                 env=env,
                 cwd=working_dir,
-                preexec_fn=os.setsid if os.name != 'nt' else None
+                **NEW_PROCESS_GROUP_KWARGS
             )
 
             # Track active process
@@ -35,12 +35,17 @@ from .parallel_integration import (
     create_parallel_mcp_executor,
     create_workflow_orchestrator,
     run_parallel_analysis,
+    shutdown_parallel_analysis,
 )
 from .process_management import ProcessManager, create_process_manager, find_and_kill_zombie_processes
 from .workflows import (
+    GitHubSwarmInstructions,
+    SwarmInstructions,
+    ZenInstructions,
     create_zen_consultation_task,
     extract_consultation_data,
     generate_coordination_output,
+    get_thinking_keywords_for_complexity,
     judge_and_spawn_agents_functional,
     merge_analysis_with_consultation,
     run_claude_flow_swarm_orchestration,
@@ -63,6 +68,7 @@ __all__ = [
     'create_parallel_mcp_executor',
     'create_workflow_orchestrator',
     'run_parallel_analysis',
+    'shutdown_parallel_analysis',
 
     # HTTP Client
     'UserPromptHTTPClientManager',
@@ -102,6 +108,9 @@ __all__ = [
     'run_mcp_tool_command',
 
     # Workflows
+    'ZenInstructions',
+    'SwarmInstructions',
+    'GitHubSwarmInstructions',
     'create_zen_consultation_task',
     'run_zen_consultation_functional',
     'run_claude_flow_swarm_orchestration',
@@ -111,5 +120,6 @@ __all__ = [
     'extract_consultation_data',
     'merge_analysis_with_consultation',
     'judge_and_spawn_agents_functional',
-    'generate_coordination_output'
+    'generate_coordination_output',
+    'get_thinking_keywords_for_complexity'
 ]
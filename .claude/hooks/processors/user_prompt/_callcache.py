@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Persistent call cache for workflow instruction generators
+
+Identical prompts produce identical instructions, so results can be kept on
+disk keyed by a content hash. Off by default: opening the cache in a fresh hook
+process costs more than rebuilding the instructions, and entries hold raw
+prompts. Set CLAUDE_WORKFLOW_CALLCACHE=1 to enable it.
+"""
+
+import contextlib
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import diskcache
+
+# Bump whenever generated instruction text changes so stale entries are ignored
+WORKFLOW_VERSION = 5
+
+CALLCACHE_DIR = Path(__file__).resolve().parents[3] / 'cache' / 'workflow_callcache'
+CALLCACHE_TTL_SECONDS = 24 * 60 * 60
+CALLCACHE_ENABLED = os.environ.get('CLAUDE_WORKFLOW_CALLCACHE', '0') == '1'
+
+logger = logging.getLogger(__name__)
+
+_cache: 'diskcache.Cache | None' = None
+_cache_lock = threading.Lock()
+
+
+def _get_cache() -> 'diskcache.Cache':
+    """Import diskcache and open the cache on first use so importing this module stays cheap"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                import diskcache
+                _cache = diskcache.Cache(str(CALLCACHE_DIR))
+    return _cache
+
+
+def args_key(*args) -> str:
+    """Content hash of the JSON-serializable arguments of a cached call"""
+    payload = json.dumps(args, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def cached(func):
+    """
+    Memoize a pure instruction builder on disk, keyed on its arguments.
+    Wrap only builders whose arguments are exactly the fields that shape the
+    output, and keep side effects such as logging in the caller.
+    Cache failures never break the hook: the wrapped function just runs.
+    """
+    prefix = f"{func.__name__}:v{WORKFLOW_VERSION}:"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not CALLCACHE_ENABLED:
+            return func(*args, **kwargs)
+
+        try:
+            key = prefix + args_key(*args, *sorted(kwargs.items()))
+            hit = _get_cache().get(key)
+        except Exception as e:
+            logger.debug(f"Workflow call cache unavailable: {e}")
+            return func(*args, **kwargs)
+
+        if hit is not None:
+            return hit
+
+        result = func(*args, **kwargs)
+        with contextlib.suppress(Exception):
+            _get_cache().set(key, result, expire=CALLCACHE_TTL_SECONDS)
+        return result
+
+    return wrapper
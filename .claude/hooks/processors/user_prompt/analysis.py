@@ -3,6 +3,7 @@
 Analysis and detection functions for user prompt processing
 """
 
+import hashlib
 import logging
 import os
 import re
@@ -10,6 +11,11 @@ import subprocess
 from functools import lru_cache
 from typing import Any
 
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 
 # Import cache decorators for enhanced caching
 # Define fallback decorators since cache_integration.py was removed
@@ -39,8 +45,11 @@ except ImportError:
 
 @lru_cache(maxsize=128)
 def cached_prompt_hash(prompt: str) -> str:
-    """Generate a cached hash for the prompt"""
-    return str(hash(prompt))
+    """Generate a stable hash for the prompt, usable as a cache key across processes"""
+    data = prompt.encode('utf-8', 'surrogatepass')
+    if xxhash is not None:
+        return xxhash.xxh3_128_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
 
 
 @cached_prompt_operation(ttl=600, key_prefix="expensive_analysis")
@@ -5,32 +5,29 @@ Integrates ParallelHookExecutor for advanced concurrent process management
 """
 
 import asyncio
-import concurrent.futures
 import contextlib
+import functools
 import logging
-import multiprocessing
 import os
+import shlex
 import signal
 import subprocess
-import sys
 import threading
 import time
+from collections.abc import Iterator
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
-from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 import psutil
 
-# Add parent directory to path to import parallel_executor
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 # Initialize at module level
 PARALLEL_EXECUTOR_AVAILABLE = False
 
 # Type definitions for when parallel_executor is not available
 if TYPE_CHECKING:
-    from parallel_executor import (
+    from ..async_ops.parallel_executor import (
+        NEW_PROCESS_GROUP_KWARGS,
         ContextSharedExecutor,
         ExecutionMode,
         ExecutionResult,
@@ -41,7 +38,8 @@ if TYPE_CHECKING:
 else:
     # Runtime imports with fallbacks
     try:
-        from parallel_executor import (
+        from ..async_ops.parallel_executor import (
+            NEW_PROCESS_GROUP_KWARGS,
             ContextSharedExecutor,
             ExecutionMode,
             ExecutionResult,
@@ -53,6 +51,9 @@ else:
     except ImportError:
         PARALLEL_EXECUTOR_AVAILABLE = False
 
+        # Popen kwargs that start each child in its own session (and process group)
+        NEW_PROCESS_GROUP_KWARGS: dict[str, Any] = {} if os.name == 'nt' else {'start_new_session': True}
+
         # Create stub classes for type safety
         class ParallelHookExecutor:  # type: ignore
             def __init__(self, *args, **kwargs): pass
@@ -84,8 +85,10 @@ else:
 # Constants
 PROCESS_TERMINATE_TIMEOUT = 3  # seconds
 DEFAULT_COMMAND_TIMEOUT = 60  # seconds
+PIPE_DRAIN_TIMEOUT = 0.05  # seconds
 MAX_PARALLEL_PROCESSES = 8
 CLEANUP_AGE_THRESHOLD = 900  # 15 minutes
+BATCH_TIMEOUT_BUFFER = 10  # seconds
 
 
 @dataclass
@@ -99,6 +102,25 @@ class ProcessExecutionRequest:
     parallel_eligible: bool = True
     retry_count: int = 0
     shell: bool = False
+    argv: list[str] | None = None
+
+    def __post_init__(self) -> None:
+        # Tokenize once so retries and fallbacks reuse the parsed argv
+        if self.argv is None and not self.shell:
+            # Unbalanced quotes are reported when the command is executed
+            with contextlib.suppress(ValueError):
+                self.argv = list(_split_command(self.command))
+
+
+def _decode_output(data: bytes | None) -> str:
+    """Decode captured process output once, tolerating invalid UTF-8"""
+    return data.decode('utf-8', errors='replace') if data else ""
+
+
+@functools.lru_cache(maxsize=1024)
+def _split_command(cmd: str) -> tuple[str, ...]:
+    """Split a command string into argv, honouring shell-style quoting"""
+    return tuple(shlex.split(cmd))
 
 
 class EnhancedProcessManager:
@@ -108,21 +130,24 @@ class EnhancedProcessManager:
     """
 
     def __init__(self, logger: logging.Logger | None = None,
-                 max_workers: int = 4, max_concurrent: int = MAX_PARALLEL_PROCESSES):
+                 max_workers: int = 4, max_concurrent: int = MAX_PARALLEL_PROCESSES,
+                 process_workers: int | None = None):
         self.logger = logger or logging.getLogger(__name__)
         self.max_workers = max_workers
         self.max_concurrent = max_concurrent
+        self._process_workers = process_workers
 
-        # Traditional executors
-        self.active_processes: list[subprocess.Popen[str]] = []
-        self._thread_executor = ThreadPoolExecutor(max_workers=max_workers)
-        self._process_executor = ProcessPoolExecutor(max_workers=multiprocessing.cpu_count())
+        # Traditional executors, created on first use (see the properties below)
+        self.active_processes: dict[int, subprocess.Popen[bytes]] = {}  # keyed by pid
+        self._thread_executor: ThreadPoolExecutor | None = None
+        self._process_executor: ProcessPoolExecutor | None = None
         self._lock = threading.RLock()
 
         # Enhanced parallel execution with proper type annotations
         self.parallel_executor: ParallelHookExecutor | None = None
         self.context_executor: ContextSharedExecutor | None = None
         self.parallel_enabled = False
+        self._shared_context: dict[str, Any] = {}
 
         if PARALLEL_EXECUTOR_AVAILABLE:
             try:
@@ -144,11 +169,40 @@ class EnhancedProcessManager:
             'total_commands': 0,
             'parallel_commands': 0,
             'sequential_commands': 0,
-            'average_execution_time': 0.0,
+            'total_execution_time': 0.0,
             'success_rate': 0.0,
             'parallel_efficiency_gain': 0.0
         }
 
+    @classmethod
+    def from_env(cls, logger: logging.Logger | None = None) -> 'EnhancedProcessManager':
+        """Create a manager sized by PROCESS_MGR_THREAD_WORKERS / PROCESS_MGR_PROCESS_WORKERS"""
+        thread_workers = os.environ.get('PROCESS_MGR_THREAD_WORKERS')
+        process_workers = os.environ.get('PROCESS_MGR_PROCESS_WORKERS')
+        return cls(
+            logger,
+            max_workers=int(thread_workers) if thread_workers else 4,
+            process_workers=int(process_workers) if process_workers else None
+        )
+
+    @property
+    def thread_executor(self) -> ThreadPoolExecutor:
+        """Thread pool sized by max_workers, created on first access"""
+        if self._thread_executor is None:
+            with self._lock:
+                if self._thread_executor is None:
+                    self._thread_executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._thread_executor
+
+    @property
+    def process_executor(self) -> ProcessPoolExecutor:
+        """Process pool (one worker per CPU unless sized), created on first access"""
+        if self._process_executor is None:
+            with self._lock:
+                if self._process_executor is None:
+                    self._process_executor = ProcessPoolExecutor(max_workers=self._process_workers)
+        return self._process_executor
+
     def log(self, level: str, message: str) -> None:
         """Log a message using the configured logger"""
         getattr(self.logger, level)(message)
@@ -159,31 +213,29 @@ class EnhancedProcessManager:
         Returns True if successful, False otherwise
         """
         try:
+            if self._kill_process_group(pid):
+                self.log('info', f"Successfully killed process group for PID {pid}")
+                return True
+
             parent = psutil.Process(pid)
             children = parent.children(recursive=True)
 
-            self.log('debug', f"Killing process tree for PID {pid} with {len(children)} children")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Killing process tree for PID %s with %d children", pid, len(children))
 
-            # Kill children first
-            for child in children:
+            # Terminate the whole tree (children before the parent) and wait on
+            # every process at once, so the grace period is paid once, not twice
+            victims = [*children, parent]
+            for victim in victims:
                 with contextlib.suppress(psutil.NoSuchProcess):
-                    child.terminate()
+                    victim.terminate()
 
-            # Give them time to terminate gracefully
-            _, alive = psutil.wait_procs(children, timeout=PROCESS_TERMINATE_TIMEOUT)
+            _, alive = psutil.wait_procs(victims, timeout=PROCESS_TERMINATE_TIMEOUT)
 
             # Force kill any remaining
-            for p in alive:
-                with contextlib.suppress(psutil.NoSuchProcess):
-                    p.kill()
-
-            # Finally kill the parent
-            try:
-                parent.terminate()
-                parent.wait(timeout=3)
-            except (psutil.NoSuchProcess, psutil.TimeoutExpired):
+            for victim in alive:
                 with contextlib.suppress(psutil.NoSuchProcess):
-                    parent.kill()
+                    victim.kill()
 
             self.log('info', f"Successfully killed process tree for PID {pid}")
             return True
@@ -192,6 +244,90 @@ class EnhancedProcessManager:
             self.log('warning', f"Error killing process tree for PID {pid}: {e}")
             return False
 
+    def kill_process_trees(self, pids: list[int]) -> None:
+        """
+        Kill several process trees, signalling all of them before any waiting
+        Own-session groups get one killpg each, other trees are walked with psutil;
+        a single wait then covers everything, so the grace period is paid once
+        """
+        own_pgrp = os.getpgrp() if os.name != 'nt' else None
+        groups: set[int] = set()
+        victims: list[psutil.Process] = []
+
+        for pid in pids:
+            try:
+                parent = psutil.Process(pid)
+                if own_pgrp is not None:
+                    pgid = os.getpgid(pid)
+                    # Never signal our own group; only groups created via a new session
+                    if pgid == pid and pgid != own_pgrp:
+                        try:
+                            os.killpg(pgid, signal.SIGTERM)
+                            groups.add(pgid)
+                            victims.append(parent)
+                            continue
+                        except PermissionError:
+                            pass  # Fall back to walking the tree
+
+                tree = [*parent.children(recursive=True), parent]
+                for victim in tree:
+                    with contextlib.suppress(psutil.NoSuchProcess):
+                        victim.terminate()
+                victims.extend(tree)
+
+            except (ProcessLookupError, psutil.NoSuchProcess):
+                continue  # Already gone
+            except Exception as e:
+                self.log('warning', f"Error killing process tree for PID {pid}: {e}")
+
+        if not victims:
+            return
+
+        try:
+            _, alive = psutil.wait_procs(victims, timeout=PROCESS_TERMINATE_TIMEOUT)
+        except Exception as e:
+            self.log('warning', f"Error waiting on process trees: {e}")
+            alive = victims
+
+        # Force kill any remaining, by group where one was used
+        for victim in alive:
+            if victim.pid in groups:
+                with contextlib.suppress(ProcessLookupError, PermissionError):
+                    os.killpg(victim.pid, signal.SIGKILL)
+            else:
+                with contextlib.suppress(psutil.NoSuchProcess):
+                    victim.kill()
+
+        self.log('info', f"Killed process trees for PIDs {pids}")
+
+    def _kill_process_group(self, pid: int) -> bool:
+        """
+        Signal the whole process group led by pid with one killpg per signal
+        Returns False when pid does not lead its own group (or on Windows), so
+        the caller falls back to walking the tree with psutil
+        """
+        if os.name == 'nt':
+            return False
+
+        try:
+            pgid = os.getpgid(pid)
+            # Never signal our own group; only groups created via a new session
+            if pgid != pid or pgid == os.getpgrp():
+                return False
+
+            os.killpg(pgid, signal.SIGTERM)
+            try:
+                psutil.Process(pid).wait(timeout=PROCESS_TERMINATE_TIMEOUT)
+            except psutil.TimeoutExpired:
+                os.killpg(pgid, signal.SIGKILL)
+            return True
+
+        except (ProcessLookupError, psutil.NoSuchProcess):
+            # Already gone
+            return True
+        except PermissionError:
+            return False
+
     async def execute_commands_parallel_advanced(self,
                                                requests: list[ProcessExecutionRequest],
                                                execution_mode: str | None = None,
@@ -202,18 +338,16 @@ class EnhancedProcessManager:
         if not self.parallel_enabled or not requests or not self.parallel_executor:
             return await self._fallback_parallel_execution(requests)
 
-        # Convert requests to HookCommands
+        # Convert requests to HookCommands. The executor layers each command's
+        # environment over os.environ itself, so only the overrides are passed
+        # (copied, since shared-context execution writes into them)
         hook_commands = []
         for req in requests:
-            env = os.environ.copy()
-            if req.environment:
-                env.update(req.environment)
-
             hook_command = HookCommand(
                 command=req.command,
                 timeout=req.timeout,
                 parallel=req.parallel_eligible,
-                environment=env,
+                environment=dict(req.environment) if req.environment else None,
                 working_dir=req.working_dir,
                 retry_count=req.retry_count,
                 priority=req.priority
@@ -265,45 +399,75 @@ class EnhancedProcessManager:
 
     async def _fallback_parallel_execution(self,
                                          requests: list[ProcessExecutionRequest]) -> list[ExecutionResult]:
-        """Fallback to basic parallel execution when advanced features fail"""
-        results: list[ExecutionResult] = []
+        """
+        Fallback to basic parallel execution when advanced features fail
+        Results come back in request order; each request keeps its own future, so
+        a deadline only fails the requests that had not finished by then
+        """
+        if not requests:
+            return []
+
         start_time = time.time()
+        worker_count = max(1, min(self.max_workers, len(requests)))
 
-        # Use traditional ThreadPoolExecutor for fallback
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = []
-            for req in requests:
-                future = executor.submit(self._execute_single_request, req)
-                futures.append(future)
+        # One deadline for the whole batch, computed once: every worker running
+        # its share of requests to their longest timeout, plus a buffer
+        rounds = -(-len(requests) // worker_count)
+        batch_timeout = rounds * max(req.timeout for req in requests) + BATCH_TIMEOUT_BUFFER
 
-            for future in concurrent.futures.as_completed(futures):
+        # Use traditional ThreadPoolExecutor for fallback; futures are awaited
+        # through the event loop so other coroutines keep running meanwhile
+        executor = ThreadPoolExecutor(max_workers=worker_count)
+        loop = asyncio.get_running_loop()
+        try:
+            futures = [
+                loop.run_in_executor(executor, self._execute_single_request, req)
+                for req in requests
+            ]
+            await asyncio.wait(futures, timeout=batch_timeout)
+
+            deadline_error = TimeoutError(f"Batch timed out after {batch_timeout} seconds")
+            results: list[ExecutionResult] = []
+            for req, future in zip(requests, futures, strict=True):
+                if not future.done():
+                    # Still queued or running at the deadline
+                    future.cancel()
+                    results.append(self._error_result(req, deadline_error))
+                    continue
                 try:
-                    result = future.result(timeout=max(req.timeout for req in requests) + 10)
-                    results.append(result)
+                    results.append(future.result())
                 except Exception as e:
-                    error_result = ExecutionResult(
-                        command="unknown",
-                        return_code=-1,
-                        stdout="",
-                        stderr=str(e),
-                        execution_time=0.0,
-                        success=False,
-                        error=str(e)
-                    )
-                    results.append(error_result)
+                    results.append(self._error_result(req, e))
+        finally:
+            # Stragglers are still bounded by their own command timeouts
+            executor.shutdown(wait=False, cancel_futures=True)
 
         execution_time = time.time() - start_time
         self._update_stats(len(requests), execution_time, results, parallel=False)
 
         return results
 
+    @staticmethod
+    def _error_result(request: ProcessExecutionRequest, error: BaseException) -> ExecutionResult:
+        """Build a failed ExecutionResult for a request that produced no result"""
+        message = str(error) or type(error).__name__
+        return ExecutionResult(
+            command=request.command,
+            return_code=-1,
+            stdout="",
+            stderr=message,
+            execution_time=0.0,
+            success=False,
+            error=message
+        )
+
     def _execute_single_request(self, request: ProcessExecutionRequest) -> ExecutionResult:
         """Execute a single process request and return ExecutionResult"""
         start_time = time.time()
 
         try:
             return_code, stdout, stderr = self.execute_command(
-                request.command,
+                request.argv if request.argv is not None else request.command,
                 timeout=request.timeout,
                 shell=request.shell,
                 env=request.environment,
@@ -334,53 +498,56 @@ class EnhancedProcessManager:
                 error=str(e)
             )
 
-    def execute_command(self, cmd: str, timeout: int = DEFAULT_COMMAND_TIMEOUT,
+    def execute_command(self, cmd: str | list[str], timeout: int = DEFAULT_COMMAND_TIMEOUT,
                        shell: bool = False, env: dict[str, str] | None = None,
-                       cwd: str | None = None) -> tuple[int, str, str]:
+                       cwd: str | None = None, capture_output: bool = True) -> tuple[int, str, str]:
         """
         Execute a command with enhanced process management
-        Returns: (return_code, stdout, stderr)
+        Returns: (return_code, stdout, stderr); with capture_output=False output
+        goes to /dev/null and stdout/stderr come back empty
         """
-        self.log('debug', f"Executing command: {cmd}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Executing command: %s", cmd)
 
         try:
-            # Prepare environment
-            process_env = os.environ.copy()
-            if env:
-                process_env.update(env)
+            # Only build a merged environment when there are overrides; None makes
+            # the child inherit os.environ without any Python-level copy
+            process_env = {**os.environ, **env} if env else None
+            # Without pipes, communicate() below reduces to a plain wait()
+            output = subprocess.PIPE if capture_output else subprocess.DEVNULL
 
             # For shell commands, use process groups to ensure all children can be killed
             if shell:
                 process = subprocess.Popen(
                     cmd,
                     shell=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
+                    stdout=output,
+                    stderr=output,
                     env=process_env,
                     cwd=cwd,
-                    preexec_fn=os.setsid if os.name != 'nt' else None
+                    **NEW_PROCESS_GROUP_KWARGS
                 )
             else:
                 # Split command into list for non-shell execution
-                cmd_list = cmd.split() if isinstance(cmd, str) else cmd
+                cmd_list = list(_split_command(cmd)) if isinstance(cmd, str) else cmd
                 process = subprocess.Popen(
                     cmd_list,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
+                    stdout=output,
+                    stderr=output,
                     env=process_env,
                     cwd=cwd
                 )
 
             with self._lock:
-                self.active_processes.append(process)
+                self.active_processes[process.pid] = process
 
             try:
-                stdout, stderr = process.communicate(timeout=timeout)
+                raw_stdout, raw_stderr = process.communicate(timeout=timeout)
+                stdout, stderr = _decode_output(raw_stdout), _decode_output(raw_stderr)
                 return_code = process.returncode
 
-                self.log('debug', f"Command completed with return code: {return_code}")
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug("Command completed with return code: %s", return_code)
                 if stderr and return_code != 0:
                     self.log('warning', f"Command stderr: {stderr}")
 
@@ -393,18 +560,24 @@ class EnhancedProcessManager:
                 # Kill the entire process group if shell command
                 if shell and os.name != 'nt':
                     try:
-                        os.killpg(os.getpgid(process.pid), signal.SIGTERM)
-                        time.sleep(2)
-                        os.killpg(os.getpgid(process.pid), signal.SIGKILL)
+                        pgid = os.getpgid(process.pid)
+                        os.killpg(pgid, signal.SIGTERM)
+                        # Return as soon as the leader exits instead of always sleeping
+                        with contextlib.suppress(subprocess.TimeoutExpired):
+                            process.wait(timeout=2)
+                        # Reap any stragglers left in the group
+                        os.killpg(pgid, signal.SIGKILL)
                     except ProcessLookupError:
                         pass
                 else:
                     # Use enhanced process tree killing
                     self.kill_process_tree(process.pid)
 
-                # Get any partial output
+                # Collect partial output. The pipes normally hit EOF right after
+                # the kill, so only wait briefly in case a descendant holds them
                 try:
-                    stdout, stderr = process.communicate(timeout=1)
+                    raw_stdout, raw_stderr = process.communicate(timeout=PIPE_DRAIN_TIMEOUT)
+                    stdout, stderr = _decode_output(raw_stdout), _decode_output(raw_stderr)
                 except subprocess.TimeoutExpired:
                     stdout, stderr = "", "Process timed out and was killed"
 
@@ -414,8 +587,7 @@ class EnhancedProcessManager:
             finally:
                 # Remove from active processes
                 with self._lock:
-                    if process in self.active_processes:
-                        self.active_processes.remove(process)
+                    self.active_processes.pop(process.pid, None)
 
         except Exception as e:
             self.log('error', f"Failed to execute command: {e}")
@@ -461,39 +633,36 @@ class EnhancedProcessManager:
 
     def set_shared_context(self, key: str, value: Any) -> None:
         """Set a shared context value for parallel execution"""
-        if hasattr(self, '_shared_context'):
-            self._shared_context[key] = value
-        else:
-            self._shared_context = {key: value}
+        self._shared_context[key] = value
 
     def get_shared_context(self, key: str, default: Any = None) -> Any:
         """Get a shared context value"""
-        return getattr(self, '_shared_context', {}).get(key, default)
+        return self._shared_context.get(key, default)
 
     def update_shared_context(self, updates: dict[str, Any]) -> None:
         """Update multiple shared context values"""
-        if hasattr(self, '_shared_context'):
-            self._shared_context.update(updates)
-        else:
-            self._shared_context = updates.copy()
+        self._shared_context.update(updates)
 
     def get_execution_stats(self) -> dict[str, Any]:
         """Get current execution statistics"""
-        with self._lock:
-            stats = self.execution_stats.copy()
-            stats['active_processes'] = len(self.active_processes)
-            stats['parallel_executor_available'] = self.parallel_enabled
-            stats['max_workers'] = self.max_workers
-            stats['max_concurrent'] = self.max_concurrent
-
-            # Calculate success rate
-            if stats['total_commands'] > 0:
-                stats['success_rate'] = (
-                    (stats['total_commands'] - stats.get('failed_commands', 0)) /
-                    stats['total_commands']
-                ) * 100
-
-            return stats
+        # Lock-free read: dict.copy() and len() are atomic under the GIL, so a
+        # polling reader never blocks workers updating the counters
+        stats = self.execution_stats.copy()
+        stats['active_processes'] = len(self.active_processes)
+        stats['parallel_executor_available'] = self.parallel_enabled
+        stats['max_workers'] = self.max_workers
+        stats['max_concurrent'] = self.max_concurrent
+
+        # Calculate average execution time and success rate
+        stats['average_execution_time'] = 0.0
+        if stats['total_commands'] > 0:
+            stats['average_execution_time'] = stats['total_execution_time'] / stats['total_commands']
+            stats['success_rate'] = (
+                (stats['total_commands'] - stats.get('failed_commands', 0)) /
+                stats['total_commands']
+            ) * 100
+
+        return stats
 
     def _update_stats(self, command_count: int, execution_time: float,
                      results: list[ExecutionResult], parallel: bool) -> None:
@@ -505,14 +674,8 @@ class EnhancedProcessManager:
             else:
                 self.execution_stats['sequential_commands'] += command_count
 
-            # Update average execution time
-            total_time = (
-                self.execution_stats['average_execution_time'] *
-                (self.execution_stats['total_commands'] - command_count)
-            ) + execution_time
-            self.execution_stats['average_execution_time'] = (
-                total_time / self.execution_stats['total_commands']
-            )
+            # Keep a running total; the average is derived on read
+            self.execution_stats['total_execution_time'] += execution_time
 
             # Count failures
             failed_count = sum(1 for r in results if not r.success)
@@ -535,25 +698,25 @@ class EnhancedProcessManager:
         """Clean up all active processes and executors"""
         self.log('info', "Cleaning up all active processes and executors")
 
-        # Kill all active processes
+        # Kill all active processes in one batch
         with self._lock:
-            for process in self.active_processes[:]:
-                try:
-                    self.kill_process_tree(process.pid)
-                except Exception as e:
-                    self.log('warning', f"Error killing process {process.pid}: {e}")
+            pids = [process.pid for process in self.active_processes.values()]
+            if pids:
+                self.kill_process_trees(pids)
             self.active_processes.clear()
 
-        # Shutdown executors
-        try:
-            self._thread_executor.shutdown(wait=True)
-        except Exception as e:
-            self.log('warning', f"Error shutting down thread executor: {e}")
+        # Shutdown executors that were actually created
+        if self._thread_executor is not None:
+            try:
+                self._thread_executor.shutdown(wait=True)
+            except Exception as e:
+                self.log('warning', f"Error shutting down thread executor: {e}")
 
-        try:
-            self._process_executor.shutdown(wait=True)
-        except Exception as e:
-            self.log('warning', f"Error shutting down process executor: {e}")
+        if self._process_executor is not None:
+            try:
+                self._process_executor.shutdown(wait=True)
+            except Exception as e:
+                self.log('warning', f"Error shutting down process executor: {e}")
 
         # Cleanup parallel executor if available
         if self.parallel_enabled and PARALLEL_EXECUTOR_AVAILABLE:
@@ -572,6 +735,58 @@ class EnhancedProcessManager:
             pass  # Ignore errors during cleanup in destructor
 
 
+def _iter_zombie_processes() -> Iterator[dict[str, Any]]:
+    """
+    Yield pid/ppid/name/create_time for every zombie process
+    On Linux this is a single /proc scan that skips non-zombies before any
+    per-process allocation; elsewhere it falls back to psutil
+    """
+    if not os.path.isdir('/proc'):
+        for proc in psutil.process_iter(['status']):
+            with contextlib.suppress(psutil.NoSuchProcess, psutil.AccessDenied):
+                if proc.info['status'] == psutil.STATUS_ZOMBIE:
+                    yield proc.as_dict(attrs=['pid', 'ppid', 'name', 'create_time'])
+        return
+
+    boot_time = psutil.boot_time()
+    clock_ticks = os.sysconf('SC_CLK_TCK')
+
+    for pid_str in os.listdir('/proc'):
+        if not pid_str.isdigit():
+            continue
+        try:
+            with open(f'/proc/{pid_str}/stat', 'rb') as f:
+                buf = f.read()
+        except OSError:
+            # Process exited between listdir and open
+            continue
+
+        # comm may contain spaces or parens, so split on the last ')'
+        head, _, tail = buf.rpartition(b')')
+        fields = tail.split()
+        if not fields or fields[0] != b'Z':
+            continue
+
+        yield {
+            'pid': int(pid_str),
+            'ppid': int(fields[1]),
+            'name': head.partition(b'(')[2].decode('utf-8', errors='replace'),
+            'create_time': boot_time + int(fields[19]) / clock_ticks,
+        }
+
+
+def _reap_own_zombie(pid: int) -> bool:
+    """
+    waitpid() a zombie child of this process without blocking; True if it was reaped
+    Reaping is per-pid on purpose: a SIGCHLD handler draining waitpid(-1) would
+    also collect children that subprocess/asyncio are still going to wait on,
+    and those would then report returncode 0 no matter how they exited
+    """
+    with contextlib.suppress(ChildProcessError, OSError):
+        return os.waitpid(pid, os.WNOHANG)[0] == pid
+    return False
+
+
 def enhanced_find_and_kill_zombie_processes(logger: logging.Logger | None = None) -> int:
     """
     Find and kill zombie processes with enhanced detection
@@ -583,33 +798,35 @@ def enhanced_find_and_kill_zombie_processes(logger: logging.Logger | None = None
     killed_count = 0
 
     try:
-        for proc in psutil.process_iter(['pid', 'ppid', 'name', 'status', 'create_time']):
+        current_time = time.time()
+        own_pid = os.getpid()
+        for info in _iter_zombie_processes():
             try:
-                # Skip if process is not a zombie or if it's too new
-                if proc.info['status'] != psutil.STATUS_ZOMBIE:
+                # Skip if the zombie is too new
+                if current_time - info['create_time'] < CLEANUP_AGE_THRESHOLD:
                     continue
 
-                current_time = time.time()
-                if current_time - proc.info['create_time'] < CLEANUP_AGE_THRESHOLD:
-                    continue
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Found zombie process: PID %s, name: %s", info['pid'], info['name'])
 
-                if logger:
-                    logger.debug(f"Found zombie process: PID {proc.info['pid']}, "
-                               f"name: {proc.info['name']}")
+                # Our own child: reap it directly instead of signalling ourselves
+                if info['ppid'] == own_pid and _reap_own_zombie(info['pid']):
+                    killed_count += 1
+                    continue
 
                 # Get parent process
                 try:
-                    parent = psutil.Process(proc.info['ppid'])
+                    parent = psutil.Process(info['ppid'])
                     parent_info = f"parent PID {parent.pid} ({parent.name()})"
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    parent_info = f"parent PID {proc.info['ppid']} (unknown)"
+                    parent_info = f"parent PID {info['ppid']} (unknown)"
 
                 # Try to clean up zombie by signaling parent or killing directly
                 try:
                     # First try to signal the parent to clean up
-                    if proc.info['ppid'] > 1:  # Don't signal init
+                    if info['ppid'] > 1:  # Don't signal init
                         try:
-                            parent = psutil.Process(proc.info['ppid'])
+                            parent = psutil.Process(info['ppid'])
                             parent.send_signal(signal.SIGCHLD)
                             time.sleep(0.1)  # Give parent time to clean up
                         except (psutil.NoSuchProcess, psutil.AccessDenied, PermissionError):
@@ -617,20 +834,20 @@ def enhanced_find_and_kill_zombie_processes(logger: logging.Logger | None = None
 
                     # If still exists, try to terminate it directly
                     try:
-                        zombie_proc = psutil.Process(proc.info['pid'])
+                        zombie_proc = psutil.Process(info['pid'])
                         if zombie_proc.status() == psutil.STATUS_ZOMBIE:
                             zombie_proc.terminate()
                             killed_count += 1
                             if logger:
-                                logger.info(f"Killed zombie process PID {proc.info['pid']} "
-                                          f"({proc.info['name']}) with {parent_info}")
+                                logger.info(f"Killed zombie process PID {info['pid']} "
+                                          f"({info['name']}) with {parent_info}")
                     except (psutil.NoSuchProcess, psutil.AccessDenied):
                         # Process might have been cleaned up already
                         pass
 
                 except Exception as e:
                     if logger:
-                        logger.warning(f"Failed to kill zombie process PID {proc.info['pid']}: {e}")
+                        logger.warning(f"Failed to kill zombie process PID {info['pid']}: {e}")
 
             except (psutil.NoSuchProcess, psutil.AccessDenied):
                 # Process disappeared or access denied, continue
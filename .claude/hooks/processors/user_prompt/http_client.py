@@ -4,35 +4,133 @@ HTTP client management module for user prompt processing
 """
 
 import asyncio
+import functools
+import hashlib
+import json
+import random
+import secrets
 import time
+from collections.abc import Collection
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
-# HTTP client libraries
-try:
-    import httpx
-except ImportError:
-    httpx = None
+from config import HTTP_NUM_POOLS, HTTP_POOL_MAXSIZE
+
+
+# HTTP client libraries are imported on first use rather than at module load:
+# most prompts contain no URL, so the hook shouldn't pay their import cost
+@functools.cache
+def _httpx():
+    try:
+        import httpx
+    except ImportError:
+        return None
+    return httpx
+
+
+@functools.cache
+def _requests():
+    try:
+        import requests
+    except ImportError:
+        return None
+    return requests
+
+
+@functools.cache
+def _requests_cache():
+    try:
+        import requests_cache
+    except ImportError:
+        return None
+    return requests_cache
+
+
+@functools.cache
+def _urllib3():
+    try:
+        import urllib3
+    except ImportError:
+        return None
+    return urllib3
+
+
+@functools.cache
+def _websockets():
+    try:
+        import websockets
+    except ImportError:
+        return None
+    return websockets
+
+
+@functools.cache
+def _jittered_retry():
+    """JitteredRetry class, built on first use since it subclasses urllib3's Retry"""
+    if _urllib3() is None:
+        return None
+    from urllib3.util.retry import Retry
 
-try:
-    import requests
-    import requests_cache
-except ImportError:
-    requests = None
-    requests_cache = None
+    class JitteredRetry(Retry):
+        """Retry with full-jitter exponential backoff to avoid synchronized retry storms"""
 
-try:
-    import urllib3
-    from urllib3.poolmanager import PoolManager
-    from urllib3.util.retry import Retry
-except ImportError:
-    urllib3 = None
-    Retry = None
-    PoolManager = None
+        def get_backoff_time(self) -> float:
+            # Parent returns the capped exponential delay; sample uniformly below it
+            return random.uniform(0, super().get_backoff_time())
+
+    return JitteredRetry
 
 try:
-    import websockets
+    import orjson
 except ImportError:
-    websockets = None
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Response fields built by default; pass _fields=... to request a subset and skip
+# text decoding or JSON parsing the caller doesn't need
+DEFAULT_RESPONSE_FIELDS = frozenset({'status_code', 'headers', 'content', 'json'})
+
+# Connection tuning for the sqlite HTTP cache (WAL and synchronous are set by requests_cache)
+SQLITE_CACHE_PRAGMAS = (
+    'PRAGMA cache_size=-64000',  # 64MB page cache
+    'PRAGMA mmap_size=268435456',  # 256MB memory-mapped reads
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA journal_size_limit=67108864',  # cap the WAL at 64MB after checkpoints
+)
+
+# Methods that may be sent by more than one client at once without side effects
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+# Content types whose bodies are decoded as JSON
+JSON_CONTENT_TYPES = ('application/json', 'application/problem+json')
+
+
+def _stable_digest(*parts: str) -> str:
+    """
+    Process-independent digest for cache keys and IDs
+    Unlike hash(), this survives restarts so the persistent cache keeps hitting
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part.encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def _tune_sqlite_cache(cache) -> None:
+    """Apply per-connection SQLite tuning to each table of a requests_cache sqlite backend"""
+    for table in (cache.responses, cache.redirects):
+        with table.connection() as con:
+            for pragma in SQLITE_CACHE_PRAGMAS:
+                con.execute(pragma)
+
+
+def _key_default(value: Any) -> Any:
+    """JSON fallback for cache keys; sets (e.g. _fields) are sorted so the key is stable"""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
 
 
 class UserPromptHTTPClientManager:
@@ -41,92 +139,128 @@ class UserPromptHTTPClientManager:
     def __init__(self, cache_manager=None):
         self.cache_manager = cache_manager
 
-        # Initialize HTTP clients
-        self.httpx_client = None
-        self.requests_session = None
-        self.urllib3_pool = None
+        # HTTP clients are created on first access (see the cached properties below)
         self.websocket_connections = {}
 
-        # Initialize based on available libraries
-        self._init_httpx()
-        self._init_requests()
-        self._init_urllib3()
+        # Runs blocking requests calls so they can race the async HTTPX client
+        self._executor = ThreadPoolExecutor(max_workers=4)
+
+    @functools.cached_property
+    def httpx_client(self):
+        return self._init_httpx()
+
+    @functools.cached_property
+    def requests_session(self):
+        return self._init_requests()
+
+    @functools.cached_property
+    def urllib3_pool(self):
+        return self._init_urllib3()
 
     def _init_httpx(self):
         """Initialize HTTPX async client for user prompt processing"""
+        httpx = _httpx()
         if httpx is not None:
             try:
                 timeout = httpx.Timeout(30.0, connect=10.0)  # Longer timeouts for user requests
                 limits = httpx.Limits(max_keepalive_connections=10, max_connections=20)
-                self.httpx_client = httpx.AsyncClient(
+                return httpx.AsyncClient(
                     timeout=timeout,
                     limits=limits,
                     follow_redirects=True,
                     headers={'User-Agent': 'Claude-Code-Hook/1.0'}
                 )
             except Exception:
-                self.httpx_client = None
+                pass
+        return None
 
     def _init_requests(self):
         """Initialize requests session with caching for user prompts"""
+        requests = _requests()
         if requests is not None:
             try:
-                self.requests_session = requests.Session()
-                self.requests_session.headers.update({'User-Agent': 'Claude-Code-Hook/1.0'})
+                session = None
+                requests_cache = _requests_cache()
 
-                # Configure caching with longer TTL for user requests
+                # Configure caching with longer TTL for user requests, scoped to this
+                # session rather than patched into the global requests module
                 if requests_cache is not None and self.cache_manager:
                     try:
                         cache_file = self.cache_manager.cache_dir / "user_prompt_http_cache.sqlite"
-                        requests_cache.install_cache(
+                        session = requests_cache.CachedSession(
                             str(cache_file),
                             backend='sqlite',
-                            expire_after=600  # 10 minutes for user requests
+                            expire_after=600,  # 10 minutes for user requests
+                            fast_save=True,
+                            wal=True,  # readers don't block the writer
+                            stale_if_error=True
                         )
+                        _tune_sqlite_cache(session.cache)
                     except Exception:
-                        pass  # Continue without caching if it fails
+                        session = None  # Continue without caching if it fails
+
+                if session is None:
+                    session = requests.Session()
+                session.headers.update({'User-Agent': 'Claude-Code-Hook/1.0'})
 
                 # Configure retries for robustness
-                if urllib3 is not None:
+                JitteredRetry = _jittered_retry()
+                if JitteredRetry is not None:
                     try:
                         from requests.adapters import HTTPAdapter
-                        retry_strategy = urllib3.Retry(
+                        retry_strategy = JitteredRetry(
                             total=5,  # More retries for user requests
                             backoff_factor=1,
                             status_forcelist=[429, 500, 502, 503, 504],
                             allowed_methods=["HEAD", "GET", "POST", "OPTIONS"]
                         )
-                        adapter = HTTPAdapter(max_retries=retry_strategy)
-                        self.requests_session.mount("http://", adapter)
-                        self.requests_session.mount("https://", adapter)
+                        adapter = HTTPAdapter(
+                            pool_connections=HTTP_NUM_POOLS,
+                            pool_maxsize=HTTP_POOL_MAXSIZE,
+                            pool_block=False,
+                            max_retries=retry_strategy
+                        )
+                        session.mount("http://", adapter)
+                        session.mount("https://", adapter)
                     except Exception:
                         pass  # Continue without retries if it fails
+                return session
             except Exception:
-                self.requests_session = None
+                pass
+        return None
 
     def _init_urllib3(self):
         """Initialize urllib3 pool manager for user prompts"""
-        if urllib3 is not None and Retry is not None and PoolManager is not None:
+        urllib3 = _urllib3()
+        JitteredRetry = _jittered_retry()
+        if urllib3 is not None and JitteredRetry is not None:
             try:
-                retry = Retry(
+                retry = JitteredRetry(
                     total=5,
                     backoff_factor=1,
                     status_forcelist=[429, 500, 502, 503, 504]
                 )
-                self.urllib3_pool = PoolManager(
-                    num_pools=20,
-                    maxsize=20,
+                return urllib3.PoolManager(
+                    num_pools=HTTP_NUM_POOLS,
+                    maxsize=HTTP_POOL_MAXSIZE,
+                    block=False,
                     retries=retry,
                     timeout=urllib3.Timeout(connect=10.0, read=30.0)
                 )
             except Exception:
-                self.urllib3_pool = None
-        else:
-            self.urllib3_pool = None
+                pass
+        return None
+
+    def purge_expired_cache(self) -> None:
+        """Delete expired responses from the HTTP cache so the sqlite file stays bounded"""
+        # Read the instance dict directly so a purge never creates the session
+        cache = getattr(self.__dict__.get('requests_session'), 'cache', None)
+        if cache is not None:
+            cache.delete(expired=True, vacuum=False)
 
     async def fetch_url_content(self, url: str, method: str = 'GET', **kwargs) -> dict[str, Any]:
         """Fetch URL content using the best available HTTP client"""
-        cache_key = f"http_{method}_{hash(url + str(kwargs))}"
+        cache_key = f"http_{method}_{_stable_digest(url, json.dumps(kwargs, sort_keys=True, default=_key_default))}"
 
         # Check cache first
         if self.cache_manager:
@@ -136,24 +270,27 @@ class UserPromptHTTPClientManager:
 
         result = None
 
-        # Try HTTPX first (async, most modern)
-        if self.httpx_client is not None:
-            try:
-                result = await self.httpx_request(method, url, **kwargs)
-            except Exception as e:
-                result = {'error': f'HTTPX failed: {str(e)}'}
-
-        # Fallback to requests
-        if (result is None or 'error' in result) and self.requests_session is not None:
-            try:
-                result = self.requests_request(method, url, **kwargs)
-            except Exception as e:
-                result = {'error': f'Requests failed: {str(e)}'}
+        if method.upper() in IDEMPOTENT_METHODS:
+            # Safe to send twice: race HTTPX against requests and take the first
+            # success, so latency is min() of the clients rather than their sum
+            result = await self._race_clients(method, url, **kwargs)
+        else:
+            # Try HTTPX first (async, most modern)
+            if self.httpx_client is not None:
+                result = await self._try_httpx(method, url, **kwargs)
+
+            # Fallback to requests, off the event loop since it blocks
+            if (result is None or 'error' in result) and self.requests_session is not None:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, functools.partial(self._try_requests, method, url, **kwargs)
+                )
 
-        # Fallback to urllib3
+        # Fallback to urllib3 (also blocking)
         if (result is None or 'error' in result) and self.urllib3_pool is not None:
             try:
-                result = self.urllib3_request(method, url, **kwargs)
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, functools.partial(self.urllib3_request, method, url, **kwargs)
+                )
             except Exception as e:
                 result = {'error': f'urllib3 failed: {str(e)}'}
 
@@ -163,63 +300,119 @@ class UserPromptHTTPClientManager:
 
         return result or {'error': 'No HTTP client available'}
 
+    async def _race_clients(self, method: str, url: str, **kwargs) -> dict[str, Any] | None:
+        """Run HTTPX and requests concurrently, returning the first successful result"""
+        racers: list[asyncio.Future] = []
+        if self.httpx_client is not None:
+            racers.append(asyncio.ensure_future(self._try_httpx(method, url, **kwargs)))
+        if self.requests_session is not None:
+            loop = asyncio.get_running_loop()
+            racers.append(loop.run_in_executor(
+                self._executor, functools.partial(self._try_requests, method, url, **kwargs)
+            ))
+
+        result = None
+        try:
+            for next_done in asyncio.as_completed(racers):
+                result = await next_done
+                if 'error' not in result:
+                    break
+        finally:
+            # Losers are cancelled; a requests call already running in a thread
+            # finishes in the background and its result is discarded
+            for racer in racers:
+                racer.cancel()
+
+        return result
+
+    async def _try_httpx(self, method: str, url: str, **kwargs) -> dict[str, Any]:
+        """HTTPX request with failures reported as an error result"""
+        try:
+            return await self.httpx_request(method, url, **kwargs)
+        except Exception as e:
+            return {'error': f'HTTPX failed: {str(e)}'}
+
+    def _try_requests(self, method: str, url: str, **kwargs) -> dict[str, Any]:
+        """requests call with failures reported as an error result"""
+        try:
+            return self.requests_request(method, url, **kwargs)
+        except Exception as e:
+            return {'error': f'Requests failed: {str(e)}'}
+
     async def httpx_request(self, method: str, url: str, **kwargs) -> dict[str, Any]:
         """Make async HTTP request using HTTPX"""
         if self.httpx_client is None:
             return {'error': 'HTTPX not available'}
 
+        fields = kwargs.pop('_fields', DEFAULT_RESPONSE_FIELDS)
         response = await self.httpx_client.request(method, url, **kwargs)
-        return {
-            'status_code': response.status_code,
-            'headers': dict(response.headers),
-            'content': response.text,
-            'json': response.json() if self._is_json_content(response.headers) else None,
-            'client': 'httpx'
-        }
+        result = self._response_fields(response, response.status_code, fields)
+        result['client'] = 'httpx'
+        return result
 
     def requests_request(self, method: str, url: str, **kwargs) -> dict[str, Any]:
         """Make HTTP request using requests"""
         if self.requests_session is None:
             return {'error': 'Requests not available'}
 
+        fields = kwargs.pop('_fields', DEFAULT_RESPONSE_FIELDS)
         response = self.requests_session.request(method, url, **kwargs)
-        return {
-            'status_code': response.status_code,
-            'headers': dict(response.headers),
-            'content': response.text,
-            'json': response.json() if self._is_json_content(response.headers) else None,
-            'from_cache': getattr(response, 'from_cache', False),
-            'client': 'requests'
-        }
+        result = self._response_fields(response, response.status_code, fields)
+        result['from_cache'] = getattr(response, 'from_cache', False)
+        result['client'] = 'requests'
+        return result
 
     def urllib3_request(self, method: str, url: str, **kwargs) -> dict[str, Any]:
         """Make HTTP request using urllib3"""
         if self.urllib3_pool is None:
             return {'error': 'urllib3 not available'}
 
+        fields = kwargs.pop('_fields', DEFAULT_RESPONSE_FIELDS)
         response = self.urllib3_pool.request(method, url, **kwargs)
-        return {
-            'status_code': response.status,
-            'headers': dict(response.headers),
-            'content': response.data.decode('utf-8') if response.data else None,
-            'client': 'urllib3'
-        }
+        result: dict[str, Any] = {}
+        if 'status_code' in fields:
+            result['status_code'] = response.status
+        if 'headers' in fields:
+            result['headers'] = dict(response.headers)
+        if 'content' in fields:
+            result['content'] = response.data.decode('utf-8') if response.data else None
+        result['client'] = 'urllib3'
+        return result
+
+    def _response_fields(self, response, status_code: int, fields: Collection[str]) -> dict[str, Any]:
+        """
+        Build a result dict holding only the requested fields
+        The body is decoded to text only for 'content' and parsed only for 'json'
+        """
+        result: dict[str, Any] = {}
+        if 'status_code' in fields:
+            result['status_code'] = status_code
+        if 'headers' in fields:
+            result['headers'] = dict(response.headers)
+        if 'content' in fields:
+            result['content'] = response.text
+        if 'json' in fields:
+            result['json'] = _json_loads(response.content) if self._is_json_content(response.headers) else None
+        return result
 
     def _is_json_content(self, headers) -> bool:
         """Check if response content is JSON"""
-        # Handle different header types (Dict, Headers, CaseInsensitiveDict)
-        if hasattr(headers, 'get'):
-            content_type = headers.get('content-type', '').lower()
-        else:
-            content_type = str(headers.get('content-type', '')).lower()
-        return 'application/json' in content_type
+        # Dict, httpx Headers and CaseInsensitiveDict all support a case-insensitive get
+        content_type = headers.get('content-type') if hasattr(headers, 'get') else None
+        if not content_type:
+            return False
+        # Servers almost always send it lower-case already; skip the copy then
+        if not content_type.islower():
+            content_type = content_type.lower()
+        return any(json_type in content_type for json_type in JSON_CONTENT_TYPES)
 
     async def websocket_connect_for_prompt(self, uri: str, prompt_context: str | None = None) -> str | None:
         """Connect to WebSocket for prompt-related communication"""
+        websockets = _websockets()
         if websockets is None:
             return None
 
-        connection_id = f"prompt_ws_{hash(uri + (prompt_context or ''))}_{int(time.time())}"
+        connection_id = f"prompt_ws_{_stable_digest(uri, prompt_context or '')}_{secrets.token_hex(4)}"
 
         try:
             websocket = await websockets.connect(uri)
@@ -233,52 +426,57 @@ class UserPromptHTTPClientManager:
             return f"error: {str(e)}"
 
     def get_client_status(self) -> dict[str, Any]:
-        """Get status of all HTTP clients"""
+        """Get status of all HTTP clients; reports only clients already built, never builds them"""
         return {
-            'httpx': self.httpx_client is not None,
-            'requests': self.requests_session is not None,
-            'urllib3': self.urllib3_pool is not None,
-            'websockets': websockets is not None,
+            'httpx': self.__dict__.get('httpx_client') is not None,
+            'requests': self.__dict__.get('requests_session') is not None,
+            'urllib3': self.__dict__.get('urllib3_pool') is not None,
+            'websockets': _websockets() is not None,
             'active_websockets': len(self.websocket_connections)
         }
 
     def close(self):
         """Close all HTTP clients and connections"""
-        # Close httpx client
-        if self.httpx_client:
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    loop.create_task(self.httpx_client.aclose())
-                else:
-                    # If no event loop is running, create one temporarily
-                    asyncio.run(self.httpx_client.aclose())
-            except RuntimeError:
-                # If we can't get an event loop, just skip async cleanup
-                pass
+        requests_session = self.__dict__.get('requests_session')
+        if requests_session:
+            requests_session.close()
 
-        if self.requests_session:
-            self.requests_session.close()
+        self._executor.shutdown(wait=False)
 
-        # Close all websocket connections
-        for connection_id in list(self.websocket_connections.keys()):
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    loop.create_task(self._close_websocket(connection_id))
-                else:
-                    asyncio.run(self._close_websocket(connection_id))
-            except RuntimeError:
-                # Skip if no event loop
-                pass
+        # Async cleanup runs as a single batch on one loop; clients never
+        # accessed were never created and have nothing to close
+        if not (self.__dict__.get('httpx_client') or self.websocket_connections):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        try:
+            if loop is not None:
+                self._close_task = loop.create_task(self._close_all())
+            else:
+                asyncio.run(self._close_all())
+        except RuntimeError:
+            # If we can't get an event loop, just skip async cleanup
+            pass
+
+    async def _close_all(self):
+        """Close the httpx client and every websocket connection concurrently"""
+        # Swap the registry out in one assignment so a concurrent close() or
+        # connect never sees it mid-drain; each socket is closed exactly once
+        to_close, self.websocket_connections = self.websocket_connections, {}
+        closers = [info['websocket'].close() for info in to_close.values()]
+        httpx_client = self.__dict__.get('httpx_client')
+        if httpx_client:
+            closers.append(httpx_client.aclose())
+        await asyncio.gather(*closers, return_exceptions=True)
 
     async def _close_websocket(self, connection_id: str):
         """Close a specific websocket connection"""
-        if connection_id in self.websocket_connections:
+        websocket_info = self.websocket_connections.pop(connection_id, None)
+        if websocket_info is not None:
             try:
-                websocket_info = self.websocket_connections[connection_id]
                 await websocket_info['websocket'].close()
             except Exception:
                 pass
-            finally:
-                del self.websocket_connections[connection_id]
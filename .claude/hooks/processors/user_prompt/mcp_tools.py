@@ -7,11 +7,17 @@ import builtins
 import contextlib
 import json
 import logging
+import mmap
 import os
 import tempfile
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # Import cache decorators for enhanced caching
 # Define fallback decorators since cache_integration.py was removed
@@ -27,6 +33,33 @@ def cached_file_operation(ttl=300):
 COMMAND_TIMEOUT_SECONDS = 60
 CODE2PROMPT_TIMEOUT_SECONDS = 30
 PROJECT_CONTEXT_LIMIT = 10000
+MMAP_THRESHOLD_BYTES = 1 << 20
+
+# Instruction template bound once at import; callers only fill in the fields
+_MCP_TMPL = """
+Use the following MCP tool:
+- Tool: `mcp__{server}__{tool}`
+- Parameters: {params}
+""".format
+
+
+def _dump(params: dict[str, Any] | None) -> str:
+    """Render tool parameters as indented JSON, skipping the encoder when empty"""
+    if not params:
+        return "{}"
+    # Stays on stdlib json: orjson would stop escaping non-ASCII and reject non-str keys
+    return json.dumps(params, indent=2)
+
+
+def _load_json_file(path: Path) -> Any:
+    """Parse a JSON file with orjson when available, memory-mapping large files"""
+    with open(path, 'rb') as f:
+        if orjson is None:
+            return json.load(f)
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD_BYTES:
+            return orjson.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            return orjson.loads(view)
 
 
 @cached_prompt_operation(ttl=3600, key_prefix="mcp_tools")  # Cache for 1 hour
@@ -40,20 +73,19 @@ def get_available_mcp_tools():
 
     if mcp_tools_file.exists():
         try:
-            with open(mcp_tools_file) as f:
-                mcp_tools_raw = json.load(f)
+            mcp_tools_raw = _load_json_file(mcp_tools_file)
 
             # Parse the flat structure into a categorized structure
             mcp_tools: dict[str, Any] = {}
-            for tool_name, _description in mcp_tools_raw.items():
+            for tool_name in mcp_tools_raw:
                 # Parse tool name format: mcp__<server>__<tool>
-                parts = tool_name.split('__')
-                if len(parts) == 3 and parts[0] == 'mcp':
-                    server = parts[1]
-                    tool = parts[2]
-                    if server not in mcp_tools:
-                        mcp_tools[server] = []
-                    mcp_tools[server].append(tool)
+                head, _, rest = tool_name.partition('__')
+                if head != 'mcp':
+                    continue
+                server, _, tool = rest.partition('__')
+                if not tool or '__' in tool:
+                    continue
+                mcp_tools.setdefault(server, []).append(tool)
 
             logging.getLogger(__name__).debug(f"Loaded {len(mcp_tools_raw)} MCP tools from mcp_tools.json")
             return mcp_tools
@@ -79,11 +111,7 @@ def run_claude_flow_mcp_command(tool: str, params: dict[str, Any] | None = None,
         logger.info(f"Generating instructions for Claude Flow MCP tool: {tool}")
 
     # Generate instruction text instead of executing
-    instruction = f"""
-Use the following MCP tool:
-- Tool: `mcp__claude-flow__{tool}`
-- Parameters: {json.dumps(params, indent=2) if params else "{}"}
-"""
+    instruction = _MCP_TMPL(server='claude-flow', tool=tool, params=_dump(params))
 
     # Return success with instructions
     return 0, instruction, ""
@@ -97,11 +125,7 @@ def run_serena_mcp_command(tool: str, params: dict[str, Any] | None = None, logg
         logger.info(f"Generating instructions for Serena MCP tool: {tool}")
 
     # Generate instruction text
-    instruction = f"""
-Use the following MCP tool:
-- Tool: `mcp__serena__{tool}`
-- Parameters: {json.dumps(params, indent=2) if params else "{}"}
-"""
+    instruction = _MCP_TMPL(server='serena', tool=tool, params=_dump(params))
 
     # Return success with instructions
     return 0, instruction, ""
@@ -228,11 +252,7 @@ def run_mcp_tool_command(server: str, tool: str, params: dict[str, Any] | None,
         if logger:
             logger.info(f"Generating instructions for MCP tool: {server}.{tool}")
 
-        instruction = f"""
-Use the following MCP tool:
-- Tool: `mcp__{server}__{tool}`
-- Parameters: {json.dumps(params, indent=2) if params else "{}"}
-"""
+        instruction = _MCP_TMPL(server=server, tool=tool, params=_dump(params))
 
         # Return success with instructions
         return 0, instruction, ""
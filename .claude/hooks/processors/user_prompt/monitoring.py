@@ -3,35 +3,97 @@
 Monitoring module for user prompt processing
 """
 
-import queue
+import functools
+import logging
+import logging.handlers
+import sys
 import threading
 import time
+from collections import deque
+from collections.abc import Callable
 from typing import Any
 
-import psutil
 
+@functools.cache
+def _psutil():
+    """Import psutil on first use; prompts that never start monitoring skip its /proc probing"""
+    import psutil
+    return psutil
 
-def log_prompt_event(message: str) -> None:
+# System-wide memory changes slowly; don't re-read /proc/meminfo on every tick
+SYSTEM_MEMORY_REFRESH = 10  # seconds
+
+
+def _create_event_logger() -> logging.Logger:
+    """Event logger writing to stdout through a buffer that flushes every 64 records or on error"""
+    event_logger = logging.getLogger('UserPromptProcessor.events')
+    if not event_logger.handlers:
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(logging.Formatter('[UserPromptProcessor] %(message)s'))
+        event_logger.addHandler(logging.handlers.MemoryHandler(
+            capacity=64, flushLevel=logging.ERROR, target=stream_handler
+        ))
+        event_logger.setLevel(logging.INFO)
+        event_logger.propagate = False
+    return event_logger
+
+
+_event_logger = _create_event_logger()
+
+
+def log_prompt_event(message: str, level: int = logging.INFO) -> None:
     """Log user prompt processing event"""
-    print(f"[UserPromptProcessor] {message}", flush=True)
+    if _event_logger.isEnabledFor(level):
+        _event_logger.log(level, message)
+
+
+def flush_prompt_events() -> None:
+    """Write out any buffered prompt events"""
+    for handler in _event_logger.handlers:
+        handler.flush()
+
+
+def _cache_hit_rate(counts: dict[str, int]) -> float:
+    """Hit fraction from counter snapshots; O(1), no per-sample history"""
+    lookups = counts['cache_hits'] + counts['cache_misses']
+    return counts['cache_hits'] / lookups if lookups else 0
 
 
 class UserPromptMonitor:
     """Specialized monitoring for user prompt processing"""
 
     def __init__(self):
-        self.process = psutil.Process()
+        self._system_memory_cache: tuple[float, Any] | None = None
         self.monitoring = False
         self.monitor_thread = None
-        self.stats_queue: queue.Queue[dict[str, Any]] = queue.Queue(maxsize=50)
+        # Single producer (the monitor thread); a full deque drops its oldest entry
+        self.stats_queue: deque[dict[str, Any]] = deque(maxlen=50)
         self.prompt_metrics: dict[str, Any] = {
             'total_prompts': 0,
-            'processing_times': [],
+            'processing_times': deque(maxlen=100),
             'error_count': 0,
             'cache_hits': 0,
             'cache_misses': 0
         }
+        # Guards the counters and the rolling windows, whose sums must match their contents
         self._metrics_lock = threading.RLock()
+        self._processing_sum = 0.0
+
+        # Rolling window of the last 10 processing times with a running sum
+        self._recent_times: deque[float] = deque(maxlen=10)
+        self._recent_sum = 0.0
+        self._maintenance_tasks: list[dict[str, Any]] = []
+
+    @functools.cached_property
+    def process(self):
+        process = _psutil().Process()
+        # Prime the CPU counter so the first sample measures from here, not 0.0
+        process.cpu_percent(interval=None)
+        return process
+
+    def add_maintenance_task(self, callback: Callable[[], Any], interval: float) -> None:
+        """Run callback from the monitor thread on its first tick and then every interval seconds"""
+        self._maintenance_tasks.append({'callback': callback, 'interval': interval, 'next_run': 0.0})
 
     def start_monitoring(self, interval=5):
         """Start user prompt monitoring"""
@@ -39,6 +101,8 @@ class UserPromptMonitor:
             return
 
         self.monitoring = True
+        # Create the process handle and start the CPU sample window before the first tick
+        self.process.cpu_percent(interval=None)
         self.monitor_thread = threading.Thread(
             target=self._monitor_loop,
             args=(interval,),
@@ -53,6 +117,7 @@ class UserPromptMonitor:
         if self.monitor_thread and self.monitor_thread.is_alive():
             self.monitor_thread.join(timeout=2)
         log_prompt_event("📊 User prompt monitoring stopped")
+        flush_prompt_events()
 
     def _monitor_loop(self, interval):
         """Monitoring loop for user prompt processing"""
@@ -60,46 +125,56 @@ class UserPromptMonitor:
             try:
                 stats = self._get_current_stats()
 
-                # Add to queue (non-blocking)
-                try:
-                    self.stats_queue.put_nowait(stats)
-                except queue.Full:
-                    # Remove oldest item if queue is full
-                    try:
-                        self.stats_queue.get_nowait()
-                        self.stats_queue.put_nowait(stats)
-                    except queue.Empty:
-                        pass
+                self.stats_queue.append(stats)
 
                 # Check for critical resource usage
                 self._check_prompt_thresholds(stats)
 
+                self._run_maintenance_tasks()
+
                 time.sleep(interval)
             except Exception as e:
-                log_prompt_event(f"❌ User prompt monitoring error: {e}")
+                log_prompt_event(f"❌ User prompt monitoring error: {e}", logging.ERROR)
                 time.sleep(interval)
 
+    def _run_maintenance_tasks(self):
+        """Run any maintenance tasks that are due"""
+        now = time.monotonic()
+        for task in self._maintenance_tasks:
+            if now < task['next_run']:
+                continue
+            task['next_run'] = now + task['interval']
+            try:
+                task['callback']()
+            except Exception as e:
+                log_prompt_event(f"❌ Maintenance task failed: {e}", logging.ERROR)
+
+    def _get_system_memory(self):
+        """System memory stats, re-read at most every SYSTEM_MEMORY_REFRESH seconds"""
+        now = time.monotonic()
+        if self._system_memory_cache is None or now - self._system_memory_cache[0] > SYSTEM_MEMORY_REFRESH:
+            self._system_memory_cache = (now, _psutil().virtual_memory())
+        return self._system_memory_cache[1]
+
     def _get_current_stats(self):
         """Get current user prompt processing statistics"""
         try:
-            memory_info = self.process.memory_info()
-            cpu_percent = self.process.cpu_percent()
+            # oneshot() lets both calls share a single read of the process stat files
+            with self.process.oneshot():
+                memory_info = self.process.memory_info()
+                cpu_percent = self.process.cpu_percent()
 
             # System stats
-            system_memory = psutil.virtual_memory()
+            system_memory = self._get_system_memory()
 
             with self._metrics_lock:
+                counts = self._metric_counts()
                 avg_processing_time = (
-                    sum(self.prompt_metrics['processing_times'][-10:]) /
-                    len(self.prompt_metrics['processing_times'][-10:])
-                    if self.prompt_metrics['processing_times'] else 0
+                    self._recent_sum / len(self._recent_times)
+                    if self._recent_times else 0
                 )
 
-                cache_hit_rate = (
-                    self.prompt_metrics['cache_hits'] /
-                    (self.prompt_metrics['cache_hits'] + self.prompt_metrics['cache_misses'])
-                    if (self.prompt_metrics['cache_hits'] + self.prompt_metrics['cache_misses']) > 0 else 0
-                )
+            cache_hit_rate = _cache_hit_rate(counts)
 
             return {
                 'timestamp': time.time(),
@@ -113,14 +188,14 @@ class UserPromptMonitor:
                     'memory_available': system_memory.available
                 },
                 'prompt_metrics': {
-                    'total_prompts': self.prompt_metrics['total_prompts'],
-                    'error_count': self.prompt_metrics['error_count'],
+                    'total_prompts': counts['total_prompts'],
+                    'error_count': counts['error_count'],
                     'avg_processing_time': avg_processing_time,
                     'cache_hit_rate': cache_hit_rate * 100
                 }
             }
         except Exception as e:
-            log_prompt_event(f"❌ Failed to get user prompt stats: {e}")
+            log_prompt_event(f"❌ Failed to get user prompt stats: {e}", logging.ERROR)
             return {'error': str(e), 'timestamp': time.time()}
 
     def _check_prompt_thresholds(self, stats):
@@ -131,51 +206,62 @@ class UserPromptMonitor:
         # Check memory usage (> 100MB for prompt processing)
         process_memory_mb = stats['process']['memory_rss'] / (1024 * 1024)
         if process_memory_mb > 100:
-            log_prompt_event(f"⚠️ HIGH PROMPT PROCESS MEMORY: {process_memory_mb:.1f}MB")
+            log_prompt_event(f"⚠️ HIGH PROMPT PROCESS MEMORY: {process_memory_mb:.1f}MB", logging.WARNING)
 
         # Check error rate (> 10%)
         if stats['prompt_metrics']['total_prompts'] > 10:
             error_rate = (stats['prompt_metrics']['error_count'] / stats['prompt_metrics']['total_prompts']) * 100
             if error_rate > 10:
-                log_prompt_event(f"⚠️ HIGH PROMPT ERROR RATE: {error_rate:.1f}%")
+                log_prompt_event(f"⚠️ HIGH PROMPT ERROR RATE: {error_rate:.1f}%", logging.WARNING)
 
         # Check cache hit rate (< 50%)
         if stats['prompt_metrics']['cache_hit_rate'] < 50 and stats['prompt_metrics']['total_prompts'] > 5:
-            log_prompt_event(f"⚠️ LOW CACHE HIT RATE: {stats['prompt_metrics']['cache_hit_rate']:.1f}%")
+            log_prompt_event(f"⚠️ LOW CACHE HIT RATE: {stats['prompt_metrics']['cache_hit_rate']:.1f}%", logging.WARNING)
 
     def record_prompt_processing(self, processing_time: float, had_error: bool = False, cache_hit: bool = False) -> None:
         """Record metrics for a prompt processing operation"""
+        metrics = self.prompt_metrics
+        processing_times = metrics['processing_times']
         with self._metrics_lock:
-            self.prompt_metrics['total_prompts'] += 1
-            self.prompt_metrics['processing_times'].append(processing_time)
+            metrics['total_prompts'] += 1
+            if had_error:
+                metrics['error_count'] += 1
+            metrics['cache_hits' if cache_hit else 'cache_misses'] += 1
 
-            # Keep only last 100 processing times
-            if len(self.prompt_metrics['processing_times']) > 100:
-                self.prompt_metrics['processing_times'] = self.prompt_metrics['processing_times'][-100:]
+            # Subtract whatever the bounded deques are about to drop so the sums stay exact
+            if len(processing_times) == processing_times.maxlen:
+                self._processing_sum -= processing_times[0]
+            processing_times.append(processing_time)
+            self._processing_sum += processing_time
 
-            if had_error:
-                self.prompt_metrics['error_count'] += 1
+            if len(self._recent_times) == self._recent_times.maxlen:
+                self._recent_sum -= self._recent_times[0]
+            self._recent_times.append(processing_time)
+            self._recent_sum += processing_time
 
-            if cache_hit:
-                self.prompt_metrics['cache_hits'] += 1
-            else:
-                self.prompt_metrics['cache_misses'] += 1
+    def _metric_counts(self) -> dict[str, int]:
+        """Snapshot the current value of each metric counter; call with _metrics_lock held"""
+        return {
+            name: self.prompt_metrics[name]
+            for name in ('total_prompts', 'error_count', 'cache_hits', 'cache_misses')
+        }
 
     def get_metrics_summary(self):
         """Get summary of prompt processing metrics"""
         with self._metrics_lock:
-            return {
-                'total_prompts': self.prompt_metrics['total_prompts'],
-                'error_count': self.prompt_metrics['error_count'],
-                'error_rate': (self.prompt_metrics['error_count'] / self.prompt_metrics['total_prompts'] * 100)
-                              if self.prompt_metrics['total_prompts'] > 0 else 0,
-                'cache_hits': self.prompt_metrics['cache_hits'],
-                'cache_misses': self.prompt_metrics['cache_misses'],
-                'cache_hit_rate': (self.prompt_metrics['cache_hits'] /
-                                  (self.prompt_metrics['cache_hits'] + self.prompt_metrics['cache_misses']) * 100)
-                                  if (self.prompt_metrics['cache_hits'] + self.prompt_metrics['cache_misses']) > 0 else 0,
-                'avg_processing_time': (sum(self.prompt_metrics['processing_times']) /
-                                       len(self.prompt_metrics['processing_times']))
-                                       if self.prompt_metrics['processing_times'] else 0,
-                'recent_processing_times': self.prompt_metrics['processing_times'][-10:]
-            }
+            counts = self._metric_counts()
+            processing_count = len(self.prompt_metrics['processing_times'])
+            avg_processing_time = self._processing_sum / processing_count if processing_count else 0
+            recent_processing_times = list(self._recent_times)
+
+        return {
+            'total_prompts': counts['total_prompts'],
+            'error_count': counts['error_count'],
+            'error_rate': (counts['error_count'] / counts['total_prompts'] * 100)
+                          if counts['total_prompts'] > 0 else 0,
+            'cache_hits': counts['cache_hits'],
+            'cache_misses': counts['cache_misses'],
+            'cache_hit_rate': _cache_hit_rate(counts) * 100,
+            'avg_processing_time': avg_processing_time,
+            'recent_processing_times': recent_processing_times
+        }
@@ -4,21 +4,24 @@ Integration layer for parallel_executor.py with user prompt processor
 Provides parallel execution capabilities for MCP tools and workflow orchestration
 """
 
+import asyncio
+import functools
+import json
 import logging
+import operator
 import os
-import sys
-from collections.abc import Sequence
+import shlex
+import threading
+import time
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
-from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
-# Add async_ops directory to path to import parallel_executor
-async_ops_dir = Path(__file__).parent.parent / 'async_ops'
-sys.path.insert(0, str(async_ops_dir))
-
-# Runtime imports
+# Runtime imports. Imported through the package (as processors/__init__ does) so
+# there is one parallel_executor module and one global executor per process
 try:
-    from parallel_executor import ExecutionMode, ExecutionResult, HookCommand, ParallelHookExecutor
+    from ..async_ops.parallel_executor import ExecutionMode, ExecutionResult, HookCommand, ParallelHookExecutor
     PARALLEL_EXECUTOR_AVAILABLE = True
 except ImportError as e:
     logging.warning(f"Failed to import parallel_executor: {e}")
@@ -29,14 +32,50 @@ except ImportError as e:
     ExecutionMode = None
 
 
+# argv prefix for each MCP server that has its own CLI; others go through `mcp call`
+_FLAG_STYLE_SERVERS: dict[str, tuple[str, ...]] = {
+    'claude-flow': ('npx', 'claude-flow@alpha', 'mcp'),
+    'serena': ('serena', 'mcp'),
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _flags_for(items: tuple[tuple[str, type, Any], ...]) -> tuple[str, ...]:
+    """--key value flags for (key, type, value) triples; True adds a bare --key, False nothing"""
+    flags: list[str] = []
+    for key, _value_type, value in items:
+        if isinstance(value, bool):
+            if value:
+                flags.append(f'--{key}')
+        else:
+            flags.extend((f'--{key}', str(value)))
+    return tuple(flags)
+
+
+def _flatten_flags(params: Mapping[str, Any]) -> tuple[str, ...]:
+    """Flatten params into CLI flags, memoized for repeated (e.g. prebuilt) param sets"""
+    # The type is part of the key because True == 1 would otherwise share an entry
+    items = tuple((key, type(value), value) for key, value in params.items())
+    try:
+        return _flags_for(items)
+    except TypeError:
+        # Unhashable values (lists, dicts) can't be cached
+        return _flags_for.__wrapped__(items)
+
+
+# Pulls every ExecutionResult field _process_mcp_results needs in one call
+_unpack_result = operator.attrgetter('success', 'stdout', 'stderr', 'return_code', 'execution_time', 'error')
+
+
 @dataclass
 class MCPToolExecution:
     """Represents an MCP tool execution request"""
     server: str
     tool: str
-    params: dict[str, Any] | None = None
+    params: Mapping[str, Any] | None = None
     timeout: int = 60
     priority: int = 5
+    capture_output: bool = True  # False for calls whose stdout is never read
 
 
 class ParallelMCPExecutor:
@@ -47,6 +86,7 @@ class ParallelMCPExecutor:
 
     def __init__(self, max_workers: int = 4, max_concurrent: int = 6):
         self.logger = logging.getLogger(__name__)
+        self._env_cache: dict[str, str] | None = None
 
         if PARALLEL_EXECUTOR_AVAILABLE and ParallelHookExecutor is not None:
             self.executor = ParallelHookExecutor(max_workers=max_workers, max_concurrent=max_concurrent)
@@ -57,6 +97,11 @@ class ParallelMCPExecutor:
             self.enabled = False
             self.logger.warning("Parallel executor not available, falling back to sequential execution")
 
+    def close(self) -> None:
+        """Shut down the underlying hook executor's worker pool"""
+        if self.executor is not None:
+            self.executor.cleanup()
+
     async def execute_mcp_tools_parallel(self, tool_executions: list[MCPToolExecution]) -> dict[str, Any]:
         """
         Execute multiple MCP tools in parallel and return aggregated results
@@ -66,17 +111,19 @@ class ParallelMCPExecutor:
 
         # Convert MCP tool executions to HookCommands
         hook_commands = []
+        env = self._get_mcp_environment()
         for execution in tool_executions:
-            command = self._build_mcp_command(execution)
             if HookCommand is None:
                 # Fallback when HookCommand is not available
                 return await self._execute_sequential_fallback(tool_executions)
             hook_command = HookCommand(
-                command=command,
+                # HookCommand runs through a shell, so quote the argv at this boundary
+                command=shlex.join(self._build_mcp_command(execution)),
                 timeout=execution.timeout,
                 parallel=True,
                 priority=execution.priority,
-                environment=self._get_mcp_environment()
+                # Own copy: ContextSharedExecutor writes into command environments
+                environment=dict(env)
             )
             hook_commands.append(hook_command)
 
@@ -97,48 +144,39 @@ class ParallelMCPExecutor:
             self.logger.error(f"Parallel MCP execution failed: {e}")
             return await self._execute_sequential_fallback(tool_executions)
 
-    def _build_mcp_command(self, execution: MCPToolExecution) -> str:
-        """Build MCP command string from execution request"""
-        cmd_parts = []  # Initialize cmd_parts to ensure it's always defined
-
-        if execution.server == 'claude-flow':
-            cmd_parts = ['npx', 'claude-flow@alpha', 'mcp', execution.tool]
-            # Add parameters for claude-flow
-            if execution.params:
-                for key, value in execution.params.items():
-                    if isinstance(value, bool):
-                        if value:
-                            cmd_parts.append(f'--{key}')
-                    else:
-                        cmd_parts.extend([f'--{key}', str(value)])
-        elif execution.server == 'serena':
-            cmd_parts = ['serena', 'mcp', execution.tool]
-            # Add parameters for serena
+    def _build_mcp_command(self, execution: MCPToolExecution) -> list[str]:
+        """Build MCP command argv from execution request"""
+        prefix = _FLAG_STYLE_SERVERS.get(execution.server)
+        if prefix is not None:
+            # Servers with a dedicated CLI take params as --key value flags
+            cmd_parts = [*prefix, execution.tool]
             if execution.params:
-                for key, value in execution.params.items():
-                    if isinstance(value, bool):
-                        if value:
-                            cmd_parts.append(f'--{key}')
-                    else:
-                        cmd_parts.extend([f'--{key}', str(value)])
+                cmd_parts.extend(_flatten_flags(execution.params))
         else:
             # Generic MCP command
             cmd_parts = ['mcp', 'call', execution.server, execution.tool]
             if execution.params:
-                import json
-                # Create temp file for params (would need proper cleanup)
-                cmd_parts.extend(['--params', json.dumps(execution.params)])
+                # Params travel as a single argv element, so no quoting is needed
+                cmd_parts.extend(['--params', json.dumps(dict(execution.params))])
 
-        return ' '.join(cmd_parts)
+        return cmd_parts
 
     def _get_mcp_environment(self) -> dict[str, str]:
-        """Get environment variables for MCP execution"""
-        env = {
-            'CLAUDE_PROJECT_DIR': os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd()),
-            'NODE_ENV': 'production',
-            'PATH': os.environ.get('PATH', '')
-        }
-        return env
+        """
+        Get environment variables for MCP execution
+        Built once (os.getcwd() and environ lookups) and reused; treat it as read-only
+        """
+        if self._env_cache is None:
+            self._env_cache = {
+                'CLAUDE_PROJECT_DIR': os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd()),
+                'NODE_ENV': 'production',
+                'PATH': os.environ.get('PATH', '')
+            }
+        return self._env_cache
+
+    def refresh_env(self) -> None:
+        """Drop the cached MCP environment so the next command re-reads os.environ"""
+        self._env_cache = None
 
     def _process_mcp_results(self, executions: list[MCPToolExecution], results: list[Any]) -> dict[str, Any]:
         """Process parallel MCP execution results"""
@@ -155,31 +193,30 @@ class ParallelMCPExecutor:
             }
         }
 
-        total_time = 0.0
-        sequential_time_estimate = 0.0
+        exec_times: list[float] = []
 
-        for _i, (execution, result) in enumerate(zip(executions, results, strict=False)):
+        for execution, result in zip(executions, results, strict=False):
             tool_key = f"{execution.server}.{execution.tool}"
 
-            exec_time = getattr(result, 'execution_time', 0.0) if result else 0.0
-            total_time = max(total_time, exec_time)  # Parallel time is the max
-            sequential_time_estimate += exec_time
-
-            if result and hasattr(result, 'success') and result.success:
+            try:
+                success, stdout, stderr, return_code, exec_time, error = _unpack_result(result)
+            except AttributeError:
+                # Missing or malformed result (e.g. None)
+                success, stdout, stderr, return_code, exec_time, error = False, '', '', -1, 0.0, ''
+            exec_time = exec_time or 0.0
+            exec_times.append(exec_time)
+
+            if success:
                 processed_results['successful'] += 1
                 processed_results['results'][tool_key] = {
                     'success': True,
-                    'stdout': getattr(result, 'stdout', ''),
-                    'execution_time': getattr(result, 'execution_time', 0.0)
+                    'stdout': stdout,
+                    'execution_time': exec_time
                 }
             else:
                 processed_results['failed'] += 1
                 processed_results['success'] = False
-                error_msg = ''
-                return_code = -1
-                if result:
-                    error_msg = getattr(result, 'stderr', '') or getattr(result, 'error', '')
-                    return_code = getattr(result, 'return_code', -1)
+                error_msg = stderr or error or ''
                 processed_results['results'][tool_key] = {
                     'success': False,
                     'error': error_msg,
@@ -190,8 +227,11 @@ class ParallelMCPExecutor:
                     'error': error_msg
                 })
 
-        # Calculate efficiency
-        if sequential_time_estimate > 0:
+        total_time = max(exec_times, default=0.0)  # Parallel time is the max
+        sequential_time_estimate = sum(exec_times)
+
+        # Efficiency is only meaningful when several calls overlapped
+        if len(exec_times) > 1 and sequential_time_estimate > 0:
             efficiency = (sequential_time_estimate - total_time) / sequential_time_estimate * 100
             processed_results['execution_summary']['parallel_efficiency'] = efficiency
 
@@ -201,8 +241,8 @@ class ParallelMCPExecutor:
         return processed_results
 
     async def _execute_sequential_fallback(self, tool_executions: list[MCPToolExecution]) -> dict[str, Any]:
-        """Fallback to sequential execution when parallel is not available"""
-        self.logger.info("Using sequential fallback execution")
+        """Fallback when the parallel executor is not available: plain asyncio subprocesses"""
+        self.logger.info("Using subprocess fallback execution")
 
         results = {
             'success': True,
@@ -218,65 +258,126 @@ class ParallelMCPExecutor:
             }
         }
 
-        import subprocess
-        import time
-
-        start_time = time.time()
-
-        for execution in tool_executions:
+        start_time = time.perf_counter()
+
+        # Independent MCP calls: run them concurrently so the batch costs the
+        # slowest call rather than the sum, without blocking the event loop.
+        # Each result is aggregated as soon as it arrives; entries are keyed by
+        # tool, so completion order doesn't matter
+        env = self._get_mcp_environment()
+        for next_outcome in asyncio.as_completed(
+            [self._run_mcp_outcome(execution, env) for execution in tool_executions]
+        ):
+            execution, outcome = await next_outcome
             tool_key = f"{execution.server}.{execution.tool}"
-            command = self._build_mcp_command(execution)
 
-            try:
-                result = subprocess.run(
-                    command,
-                    shell=True,
-                    capture_output=True,
-                    text=True,
-                    timeout=execution.timeout,
-                    env=self._get_mcp_environment(),
-                    check=False
-                )
-
-                if result.returncode == 0:
-                    results['successful'] += 1
-                    results['results'][tool_key] = {
-                        'success': True,
-                        'stdout': result.stdout,
-                        'execution_time': 0.0  # Not measured in fallback
-                    }
-                else:
-                    results['failed'] += 1
-                    results['success'] = False
-                    results['results'][tool_key] = {
-                        'success': False,
-                        'error': result.stderr,
-                        'return_code': result.returncode
-                    }
-                    if hasattr(results['errors'], 'append'):
-                        results['errors'].append({
-                            'tool': tool_key,
-                            'error': result.stderr
-                        })
-
-            except Exception as e:
+            if isinstance(outcome, Exception):
                 results['failed'] += 1
                 results['success'] = False
                 results['results'][tool_key] = {
                     'success': False,
-                    'error': str(e),
+                    'error': str(outcome),
                     'return_code': -1
                 }
-                if hasattr(results['errors'], 'append'):
-                    results['errors'].append({
-                        'tool': tool_key,
-                        'error': str(e)
-                    })
+                results['errors'].append({
+                    'tool': tool_key,
+                    'error': str(outcome)
+                })
+                continue
+
+            returncode, stdout, stderr, execution_time = outcome
+            if returncode == 0:
+                results['successful'] += 1
+                results['results'][tool_key] = {
+                    'success': True,
+                    'stdout': stdout,
+                    'execution_time': execution_time
+                }
+            else:
+                results['failed'] += 1
+                results['success'] = False
+                results['results'][tool_key] = {
+                    'success': False,
+                    'error': stderr,
+                    'return_code': returncode
+                }
+                results['errors'].append({
+                    'tool': tool_key,
+                    'error': stderr
+                })
 
-        results['execution_summary']['total_time'] = time.time() - start_time
+        results['execution_summary']['total_time'] = time.perf_counter() - start_time
 
         return results
 
+    async def _run_mcp_outcome(self, execution: MCPToolExecution,
+                               env: dict[str, str]) -> tuple[MCPToolExecution, tuple[int, str, str, float] | Exception]:
+        """Pair an execution with its subprocess outcome, or with the exception it raised"""
+        try:
+            return execution, await self._run_mcp_subprocess(execution, env)
+        except Exception as e:
+            return execution, e
+
+    async def _run_mcp_subprocess(self, execution: MCPToolExecution, env: dict[str, str]) -> tuple[int, str, str, float]:
+        """Run one MCP command without a shell; returns (returncode, stdout, stderr, execution_time)"""
+        start_time = time.perf_counter()
+        # Without pipes, communicate() below reduces to a plain wait()
+        output = asyncio.subprocess.PIPE if execution.capture_output else asyncio.subprocess.DEVNULL
+        process = await asyncio.create_subprocess_exec(
+            *self._build_mcp_command(execution),
+            stdout=output,
+            stderr=output,
+            env=env
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=execution.timeout)
+        except TimeoutError:
+            process.kill()
+            await process.wait()
+            raise TimeoutError(f"Command timed out after {execution.timeout} seconds") from None
+        return (
+            process.returncode,
+            stdout.decode('utf-8', errors='replace') if stdout else '',
+            stderr.decode('utf-8', errors='replace') if stderr else '',
+            time.perf_counter() - start_time
+        )
+
+
+# Prompt-independent operations are built once and shared by every plan;
+# params are read-only views so a shared instance can't be altered in place
+_OP_GET_SYMBOLS = MCPToolExecution(
+    server='serena',
+    tool='get_symbols_overview',
+    params=MappingProxyType({'relative_path': '.'}),
+    priority=8,
+    timeout=30
+)
+_OPS_SWARM = (
+    MCPToolExecution(
+        server='claude-flow',
+        tool='swarm_init',
+        params=MappingProxyType({'topology': 'hierarchical', 'maxAgents': 5}),
+        priority=9,
+        timeout=15,
+        capture_output=False
+    ),
+    MCPToolExecution(
+        server='claude-flow',
+        tool='agent_spawn',
+        params=MappingProxyType({'type': 'coordinator'}),
+        priority=8,
+        timeout=15,
+        capture_output=False
+    ),
+)
+_OP_SEARCH_DEFINITIONS = MCPToolExecution(
+    server='serena',
+    tool='search_for_pattern',
+    params=MappingProxyType({'substring_pattern': r'def |class |function '}),
+    priority=7,
+    timeout=20
+)
+
 
 class ParallelWorkflowOrchestrator:
     """
@@ -324,42 +425,15 @@ class ParallelWorkflowOrchestrator:
         operations = []
 
         # Always get project context in parallel
-        operations.append(MCPToolExecution(
-            server='serena',
-            tool='get_symbols_overview',
-            params={'relative_path': '.'},
-            priority=8,
-            timeout=30
-        ))
+        operations.append(_OP_GET_SYMBOLS)
 
         # If needs swarm coordination
         if analysis.get('needs_swarm', False):
-            operations.extend([
-                MCPToolExecution(
-                    server='claude-flow',
-                    tool='swarm_init',
-                    params={'topology': 'hierarchical', 'maxAgents': 5},
-                    priority=9,
-                    timeout=15
-                ),
-                MCPToolExecution(
-                    server='claude-flow',
-                    tool='agent_spawn',
-                    params={'type': 'coordinator'},
-                    priority=8,
-                    timeout=15
-                )
-            ])
+            operations.extend(_OPS_SWARM)
 
         # If has code analysis needs
         if analysis.get('has_code', False):
-            operations.append(MCPToolExecution(
-                server='serena',
-                tool='search_for_pattern',
-                params={'substring_pattern': r'def |class |function '},
-                priority=7,
-                timeout=20
-            ))
+            operations.append(_OP_SEARCH_DEFINITIONS)
 
         # If needs consultation
         if analysis.get('needs_consultation', False):
@@ -413,10 +487,36 @@ def create_workflow_orchestrator() -> ParallelWorkflowOrchestrator:
     return ParallelWorkflowOrchestrator()
 
 
+# Shared orchestrator for run_parallel_analysis, so repeated prompts reuse one
+# set of worker pools. Creation never awaits, so a threading lock covers every
+# caller regardless of which event loop it runs on.
+_orchestrator: ParallelWorkflowOrchestrator | None = None
+_orchestrator_lock = threading.Lock()
+
+
+def _get_shared_orchestrator() -> ParallelWorkflowOrchestrator:
+    """Return the shared orchestrator, creating it on first use"""
+    global _orchestrator
+    if _orchestrator is None:
+        with _orchestrator_lock:
+            if _orchestrator is None:
+                _orchestrator = create_workflow_orchestrator()
+    return _orchestrator
+
+
+def shutdown_parallel_analysis() -> None:
+    """Release the shared orchestrator's worker pools (for long-running hosts)"""
+    global _orchestrator
+    with _orchestrator_lock:
+        orchestrator, _orchestrator = _orchestrator, None
+    if orchestrator is not None:
+        orchestrator.mcp_executor.close()
+
+
 # Async utility functions
 async def run_parallel_analysis(prompt: str, analysis: dict[str, Any]) -> dict[str, Any]:
     """
     Convenience function to run parallel analysis workflow
     """
-    orchestrator = create_workflow_orchestrator()
+    orchestrator = _get_shared_orchestrator()
     return await orchestrator.orchestrate_analysis_workflow(prompt, analysis)
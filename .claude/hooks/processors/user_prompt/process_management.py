@@ -7,8 +7,8 @@ Enhanced with parallel execution capabilities
 import concurrent.futures
 import contextlib
 import logging
-import multiprocessing
 import os
+import shlex
 import signal
 import subprocess
 import threading
@@ -32,18 +32,53 @@ except ImportError:
 
 # Constants
 PROCESS_TERMINATE_TIMEOUT = 3  # seconds
+BATCH_TIMEOUT_BUFFER = 10  # seconds
+CLAUDE_FLOW_MARKER = 'claude-flow'
 
 
 class ProcessManager:
     """Enhanced process manager with concurrent execution support"""
 
-    def __init__(self, logger: logging.Logger | None = None):
+    def __init__(self, logger: logging.Logger | None = None,
+                 thread_workers: int | None = None, process_workers: int | None = None):
         self.logger = logger
-        self.active_processes: list[subprocess.Popen] = []
-        self._thread_executor = ThreadPoolExecutor(max_workers=4)
-        self._process_executor = ProcessPoolExecutor(max_workers=multiprocessing.cpu_count())
+        self.active_processes: dict[int, subprocess.Popen] = {}  # keyed by pid
+        # Pools are created on first use; None sizes fall back to the executor defaults
+        self._thread_workers = thread_workers
+        self._process_workers = process_workers
+        self._thread_executor: ThreadPoolExecutor | None = None
+        self._process_executor: ProcessPoolExecutor | None = None
         self._lock = threading.Lock()
 
+    @classmethod
+    def from_env(cls, logger: logging.Logger | None = None) -> 'ProcessManager':
+        """Create a manager sized by PROCESS_MGR_THREAD_WORKERS / PROCESS_MGR_PROCESS_WORKERS"""
+        thread_workers = os.environ.get('PROCESS_MGR_THREAD_WORKERS')
+        process_workers = os.environ.get('PROCESS_MGR_PROCESS_WORKERS')
+        return cls(
+            logger,
+            thread_workers=int(thread_workers) if thread_workers else None,
+            process_workers=int(process_workers) if process_workers else None
+        )
+
+    @property
+    def thread_executor(self) -> ThreadPoolExecutor:
+        """Thread pool for I/O-bound work, created on first access"""
+        if self._thread_executor is None:
+            with self._lock:
+                if self._thread_executor is None:
+                    self._thread_executor = ThreadPoolExecutor(max_workers=self._thread_workers)
+        return self._thread_executor
+
+    @property
+    def process_executor(self) -> ProcessPoolExecutor:
+        """Process pool for CPU-bound work, created on first access"""
+        if self._process_executor is None:
+            with self._lock:
+                if self._process_executor is None:
+                    self._process_executor = ProcessPoolExecutor(max_workers=self._process_workers)
+        return self._process_executor
+
     def log(self, level: str, message: str):
         """Log a message if logger is available"""
         if self.logger:
@@ -51,70 +86,86 @@ class ProcessManager:
 
     def kill_process_tree(self, pid: int):
         """Kill a process and all its children"""
-        try:
-            parent = psutil.Process(pid)
-            children = parent.children(recursive=True)
-
-            # Kill children first
-            for child in children:
-                with contextlib.suppress(psutil.NoSuchProcess):
-                    child.terminate()
-
-            # Give them time to terminate gracefully
-            _, alive = psutil.wait_procs(children, timeout=PROCESS_TERMINATE_TIMEOUT)
-
-            # Force kill any remaining
-            for p in alive:
-                with contextlib.suppress(psutil.NoSuchProcess):
-                    p.kill()
+        self.kill_process_trees([pid])
 
-            # Finally kill the parent
+    def kill_process_trees(self, pids: list[int]):
+        """
+        Kill several processes and all their children
+        Every tree is signalled before any waiting, so the grace period is paid once in total
+        """
+        victims: list[psutil.Process] = []
+        for pid in pids:
             try:
-                parent.terminate()
-                parent.wait(timeout=3)
-            except (psutil.NoSuchProcess, psutil.TimeoutExpired):
+                parent = psutil.Process(pid)
+                # Children before the parent, so none are orphaned mid-terminate
+                tree = [*parent.children(recursive=True), parent]
+            except psutil.NoSuchProcess:
+                continue
+            except Exception as e:
+                self.log('warning', f"Error killing process tree for PID {pid}: {e}")
+                continue
+
+            for victim in tree:
                 with contextlib.suppress(psutil.NoSuchProcess):
-                    parent.kill()
+                    victim.terminate()
+            victims.extend(tree)
 
-            self.log('info', f"Successfully killed process tree for PID {pid}")
+        if not victims:
+            return
 
+        try:
+            _, alive = psutil.wait_procs(victims, timeout=PROCESS_TERMINATE_TIMEOUT)
         except Exception as e:
-            self.log('warning', f"Error killing process tree for PID {pid}: {e}")
+            self.log('warning', f"Error waiting on process trees: {e}")
+            alive = victims
+
+        # Force kill any remaining
+        for victim in alive:
+            with contextlib.suppress(psutil.NoSuchProcess):
+                victim.kill()
 
-    def execute_command(self, cmd: str, timeout: int = 60, shell: bool = False) -> tuple[int, str, str]:
+        self.log('info', f"Killed process trees for PIDs {pids}")
+
+    def execute_command(self, cmd: str | list[str], timeout: int = 60, shell: bool = False,
+                        capture_output: bool = True) -> tuple[int, str, str]:
         """
         Execute a command with proper process management
-        Returns: (return_code, stdout, stderr)
+        Returns: (return_code, stdout, stderr); with capture_output=False output
+        goes to /dev/null and stdout/stderr come back empty
         """
         self.log('info', f"Executing command: {cmd}")
 
         try:
+            # Without pipes, communicate() below reduces to a plain wait()
+            output = subprocess.PIPE if capture_output else subprocess.DEVNULL
+
             # For shell commands, use process groups to ensure all children can be killed
             if shell:
                 # Create new process group
                 process = subprocess.Popen(
                     cmd,
                     shell=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
+                    stdout=output,
+                    stderr=output,
                     text=True,
                     preexec_fn=os.setsid if os.name != 'nt' else None
                 )
             else:
-                # Split command into list for non-shell execution
-                cmd_list = cmd.split() if isinstance(cmd, str) else cmd
+                # Split command into list for non-shell execution, honouring quotes
+                cmd_list = shlex.split(cmd, posix=os.name != 'nt') if isinstance(cmd, str) else cmd
                 process = subprocess.Popen(
                     cmd_list,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
+                    stdout=output,
+                    stderr=output,
                     text=True
                 )
 
             with self._lock:
-                self.active_processes.append(process)
+                self.active_processes[process.pid] = process
 
             try:
                 stdout, stderr = process.communicate(timeout=timeout)
+                stdout, stderr = stdout or "", stderr or ""
                 return_code = process.returncode
 
                 self.log('info', f"Command completed with return code: {return_code}")
@@ -141,6 +192,7 @@ class ProcessManager:
                 # Get any partial output
                 try:
                     stdout, stderr = process.communicate(timeout=1)
+                    stdout, stderr = stdout or "", stderr or ""
                 except subprocess.TimeoutExpired:
                     stdout, stderr = "", "Process timed out and was killed"
 
@@ -149,66 +201,90 @@ class ProcessManager:
             finally:
                 # Remove from active processes
                 with self._lock:
-                    if process in self.active_processes:
-                        self.active_processes.remove(process)
+                    self.active_processes.pop(process.pid, None)
 
         except Exception as e:
             self.log('error', f"Failed to execute command: {e}")
             return -1, "", str(e)
 
-    def execute_command_with_executor(self, cmd: str, timeout: int = 60,
+    def execute_command_with_executor(self, cmd: str | list[str], timeout: int = 60,
                                     shell: bool = False, use_thread_pool: bool = True) -> concurrent.futures.Future:
         """Execute command using thread or process pool executor"""
-        executor = self._thread_executor if use_thread_pool else self._process_executor
+        executor = self.thread_executor if use_thread_pool else self.process_executor
         return executor.submit(self.execute_command, cmd, timeout, shell)
 
-    def execute_commands_parallel(self, commands: list[str], timeout: int = 60,
+    def execute_commands_parallel(self, commands: list[str | list[str]], timeout: int = 60,
                                  shell: bool = False, max_workers: int | None = None) -> list[tuple[int, str, str]]:
-        """Execute multiple commands in parallel using ThreadPoolExecutor"""
-        with ThreadPoolExecutor(max_workers=max_workers or min(len(commands), 4)) as executor:
+        """
+        Execute multiple commands in parallel, results in the same order as commands
+        Runs on the shared thread pool unless max_workers is given, in which case a
+        dedicated pool of that size is used; callers already running on
+        thread_executor must pass max_workers so they never wait on their own pool
+        """
+        executor = self.thread_executor if max_workers is None else ThreadPoolExecutor(max_workers=max_workers)
+        # Commands beyond the pool size queue behind others, so the deadline allows
+        # every worker to run its share of commands to their timeout
+        rounds = -(-len(commands) // executor._max_workers)
+        deadline = rounds * timeout + BATCH_TIMEOUT_BUFFER
+        try:
             futures = [executor.submit(self.execute_command, cmd, timeout, shell) for cmd in commands]
-            results = []
+            concurrent.futures.wait(futures, timeout=deadline)
 
-            for future in concurrent.futures.as_completed(futures):
+            results = []
+            for future in futures:
+                if not future.done():
+                    # Not started or still running at the deadline; running commands
+                    # are still bounded by their own timeout
+                    future.cancel()
+                    self.log('error', f"Parallel command execution timed out after {deadline} seconds")
+                    results.append((-1, "", f"Timed out after {deadline} seconds"))
+                    continue
                 try:
-                    result = future.result(timeout=timeout + 10)  # Add buffer time
-                    results.append(result)
+                    results.append(future.result())
                 except Exception as e:
                     self.log('error', f"Parallel command execution failed: {e}")
                     results.append((-1, "", str(e)))
 
             return results
+        finally:
+            if executor is not self._thread_executor:
+                executor.shutdown(wait=False, cancel_futures=True)
 
     def execute_cpu_intensive_task(self, func: Callable, *args, **kwargs) -> concurrent.futures.Future:
         """Execute CPU-intensive task using ProcessPoolExecutor"""
-        return self._process_executor.submit(func, *args, **kwargs)
+        return self.process_executor.submit(func, *args, **kwargs)
 
     def execute_io_intensive_task(self, func: Callable, *args, **kwargs) -> concurrent.futures.Future:
         """Execute I/O-intensive task using ThreadPoolExecutor"""
-        return self._thread_executor.submit(func, *args, **kwargs)
+        return self.thread_executor.submit(func, *args, **kwargs)
 
     def cleanup_all(self):
         """Clean up all active processes and executors"""
         with self._lock:
-            for process in self.active_processes[:]:  # Copy list to avoid modification during iteration
+            running = []
+            for process in self.active_processes.values():
                 try:
                     if process.poll() is None:  # Process still running
-                        self.kill_process_tree(process.pid)
+                        running.append(process.pid)
                 except Exception as e:
                     self.log('warning', f"Error cleaning up process: {e}")
 
+            if running:
+                self.kill_process_trees(running)
             self.active_processes.clear()
 
-        # Shutdown executors
-        try:
-            self._thread_executor.shutdown(wait=True)
-        except Exception as e:
-            self.log('warning', f"Error shutting down thread executor: {e}")
+        # Shutdown executors that were actually created
+        if self._thread_executor is not None:
+            try:
+                self._thread_executor.shutdown(wait=True)
+            except Exception as e:
+                self.log('warning', f"Error shutting down thread executor: {e}")
 
-        try:
-            self._process_executor.shutdown(wait=True)
-        except Exception as e:
-            self.log('warning', f"Error shutting down process executor: {e}")
+        if self._process_executor is not None:
+            try:
+                self._process_executor.shutdown(wait=True)
+            except Exception as e:
+                self.log('warning', f"Error shutting down process executor: {e}")
 
     def __del__(self):
         """Cleanup on destruction"""
@@ -225,25 +301,39 @@ def find_and_kill_zombie_processes(logger: logging.Logger | None = None):
     # Fallback to original implementation
     killed_count = 0
     try:
-        for proc in psutil.process_iter(['pid', 'name', 'status', 'cmdline']):
+        # Everything the loop reads is prefetched here, so each process costs one
+        # pass over its /proc files rather than extra reads for parent/create_time
+        now = time.time()
+        own_pid = os.getpid()
+        for proc in psutil.process_iter(['pid', 'name', 'status', 'cmdline', 'create_time', 'ppid']):
             try:
                 # Check for zombie status
                 if proc.info['status'] == psutil.STATUS_ZOMBIE:
                     if logger:
                         logger.warning(f"Found zombie process: PID={proc.info['pid']}, Name={proc.info['name']}")
-                    # Zombie processes need parent to reap them
-                    try:
-                        parent = proc.parent()
-                        if parent:
-                            os.kill(parent.pid, signal.SIGCHLD)
-                    except Exception:
-                        pass
-
-                # Check for long-running Claude Flow processes
-                elif proc.info['cmdline'] and any('claude-flow' in str(arg) for arg in proc.info['cmdline']):
+                    # Our own child: reap it directly with one non-blocking waitpid
+                    if proc.info['ppid'] == own_pid:
+                        with contextlib.suppress(ChildProcessError, OSError):
+                            if os.waitpid(proc.info['pid'], os.WNOHANG)[0] == proc.info['pid']:
+                                killed_count += 1
+                                continue
+                    # Otherwise the parent has to reap it
+                    with contextlib.suppress(Exception):
+                        if proc.info['ppid']:
+                            os.kill(proc.info['ppid'], signal.SIGCHLD)
+                    continue
+
+                # Check for long-running Claude Flow processes (kernel threads have no cmdline)
+                cmdline = proc.info['cmdline']
+                if not cmdline:
+                    continue
+                # One membership test over the joined argv; not argv[0] alone, since
+                # `npx claude-flow` runs as node with the package path in argv[1]
+                if CLAUDE_FLOW_MARKER in ' '.join(cmdline):
                     try:
-                        create_time = proc.create_time()
-                        age = time.time() - create_time
+                        # None when the attribute couldn't be read; treat as not old
+                        create_time = proc.info['create_time']
+                        age = now - create_time if create_time is not None else 0.0
 
                         # Kill if older than 15 minutes (900 seconds)
                         if age > 900:
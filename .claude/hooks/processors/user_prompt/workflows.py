@@ -5,78 +5,58 @@ Workflow orchestration functions for user prompt processing
 
 import json
 import logging
+import re
+import string
 import time
-from typing import Any
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from types import MappingProxyType
+from typing import Any, ClassVar, NamedTuple
+
+from ._callcache import cached
 
 # MCP tool execution removed - hooks now return instructions only
 from .process_management import ProcessManager
 
 # Constants
 CONSULTATION_TIMEOUT_SECONDS = 120
+TASK_PREVIEW_CHARS = 200
+TAVILY_QUERY_MAX_CHARS = 500
+
+# Thinking keyword tiers, from basic to strongest reasoning trigger
+_THINKING_TIERS = {
+    'tier1': ('think',),
+    'tier2': ('think deeply', 'think about it', 'think a lot', 'think hard', 'think more', 'megathink'),
+    'tier3': ('think harder', 'think intensely', 'think longer', 'think really hard', 'think super hard', 'think very hard', 'ultrathink')
+}
 
 
-def create_zen_consultation_task(prompt, mcp_tools, project_context):
-    """Create a task object for Zen consultation"""
-    return {
-        'prompt': prompt,
-        'mcp_tools': mcp_tools,
-        'project_context': project_context,
-        'timestamp': time.time()
-    }
-
-
-def run_zen_consultation_functional(zen_task, prompt_analysis: dict[str, Any], logger, process_manager: ProcessManager):
-    """
-    Generate instructions for Zen consultation (no direct execution)
-    """
-    workflow = prompt_analysis.get('suggested_workflow', 'chat')
-
-    if logger:
-        logger.info(f"Generating Zen consultation instructions for workflow: {workflow}")
+class _KeywordCasing(NamedTuple):
+    plain: str
+    title: str
+    upper: str
 
-    # Prepare the consultation parameters
-    consultation_params = {
-        'prompt': zen_task['prompt'],
-        'model': 'anthropic/claude-opus-4',  # Default to best model
-        'thinking_mode': 'high' if prompt_analysis.get('complexity') == 'high' else 'medium',
-        'use_websearch': True
-    }
 
-    # Add workflow-specific parameters
-    if workflow == 'thinkdeep':
-        consultation_params.update({
-            'step': 'Initial analysis',
-            'step_number': 1,
-            'total_steps': 3,
-            'next_step_required': True,
-            'findings': 'Starting investigation'
-        })
-    elif workflow == 'debug':
-        consultation_params.update({
-            'confidence': 'exploring'
-        })
-    elif workflow == 'codereview':
-        consultation_params.update({
-            'review_type': 'full',
-            'severity_filter': 'all'
-        })
+# Every casing the instructions use, computed once per keyword
+_KEYWORD_CASINGS = {
+    kw: _KeywordCasing(kw, kw.title(), kw.upper())
+    for tier in _THINKING_TIERS.values() for kw in tier
+}
 
-    # 🚨 CRITICAL: Return instructions that STRONGLY recommend Task() execution WITH THINKING KEYWORDS
-    # Determine thinking keywords based on workflow complexity
-    workflow_complexity = 'high' if workflow in ['thinkdeep', 'analyze', 'debug'] else 'medium'
-    workflow_thinking = get_thinking_keywords_for_complexity(workflow_complexity)
-    main_keyword = workflow_thinking['primary'][0]
-    
-    instructions = f"""### 🚨 MANDATORY: {main_keyword.title()} About Using Task() for Zen Consultation
+# Static instruction text is assembled once at import; each call only
+# substitutes the handful of fields that actually vary
+_ZEN_INSTRUCTIONS_TMPL = string.Template("""### 🚨 MANDATORY: ${main_keyword_title} About Using Task() for Zen Consultation
 
-**🎯 CRITICAL INSTRUCTION**: You MUST **{main_keyword}** and use the Task() tool to execute Zen consultation!
+**🎯 CRITICAL INSTRUCTION**: You MUST **${main_keyword}** and use the Task() tool to execute Zen consultation!
 
 **REQUIRED PATTERN** - Think super hard about this execution:
 ```
-Task("Please use mcp__zen__{workflow} tool with the following parameters: {json.dumps(consultation_params, indent=2)}")
+Task("Please use mcp__zen__${workflow} tool with the following parameters: ${params_json}")
 ```
 
-**🚨 WHY YOU MUST {main_keyword.upper()} ABOUT Task() EXECUTION**:
+**🚨 WHY YOU MUST ${main_keyword_upper} ABOUT Task() EXECUTION**:
 - ✅ Enables **parallel execution** with other operations (think deeply about efficiency)
 - ✅ Provides **expert analysis and validation** beyond Claude Code's capabilities (megathink required)
 - ✅ **Systematic approach** ensures thorough investigation (think intensely about methodology)
@@ -86,146 +66,191 @@ Task("Please use mcp__zen__{workflow} tool with the following parameters: {json.
 **🔥 BATCH WITH OTHER OPERATIONS - Think Very Hard About Efficiency**: 
 Combine your Task() call with file operations, bash commands, and swarm initialization in a SINGLE message for maximum efficiency! Think longer about optimization opportunities.
 
-**Workflow**: {workflow} | **Tool**: `mcp__zen__{workflow}` | **Confidence**: 95% | **Thinking Mode**: {main_keyword}"""
-
-    return {
-        'success': True,
-        'workflow': workflow,
-        'output': instructions,
-        'consultation_params': consultation_params
-    }
-
-
-def run_claude_flow_swarm_orchestration(prompt: str, swarm_analysis: dict[str, Any], logger, process_manager: ProcessManager):
-    """
-    Generate instructions for Claude Flow swarm orchestration (no direct execution)
-    """
-    if logger:
-        logger.info("Generating Claude Flow swarm orchestration instructions")
-
-    # Prepare swarm parameters
-    topology = swarm_analysis.get('suggested_topology', 'hierarchical')
-    max_agents = swarm_analysis.get('estimated_agents', 3)
-    
-    # Determine agent types based on task
-    agent_types = ['coordinator', 'researcher', 'coder', 'analyst', 'tester']
-    agents_to_spawn = agent_types[:max_agents]
+**Workflow**: ${workflow} | **Tool**: `mcp__zen__${workflow}` | **Confidence**: 95% | **Thinking Mode**: ${main_keyword}""")
+
+# Task-specific recommendations; $kw0/$kw1 are the first two thinking keywords
+_TASK_RECOMMENDATIONS_TEMPLATES = {
+    'debugging': tuple(map(string.Template, (
+        "🚨 MANDATORY: Use Task() to execute `mcp__zen__debug` for systematic investigation ($kw0 about root causes)",
+        "🚨 BATCH: Combine Task() with log reading and error analysis in ONE message ($kw1 about efficiency)",
+        "🚨 PARALLEL: Use `TodoWrite` to track debugging steps alongside other operations (megathink about coordination)"
+    ))),
+    'testing': tuple(map(string.Template, (
+        "🚨 MANDATORY: Use Task() to execute `mcp__zen__testgen` for comprehensive test generation ($kw0 about edge cases)",
+        "🚨 BATCH: Combine Task() with file operations and test execution in ONE message ($kw1 about coverage)",
+        "🚨 PARALLEL: Consider edge cases through coordinated agent analysis (ultrathink about scenarios)"
+    ))),
+    'research': tuple(map(string.Template, (
+        "🚨 MANDATORY: Use Task() to execute `mcp__zen__analyze` for deep analysis ($kw0 about methodology)",
+        "🚨 BATCH: Combine Task() with WebSearch and documentation lookup in ONE message ($kw1 about sources)",
+        "🚨 PARALLEL: Document findings through coordinated memory storage (think super hard about organization)"
+    ))),
+    'documentation': tuple(map(string.Template, (
+        "🚨 MANDATORY: Use Task() to execute `mcp__zen__docgen` for documentation generation ($kw0 about clarity)",
+        "🚨 BATCH: Combine Task() with file reading and writing in ONE message ($kw1 about structure)",
+        "🚨 PARALLEL: Follow project standards through coordinated agent review (think intensely about consistency)"
+    ))),
+}
 
-    # Generate orchestration instructions
-    instructions = f"""### 🐝 Claude Flow Swarm Orchestration
+# Fixed multi-line sections of the full coordination output, yielded as one
+# piece each so the final join handles a third as many items
+_COORDINATION_WHY_BLOCK = "\n".join((
+    "- ✅ **Parallel execution** - 2.8-4.4x speed improvement (think about efficiency)",
+    "- ✅ **Task() batching** - Combine multiple operations efficiently (think deeply about coordination)",
+    "- ✅ **Expert validation** - Beyond Claude Code's native capabilities (megathink required)",
+    "- ✅ **Memory coordination** - Persistent context across agents (think intensely about persistence)",
+    "- ✅ **Error resilience** - Multiple perspectives prevent mistakes (ultrathink for safety)",
+))
+
+_COORDINATION_STEPS_BLOCK = "\n".join((
+    "**Step 1**: Initialize swarm with `mcp__claude-flow__swarm_init` (think about topology)",
+    "**Step 2**: Spawn ALL agents with `mcp__claude-flow__agent_spawn` (think deeply about batching)",
+    "**Step 3**: Use `Task()` tool to spawn agents with coordination instructions (megathink required)",
+    "**Step 4**: Batch file operations, bash commands, and TodoWrite in ONE message (think super hard about efficiency)",
+    "**Step 5**: Use `mcp__claude-flow__memory_usage` for coordination (ultrathink about persistence)",
+))
+
+_COORDINATION_PATTERN_BLOCK = "\n".join((
+    "1. ALWAYS start with `mcp__claude-flow__swarm_init` (think about topology selection)",
+    "2. BATCH ALL operations in ONE message (Task(), TodoWrite, Read, Write, Bash) - think deeply about efficiency",
+    "3. Use Task() for ALL Zen consultations - NEVER execute mcp__zen__ tools directly (megathink about delegation)",
+    "4. Spawn agents with coordination hooks and memory storage (ultrathink about coordination)",
+))
+
+_COMPLEXITY_EMPHASIS = {
+    'high': 'think super hard',
+    'medium': 'think deeply',
+    'low': 'think'
+}
 
-**Task**: {prompt[:200]}{"..." if len(prompt) > 200 else ""}
+# Coordination output for the common general/low-complexity prompt: the
+# thinking keywords are fixed there, so only these fields vary. Assembled in
+# the same order as _iter_coordination_lines, from the same blocks
+_LOW_GENERAL_COORDINATION_TMPL = string.Template("\n".join((
+    "## 🎯 Task Coordination Analysis\n",
+    "**Task Complexity**: LOW",
+    "**Confidence**: ${confidence}%\n",
+    "### 🚨 MANDATORY: Think About Swarm Coordination\n",
+    "🚨 **CRITICAL**: You must **think super hard** about this task coordination approach!\n",
+    "**Recommended Agents**: ${agent_count}",
+    "**Topology**: ${topology}",
+    "\n**🚨 WHY YOU MUST THINK ABOUT SWARM COORDINATION**:",
+    _COORDINATION_WHY_BLOCK.replace('$', '$$'),
+    "\n### 🚨 MANDATORY APPROACH - Think Harder About Parallel Execution:\n",
+    _COORDINATION_STEPS_BLOCK.replace('$', '$$'),
+    "\n**Suggested Zen Workflow**: `${workflow}` (via Task() tool - think intensely about execution)",
+    "**CRITICAL**: Use Task() to execute `mcp__zen__${workflow}` for expert analysis (think very hard about approach)",
+    "\n---",
+    "**🚨 MANDATORY EXECUTION PATTERN - THINK ABOUT IMPLEMENTATION**:",
+    _COORDINATION_PATTERN_BLOCK.replace('$', '$$'),
+    "\n**Ready to proceed with MANDATORY swarm coordination and Task() execution - "
+    f"{_COMPLEXITY_EMPHASIS['low']} about every step!**",
+)))
+
+_SWARM_HEADER_TMPL = string.Template("""### 🐝 Claude Flow Swarm Orchestration
+
+**Task**: ${task}
 **Complexity**: HIGH - Requires coordinated execution
-**Recommended Agents**: {max_agents}
+**Recommended Agents**: ${max_agents}
 
 #### Step 1: Initialize Swarm
 ```
 Tool: mcp__claude-flow__swarm_init
-Parameters: {{
-  "topology": "{topology}",
-  "maxAgents": {max_agents},
+Parameters: {
+  "topology": "${topology}",
+  "maxAgents": ${max_agents},
   "strategy": "balanced"
-}}
+}
 ```
 
 #### Step 2: Spawn Specialized Agents
 Use the Task tool to spawn the following agents in PARALLEL:
 
-"""
+""")
 
-    # Add agent spawning instructions
-    agent_prompts = {
-        'coordinator': "You are the Coordinator agent. Your role is to track overall progress and ensure integration between components.",
-        'researcher': "You are the Researcher agent. Your role is to analyze requirements and gather necessary information.",
-        'coder': "You are the Coder agent. Your role is to implement the core functionality with clean, efficient code.",
-        'analyst': "You are the Analyst agent. Your role is to design data models and system architecture.",
-        'tester': "You are the Tester agent. Your role is to ensure comprehensive test coverage and quality."
-    }
-
-    for i, agent_type in enumerate(agents_to_spawn, 1):
-        instructions += f"""{i}. **{agent_type.capitalize()} Agent**
+# Per-agent block: filled with str.format_map, which beats Template in the spawn loop
+_AGENT_BLOCK_TMPL = """{index}. **{agent_title} Agent**
    ```
-   Task("{agent_prompts.get(agent_type, 'Specialized agent')}
+   Task("{agent_prompt}
    
    MANDATORY COORDINATION:
-   1. START: Run `npx claude-flow@alpha hooks pre-task --description \"{agent_type} starting\"`
-   2. DURING: After EVERY file operation, run `npx claude-flow@alpha hooks post-edit --file \"[file]\"`
-   3. SHARE: Use `npx claude-flow@alpha hooks notification --message \"[decision]\"`
-   4. END: Run `npx claude-flow@alpha hooks post-task --task-id \"{agent_type}\"`
+   1. START: Run `npx claude-flow@alpha hooks pre-task --description "{agent_type} starting"`
+   2. DURING: After EVERY file operation, run `npx claude-flow@alpha hooks post-edit --file "[file]"`
+   3. SHARE: Use `npx claude-flow@alpha hooks notification --message "[decision]"`
+   4. END: Run `npx claude-flow@alpha hooks post-task --task-id "{agent_type}"`
    
    Your specific task: [Assign based on main task requirements]")
    ```
 
 """
 
-    instructions += f"""#### Step 3: Track Progress
+_SWARM_FOOTER_TMPL = string.Template("""#### Step 3: Track Progress
 ```
 Tool: mcp__claude-flow__memory_usage
-Parameters: {{
+Parameters: {
   "action": "store",
   "key": "swarm/initialization",
-  "value": {{
-    "prompt": "{prompt[:100]}...",
-    "agents": {json.dumps(agents_to_spawn)},
-    "timestamp": "{{current_time}}"
-  }}
-}}
+  "value": {
+    "prompt": ${prompt_json},
+    "agents": ${agents_json},
+    "timestamp": "{current_time}"
+  }
+}
 ```
 
 #### Step 4: Monitor Execution
 Use `mcp__claude-flow__swarm_status` periodically to check progress.
 
-**Note**: All operations should be executed in a single BatchTool message for maximum efficiency."""
+**Note**: All operations should be executed in a single BatchTool message for maximum efficiency.""")
 
-    return {
-        'success': True,
-        'spawned_agents': agents_to_spawn,
-        'output': instructions
-    }
+# GitHub operations requested in a prompt, matched in one pass
+_GITHUB_TRIGGER_RE = re.compile(r'\b(list issues|show issues|create pr|open pr|notifications)\b')
 
+# Swarm agent pool, in spawn priority order, and each agent's Task() prompt
+_AGENT_TYPES: tuple[str, ...] = ('coordinator', 'researcher', 'coder', 'analyst', 'tester')
+_AGENT_PROMPTS: Mapping[str, str] = MappingProxyType({
+    'coordinator': "You are the Coordinator agent. Your role is to track overall progress and ensure integration between components.",
+    'researcher': "You are the Researcher agent. Your role is to analyze requirements and gather necessary information.",
+    'coder': "You are the Coder agent. Your role is to implement the core functionality with clean, efficient code.",
+    'analyst': "You are the Analyst agent. Your role is to design data models and system architecture.",
+    'tester': "You are the Tester agent. Your role is to ensure comprehensive test coverage and quality."
+})
 
-def run_github_claude_flow_orchestration(prompt: str, github_analysis: dict[str, Any], logger, process_manager: ProcessManager):
-    """
-    Generate instructions for GitHub-specific Claude Flow orchestration (no direct execution)
-    """
-    if logger:
-        logger.info("Generating GitHub Claude Flow orchestration instructions")
+# The swarm picks a prefix of the agent pool, so every possible agents
+# list can be serialized up front
+_AGENT_SLICE_JSON = {n: json.dumps(_AGENT_TYPES[:n]) for n in range(1, len(_AGENT_TYPES) + 1)}
 
-    # GitHub-specific agent configurations
-    github_agents = ['repo-manager', 'pr-reviewer', 'issue-triager']
-    operations = github_analysis.get('suggested_operations', [])
+# GitHub specialist agents and their Task() prompts
+_GITHUB_AGENTS: tuple[str, ...] = ('repo-manager', 'pr-reviewer', 'issue-triager')
+_GITHUB_AGENT_DESCRIPTIONS: Mapping[str, str] = MappingProxyType({
+    'repo-manager': "You are the Repository Manager. Focus on repository structure, dependencies, and overall health.",
+    'pr-reviewer': "You are the PR Reviewer. Analyze pull requests, suggest improvements, and ensure code quality.",
+    'issue-triager': "You are the Issue Triager. Categorize issues, assign priorities, and suggest resolutions."
+})
 
-    instructions = f"""### 🔗 GitHub-Specific Swarm Orchestration
+_GITHUB_HEADER_TMPL = string.Template("""### 🔗 GitHub-Specific Swarm Orchestration
 
-**Task**: {prompt[:200]}{"..." if len(prompt) > 200 else ""}
+**Task**: ${task}
 **Focus**: GitHub repository management and collaboration
 
 #### Step 1: Initialize GitHub-Aware Swarm
 ```
 Tool: mcp__claude-flow__swarm_init
-Parameters: {{
+Parameters: {
   "topology": "hierarchical",
   "maxAgents": 5,
   "strategy": "specialized"
-}}
+}
 ```
 
 #### Step 2: Spawn GitHub Specialist Agents
 Use the Task tool to spawn these GitHub-focused agents:
 
-"""
-
-    # GitHub agent descriptions
-    agent_descriptions = {
-        'repo-manager': "You are the Repository Manager. Focus on repository structure, dependencies, and overall health.",
-        'pr-reviewer': "You are the PR Reviewer. Analyze pull requests, suggest improvements, and ensure code quality.",
-        'issue-triager': "You are the Issue Triager. Categorize issues, assign priorities, and suggest resolutions."
-    }
+""")
 
-    for i, agent in enumerate(github_agents, 1):
-        instructions += f"""{i}. **GitHub {agent.replace('-', ' ').title()}**
+_GITHUB_AGENT_BLOCK_TMPL = """{index}. **GitHub {agent_title}**
    ```
-   Task("{agent_descriptions[agent]}
+   Task("{agent_description}
    
    MANDATORY: Use coordination hooks and GitHub MCP tools.
    Coordinate through npx claude-flow@alpha hooks.")
@@ -233,26 +258,243 @@ Use the Task tool to spawn these GitHub-focused agents:
 
 """
 
-    # Add suggested operations
-    if operations:
-        instructions += "#### Step 3: Execute GitHub Operations\n"
-        instructions += "Based on the task, consider using these GitHub MCP tools:\n\n"
-        for op in operations:
-            instructions += f"- `mcp__github__{op}`\n"
-
-    instructions += """
+_GITHUB_FOOTER = """
 #### Step 4: Coordinate Results
 Store findings and coordinate between agents using `mcp__claude-flow__memory_usage`.
 
 **Note**: Execute all operations in parallel using BatchTool for efficiency."""
 
+
+def _task_preview(prompt: str) -> str:
+    """Truncated prompt for the **Task** line of orchestration instructions"""
+    if len(prompt) > TASK_PREVIEW_CHARS:
+        return f"{prompt[:TASK_PREVIEW_CHARS]}..."
+    return prompt
+
+
+@dataclass
+class _InstructionResult(ABC):
+    """
+    Instruction result whose markdown is rendered on first access to .output.
+    Also answers the dict-style reads (result['output'], result.get('success')) of the old result dicts,
+    and to_dict() rebuilds those dicts exactly, e.g. for json.dumps.
+    """
+    success = True
+
+    # Keys of the old result dict, in order, after 'success'
+    _DICT_FIELDS: ClassVar[tuple[str, ...]] = ()
+
+    @abstractmethod
+    def render(self) -> str:
+        """Build the instruction markdown"""
+
+    @cached_property
+    def output(self) -> str:
+        return self.render()
+
+    def __str__(self) -> str:
+        return self.output
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def to_dict(self) -> dict[str, Any]:
+        """The result as the plain dict the run_* functions used to return; renders the output"""
+        return {'success': self.success, **{name: getattr(self, name) for name in self._DICT_FIELDS}}
+
+
+@dataclass
+class ZenInstructions(_InstructionResult):
+    """Zen consultation instructions"""
+    workflow: str
+    consultation_params: dict[str, Any]
+    main_keyword: str
+
+    _DICT_FIELDS = ('workflow', 'output', 'consultation_params')
+
+    def render(self) -> str:
+        casing = _KEYWORD_CASINGS[self.main_keyword]
+        return _ZEN_INSTRUCTIONS_TMPL.substitute(
+            main_keyword=self.main_keyword,
+            main_keyword_title=casing.title,
+            main_keyword_upper=casing.upper,
+            workflow=self.workflow,
+            params_json=json.dumps(self.consultation_params, indent=2),
+        )
+
+
+@dataclass
+class SwarmInstructions(_InstructionResult):
+    """Claude Flow swarm orchestration instructions"""
+    prompt: str
+    topology: str
+    max_agents: int
+    spawned_agents: list[str]
+
+    _DICT_FIELDS = ('spawned_agents', 'output')
+
+    def render(self) -> str:
+        parts = [_SWARM_HEADER_TMPL.substitute(
+            task=_task_preview(self.prompt), max_agents=self.max_agents, topology=self.topology
+        )]
+
+        # Add agent spawning instructions
+        get_prompt = _AGENT_PROMPTS.get
+        append = parts.append
+        for i, agent_type in enumerate(self.spawned_agents, 1):
+            append(_AGENT_BLOCK_TMPL.format_map({
+                'index': i,
+                'agent_title': agent_type.capitalize(),
+                'agent_type': agent_type,
+                'agent_prompt': get_prompt(agent_type, 'Specialized agent'),
+            }))
+
+        parts.append(_SWARM_FOOTER_TMPL.substitute(
+            prompt_json=json.dumps(f"{self.prompt[:100]}...", ensure_ascii=False),
+            agents_json=_AGENT_SLICE_JSON.get(self.max_agents) or json.dumps(self.spawned_agents),
+        ))
+        return "".join(parts)
+
+
+@dataclass
+class GitHubSwarmInstructions(_InstructionResult):
+    """GitHub-specific swarm orchestration instructions"""
+    prompt: str
+    spawned_agents: list[str]
+    operations: list[str]
+
+    _DICT_FIELDS = ('spawned_agents', 'operations', 'output')
+
+    def render(self) -> str:
+        parts = [_GITHUB_HEADER_TMPL.substitute(task=_task_preview(self.prompt))]
+
+        describe = _GITHUB_AGENT_DESCRIPTIONS.__getitem__
+        append = parts.append
+        for i, agent in enumerate(self.spawned_agents, 1):
+            append(_GITHUB_AGENT_BLOCK_TMPL.format_map({
+                'index': i,
+                'agent_title': agent.replace('-', ' ').title(),
+                'agent_description': describe(agent),
+            }))
+
+        # Add suggested operations
+        if self.operations:
+            parts.append("#### Step 3: Execute GitHub Operations\n")
+            parts.append("Based on the task, consider using these GitHub MCP tools:\n\n")
+            for op in self.operations:
+                parts.append(f"- `mcp__github__{op}`\n")
+
+        parts.append(_GITHUB_FOOTER)
+        return "".join(parts)
+
+
+def create_zen_consultation_task(prompt, mcp_tools, project_context, timestamp: int | None = None):
+    """Create a task object for Zen consultation; timestamp is in integer nanoseconds"""
     return {
-        'success': True,
-        'spawned_agents': github_agents,
-        'operations': operations,
-        'output': instructions
+        'prompt': prompt,
+        'mcp_tools': mcp_tools,
+        'project_context': project_context,
+        'timestamp': timestamp or time.time_ns()
+    }
+
+
+def run_zen_consultation_functional(zen_task, prompt_analysis: dict[str, Any], logger, process_manager: ProcessManager):
+    """
+    Generate instructions for Zen consultation (no direct execution)
+    """
+    workflow = prompt_analysis.get('suggested_workflow', 'chat')
+
+    if logger and logger.isEnabledFor(logging.INFO):
+        logger.info("Generating Zen consultation instructions for workflow: %s", workflow)
+
+    return _zen_instructions(zen_task['prompt'], workflow, prompt_analysis.get('complexity') == 'high')
+
+
+@cached
+def _zen_instructions(prompt: str, workflow: str, high_complexity: bool) -> ZenInstructions:
+    """Zen instructions from the only inputs that shape them"""
+    # Prepare the consultation parameters
+    consultation_params = {
+        'prompt': prompt,
+        'model': 'anthropic/claude-opus-4',  # Default to best model
+        'thinking_mode': 'high' if high_complexity else 'medium',
+        'use_websearch': True
     }
 
+    # Add workflow-specific parameters
+    if workflow == 'thinkdeep':
+        consultation_params.update({
+            'step': 'Initial analysis',
+            'step_number': 1,
+            'total_steps': 3,
+            'next_step_required': True,
+            'findings': 'Starting investigation'
+        })
+    elif workflow == 'debug':
+        consultation_params.update({
+            'confidence': 'exploring'
+        })
+    elif workflow == 'codereview':
+        consultation_params.update({
+            'review_type': 'full',
+            'severity_filter': 'all'
+        })
+
+    # 🚨 CRITICAL: Return instructions that STRONGLY recommend Task() execution WITH THINKING KEYWORDS
+    # Determine thinking keywords based on workflow complexity
+    workflow_complexity = 'high' if workflow in ['thinkdeep', 'analyze', 'debug'] else 'medium'
+    workflow_thinking = get_thinking_keywords_for_complexity(workflow_complexity)
+    main_keyword = workflow_thinking['primary'][0]
+    
+    return ZenInstructions(workflow, consultation_params, main_keyword)
+
+
+def run_claude_flow_swarm_orchestration(prompt: str, swarm_analysis: dict[str, Any], logger, process_manager: ProcessManager):
+    """
+    Generate instructions for Claude Flow swarm orchestration (no direct execution)
+    """
+    if logger:
+        logger.info("Generating Claude Flow swarm orchestration instructions")
+
+    # Prepare swarm parameters
+    topology = swarm_analysis.get('suggested_topology', 'hierarchical')
+    max_agents = swarm_analysis.get('estimated_agents', 3)
+
+    return _swarm_instructions(prompt, topology, max_agents)
+
+
+@cached
+def _swarm_instructions(prompt: str, topology: str, max_agents: int) -> SwarmInstructions:
+    """Swarm instructions from the only inputs that shape them"""
+    # Determine agent types based on task
+    agents_to_spawn = list(_AGENT_TYPES[:max_agents])
+
+    return SwarmInstructions(prompt, topology, max_agents, agents_to_spawn)
+
+
+def run_github_claude_flow_orchestration(prompt: str, github_analysis: dict[str, Any], logger, process_manager: ProcessManager):
+    """
+    Generate instructions for GitHub-specific Claude Flow orchestration (no direct execution)
+    """
+    if logger:
+        logger.info("Generating GitHub Claude Flow orchestration instructions")
+
+    operations = github_analysis.get('suggested_operations', [])
+
+    return _github_swarm_instructions(prompt, operations)
+
+
+@cached
+def _github_swarm_instructions(prompt: str, operations: list[str]) -> GitHubSwarmInstructions:
+    """GitHub swarm instructions from the only inputs that shape them"""
+    return GitHubSwarmInstructions(prompt, list(_GITHUB_AGENTS), list(operations))
+
 
 def run_github_mcp_integration(prompt: str, smart_triggers: dict[str, Any], logger, process_manager: ProcessManager):
     """
@@ -264,12 +506,12 @@ def run_github_mcp_integration(prompt: str, smart_triggers: dict[str, Any], logg
     if logger:
         logger.info("Generating GitHub MCP integration instructions")
 
-    # Analyze what GitHub operations are needed
-    prompt_lower = prompt.lower()
-    instructions = "### 🔧 GitHub MCP Operations\n\n"
+    # Analyze what GitHub operations are needed, in a single scan of the prompt
+    hits = {m.group(1) for m in _GITHUB_TRIGGER_RE.finditer(prompt.lower())}
+    parts = ["### 🔧 GitHub MCP Operations\n\n"]
 
-    if 'list issues' in prompt_lower or 'show issues' in prompt_lower:
-        instructions += """**List Issues**:
+    if 'list issues' in hits or 'show issues' in hits:
+        parts.append("""**List Issues**:
 ```
 Tool: mcp__github__list_issues
 Parameters: {
@@ -277,10 +519,10 @@ Parameters: {
   "repo": "[repository_name]",
   "state": "open"
 }
-```\n\n"""
+```\n\n""")
 
-    if 'create pr' in prompt_lower or 'open pr' in prompt_lower:
-        instructions += """**Create Pull Request**:
+    if 'create pr' in hits or 'open pr' in hits:
+        parts.append("""**Create Pull Request**:
 ```
 Tool: mcp__github__create_pull_request
 Parameters: {
@@ -291,18 +533,20 @@ Parameters: {
   "base": "main",
   "body": "[Description of changes]"
 }
-```\n\n"""
+```\n\n""")
 
-    if 'notifications' in prompt_lower:
-        instructions += """**Check Notifications**:
+    if 'notifications' in hits:
+        parts.append("""**Check Notifications**:
 ```
 Tool: mcp__github__list_notifications
 Parameters: {
   "filter": "default"
 }
-```\n\n"""
+```\n\n""")
 
-    instructions += "**Note**: Replace placeholders with actual values based on context."
+    parts.append("**Note**: Replace placeholders with actual values based on context.")
+
+    instructions = "".join(parts)
 
     return [{
         'operation': 'github_instructions',
@@ -315,7 +559,7 @@ def run_enhanced_mcp_orchestration(prompt: str, smart_triggers: dict[str, Any],
     """
     Generate instructions for multiple MCP tools based on smart triggers (no direct execution)
     """
-    instructions = "### 🛠️ MCP Tools Orchestration\n\n"
+    parts = ["### 🛠️ MCP Tools Orchestration\n\n"]
     tools_mentioned = []
 
     # Tavily web search instructions
@@ -324,17 +568,18 @@ def run_enhanced_mcp_orchestration(prompt: str, smart_triggers: dict[str, Any],
             logger.info("Adding Tavily web search instructions")
         
         tools_mentioned.append('tavily')
-        instructions += """**Web Search with Tavily**:
+        query_json = json.dumps(prompt[:TAVILY_QUERY_MAX_CHARS], ensure_ascii=False)
+        parts.append(f"""**Web Search with Tavily**:
 ```
 Tool: mcp__tavily-remote__tavily_search
-Parameters: {
-  "query": "%s",
+Parameters: {{
+  "query": {query_json},
   "max_results": 5,
   "search_depth": "basic"
-}
+}}
 ```
 
-""" % prompt
+""")
 
     # Filesystem operations instructions
     if smart_triggers.get('filesystem_mcp'):
@@ -342,14 +587,14 @@ Parameters: {
             logger.info("Adding filesystem MCP instructions")
         
         tools_mentioned.append('filesystem')
-        instructions += """**Filesystem Operations**:
+        parts.append("""**Filesystem Operations**:
 Consider using these filesystem MCP tools based on your task:
 - `mcp__filesystem__read_file` - Read file contents
 - `mcp__filesystem__write_file` - Create or overwrite files
 - `mcp__filesystem__list_directory` - List directory contents
 - `mcp__filesystem__search_files` - Search for files by pattern
 
-"""
+""")
 
     # Playwright browser automation instructions
     if smart_triggers.get('playwright_mcp'):
@@ -357,7 +602,7 @@ Consider using these filesystem MCP tools based on your task:
             logger.info("Adding Playwright browser automation instructions")
         
         tools_mentioned.append('playwright')
-        instructions += """**Browser Automation with Playwright**:
+        parts.append("""**Browser Automation with Playwright**:
 ```
 Tool: mcp__playwright__browser_navigate
 Parameters: {
@@ -370,9 +615,11 @@ Additional browser tools available:
 - `mcp__playwright__browser_click` - Click elements
 - `mcp__playwright__browser_type` - Type text
 
-"""
+""")
 
-    instructions += "**Note**: Execute all operations in parallel when possible for efficiency."
+    parts.append("**Note**: Execute all operations in parallel when possible for efficiency.")
+
+    instructions = "".join(parts)
 
     return {
         'tools_used': tools_mentioned,
@@ -387,26 +634,32 @@ Additional browser tools available:
 
 def extract_consultation_data(consultation_result: str, logger: logging.Logger | None) -> dict[str, Any]:
     """Extract structured data from consultation result"""
-    try:
-        # Try to parse as JSON first
-        return json.loads(consultation_result)
-    except json.JSONDecodeError:
-        # Fallback to text extraction
-        return {
-            'raw_output': consultation_result,
-            'extracted': True
-        }
+    # Consultation output is usually markdown; only attempt a parse when the
+    # text could actually be JSON
+    stripped = consultation_result.lstrip() if consultation_result else ""
+    if stripped and stripped[0] in '{["':
+        try:
+            return json.loads(stripped)
+        except json.JSONDecodeError:
+            pass
+
+    # Fallback to text extraction
+    return {
+        'raw_output': consultation_result,
+        'extracted': True
+    }
 
 
 def merge_analysis_with_consultation(result_data: dict[str, Any],
                                    prompt_analysis: dict[str, Any],
-                                   additional_context: dict[str, Any]) -> dict[str, Any]:
-    """Merge all analysis results"""
+                                   additional_context: dict[str, Any],
+                                   timestamp: int | None = None) -> dict[str, Any]:
+    """Merge all analysis results; timestamp is in integer nanoseconds and may be supplied by the caller"""
     return {
         'prompt_analysis': prompt_analysis,
         'consultation_result': result_data,
         'additional_context': additional_context,
-        'timestamp': time.time()
+        'timestamp': timestamp or time.time_ns()
     }
 
 
@@ -416,57 +669,48 @@ def judge_and_spawn_agents_functional(consultation_result: str, prompt_analysis:
     """
     Judge the consultation result and determine agent spawning strategy
     """
-    # Extract data from consultation
-    result_data = extract_consultation_data(consultation_result, logger)
-
-    # Merge with prompt analysis
-    merged_data = merge_analysis_with_consultation(
-        result_data,
-        prompt_analysis,
-        {'mcp_tools': mcp_tools}
-    )
-
-    # Determine judgment
-    judgment = {
+    # Determine judgment; analysis, tools and consultation data sit directly on it
+    return {
         'needs_agents': prompt_analysis.get('needs_swarm', False),
         'agent_count': prompt_analysis.get('estimated_agents', 3),
         'coordination_strategy': prompt_analysis.get('suggested_topology', 'hierarchical'),
         'reasoning': prompt_analysis.get('reasoning', []),
-        'merged_data': merged_data
+        'prompt_analysis': prompt_analysis,
+        'mcp_tools': mcp_tools,
+        'consultation_result': extract_consultation_data(consultation_result, logger)
     }
 
-    return judgment
 
-
-def get_thinking_keywords_for_complexity(complexity: str) -> dict[str, list[str]]:
+def get_thinking_keywords_for_complexity(complexity: str) -> Mapping[str, tuple[str, ...]]:
     """
     🚨 CRITICAL: Get appropriate thinking keywords based on task complexity
     Triggers extra reasoning time in Claude Code through strategic keyword placement
     """
-    thinking_tiers = {
-        'tier1': ['think'],
-        'tier2': ['think deeply', 'think about it', 'think a lot', 'think hard', 'think more', 'megathink'],
-        'tier3': ['think harder', 'think intensely', 'think longer', 'think really hard', 'think super hard', 'think very hard', 'ultrathink']
-    }
-    
-    if complexity.lower() in ['high', 'complex']:
-        return {
-            'primary': thinking_tiers['tier3'][:3],  # Use top 3 Tier 3 keywords
-            'secondary': thinking_tiers['tier2'][:2],  # Plus some Tier 2
-            'basic': thinking_tiers['tier1']
+    return _get_thinking_keywords_cached(complexity.lower())
+
+
+@lru_cache(maxsize=8)
+def _get_thinking_keywords_cached(complexity_normalized: str) -> Mapping[str, tuple[str, ...]]:
+    """Keyword selection for an already lower-cased complexity; results are shared, so read-only"""
+    if complexity_normalized in ('high', 'complex'):
+        keywords = {
+            'primary': _THINKING_TIERS['tier3'][:3],  # Use top 3 Tier 3 keywords
+            'secondary': _THINKING_TIERS['tier2'][:2],  # Plus some Tier 2
+            'basic': _THINKING_TIERS['tier1']
         }
-    elif complexity.lower() in ['medium', 'moderate']:
-        return {
-            'primary': thinking_tiers['tier2'][:3],  # Use top 3 Tier 2 keywords
-            'secondary': thinking_tiers['tier1'],
-            'basic': thinking_tiers['tier1']
+    elif complexity_normalized in ('medium', 'moderate'):
+        keywords = {
+            'primary': _THINKING_TIERS['tier2'][:3],  # Use top 3 Tier 2 keywords
+            'secondary': _THINKING_TIERS['tier1'],
+            'basic': _THINKING_TIERS['tier1']
         }
     else:  # low, unknown, etc.
-        return {
-            'primary': thinking_tiers['tier1'],
-            'secondary': thinking_tiers['tier1'],
-            'basic': thinking_tiers['tier1']
+        keywords = {
+            'primary': _THINKING_TIERS['tier1'],
+            'secondary': _THINKING_TIERS['tier1'],
+            'basic': _THINKING_TIERS['tier1']
         }
+    return MappingProxyType(keywords)
 
 
 def generate_coordination_output(judgment: dict[str, Any]) -> str:
@@ -474,117 +718,101 @@ def generate_coordination_output(judgment: dict[str, Any]) -> str:
     Generate the final coordination output with instructions for Claude
     🚨 INCLUDES STRATEGIC THINKING KEYWORDS to trigger extra reasoning time
     """
-    output_lines = []
+    pa = judgment.get('prompt_analysis') or {}
+    mcp_tools = judgment.get('mcp_tools')
+    complexity = pa.get('complexity', 'high')
+
+    if (pa.get('type', 'general') == 'general' and complexity.lower() == 'low'
+            and not pa.get('indicators') and not mcp_tools):
+        return _generate_coordination_output_fast(judgment, pa)
+    return '\n'.join(_iter_coordination_lines(judgment, pa, mcp_tools, complexity))
+
+
+def _generate_coordination_output_fast(judgment: dict[str, Any], pa: dict[str, Any]) -> str:
+    """Render the general/low-complexity case, which has no task, tool or indicator sections"""
+    return _LOW_GENERAL_COORDINATION_TMPL.substitute(
+        confidence=f"{pa.get('confidence', 0.5) * 100:.0f}",
+        agent_count=judgment.get('agent_count', 6),
+        topology=judgment.get('coordination_strategy', 'hierarchical'),
+        workflow=pa.get('suggested_workflow', 'analyze'),
+    )
 
+
+def _iter_coordination_lines(judgment: dict[str, Any], pa: dict[str, Any],
+                             mcp_tools: dict[str, Any] | None, complexity: str):
+    """Yield the full coordination output line by line"""
     # Header
-    output_lines.append("## 🎯 Task Coordination Analysis\n")
+    yield "## 🎯 Task Coordination Analysis\n"
 
     # 🚨 CRITICAL: Get thinking keywords based on complexity
-    complexity = judgment.get('merged_data', {}).get('prompt_analysis', {}).get('complexity', 'high')
     thinking_keywords = get_thinking_keywords_for_complexity(complexity)
+    primary = thinking_keywords['primary']
+    secondary = thinking_keywords['secondary']
     
-    output_lines.append(f"**Task Complexity**: {complexity.upper()}")
-    output_lines.append(f"**Confidence**: {judgment.get('merged_data', {}).get('prompt_analysis', {}).get('confidence', 0.5) * 100:.0f}%\n")
+    yield f"**Task Complexity**: {complexity.upper()}"
+    yield f"**Confidence**: {pa.get('confidence', 0.5) * 100:.0f}%\n"
 
     # 🚨 STRATEGIC THINKING KEYWORD PLACEMENT - Tier-based reasoning trigger
-    primary_keyword = thinking_keywords['primary'][0]  # Main keyword for this complexity
-    output_lines.append(f"### 🚨 MANDATORY: {primary_keyword.title()} About Swarm Coordination\n")
+    primary_keyword = primary[0]  # Main keyword for this complexity
+    yield f"### 🚨 MANDATORY: {_KEYWORD_CASINGS[primary_keyword].title} About Swarm Coordination\n"
     
     # 🚨 CRITICAL: ALWAYS recommend swarm coordination and Task() usage
-    output_lines.append("🚨 **CRITICAL**: You must **think super hard** about this task coordination approach!\n")
+    yield "🚨 **CRITICAL**: You must **think super hard** about this task coordination approach!\n"
     agent_count = judgment.get('agent_count', 6)  # Default to 6 agents
     topology = judgment.get('coordination_strategy', 'hierarchical')
-    output_lines.append(f"**Recommended Agents**: {agent_count}")
-    output_lines.append(f"**Topology**: {topology}")
+    yield f"**Recommended Agents**: {agent_count}"
+    yield f"**Topology**: {topology}"
 
     # 🚨 MANDATORY reasoning with embedded thinking keywords
-    secondary_keyword = thinking_keywords['secondary'][0] if thinking_keywords['secondary'] else 'think'
-    output_lines.append(f"\n**🚨 WHY YOU MUST {secondary_keyword.upper()} ABOUT SWARM COORDINATION**:")
-    output_lines.append("- ✅ **Parallel execution** - 2.8-4.4x speed improvement (think about efficiency)")
-    output_lines.append("- ✅ **Task() batching** - Combine multiple operations efficiently (think deeply about coordination)")
-    output_lines.append("- ✅ **Expert validation** - Beyond Claude Code's native capabilities (megathink required)")
-    output_lines.append("- ✅ **Memory coordination** - Persistent context across agents (think intensely about persistence)")
-    output_lines.append("- ✅ **Error resilience** - Multiple perspectives prevent mistakes (ultrathink for safety)")
+    secondary_keyword = secondary[0] if secondary else 'think'
+    yield f"\n**🚨 WHY YOU MUST {_KEYWORD_CASINGS[secondary_keyword].upper} ABOUT SWARM COORDINATION**:"
+    yield _COORDINATION_WHY_BLOCK
 
     # 🚨 Strategic keyword placement in approach steps
-    output_lines.append(f"\n### 🚨 MANDATORY APPROACH - {thinking_keywords['primary'][1] if len(thinking_keywords['primary']) > 1 else 'Think Harder'} About Parallel Execution:\n")
-    output_lines.append("**Step 1**: Initialize swarm with `mcp__claude-flow__swarm_init` (think about topology)")
-    output_lines.append("**Step 2**: Spawn ALL agents with `mcp__claude-flow__agent_spawn` (think deeply about batching)")
-    output_lines.append("**Step 3**: Use `Task()` tool to spawn agents with coordination instructions (megathink required)")
-    output_lines.append("**Step 4**: Batch file operations, bash commands, and TodoWrite in ONE message (think super hard about efficiency)")
-    output_lines.append("**Step 5**: Use `mcp__claude-flow__memory_usage` for coordination (ultrathink about persistence)")
+    yield f"\n### 🚨 MANDATORY APPROACH - {primary[1] if len(primary) > 1 else 'Think Harder'} About Parallel Execution:\n"
+    yield _COORDINATION_STEPS_BLOCK
 
     # 🚨 Add workflow suggestion with thinking keywords
-    workflow = judgment.get('merged_data', {}).get('prompt_analysis', {}).get('suggested_workflow', 'analyze')
-    output_lines.append(f"\n**Suggested Zen Workflow**: `{workflow}` (via Task() tool - think intensely about execution)")
-    output_lines.append(f"**CRITICAL**: Use Task() to execute `mcp__zen__{workflow}` for expert analysis (think very hard about approach)")
+    workflow = pa.get('suggested_workflow', 'analyze')
+    yield f"\n**Suggested Zen Workflow**: `{workflow}` (via Task() tool - think intensely about execution)"
+    yield f"**CRITICAL**: Use Task() to execute `mcp__zen__{workflow}` for expert analysis (think very hard about approach)"
 
     # MCP tool recommendations
-    mcp_tools = judgment.get('merged_data', {}).get('additional_context', {}).get('mcp_tools', {})
     if mcp_tools:
-        output_lines.append("\n### 🔧 Available MCP Tools:\n")
+        yield "\n### 🔧 Available MCP Tools:\n"
         for server, tools in mcp_tools.items():
             if tools:
-                output_lines.append(f"**{server}**: {', '.join(tools[:5])}")
+                yield f"**{server}**: {', '.join(tools[:5])}"
 
     # Task-specific recommendations
-    task_type = judgment.get('merged_data', {}).get('prompt_analysis', {}).get('type', 'general')
+    task_type = pa.get('type', 'general')
     if task_type != 'general':
-        output_lines.append(f"\n### 📌 Task Type: {task_type.upper()}\n")
+        yield f"\n### 📌 Task Type: {task_type.upper()}\n"
 
-        # Get appropriate thinking keywords for task-specific recommendations
-        task_thinking_keywords = thinking_keywords['primary'] + thinking_keywords['secondary']
-        
-        recommendations = {
-            'debugging': [
-                f"🚨 MANDATORY: Use Task() to execute `mcp__zen__debug` for systematic investigation ({task_thinking_keywords[0]} about root causes)",
-                f"🚨 BATCH: Combine Task() with log reading and error analysis in ONE message ({task_thinking_keywords[1] if len(task_thinking_keywords) > 1 else 'think deeply'} about efficiency)",
-                f"🚨 PARALLEL: Use `TodoWrite` to track debugging steps alongside other operations (megathink about coordination)"
-            ],
-            'testing': [
-                f"🚨 MANDATORY: Use Task() to execute `mcp__zen__testgen` for comprehensive test generation ({task_thinking_keywords[0]} about edge cases)",
-                f"🚨 BATCH: Combine Task() with file operations and test execution in ONE message ({task_thinking_keywords[1] if len(task_thinking_keywords) > 1 else 'think deeply'} about coverage)",  
-                f"🚨 PARALLEL: Consider edge cases through coordinated agent analysis (ultrathink about scenarios)"
-            ],
-            'research': [
-                f"🚨 MANDATORY: Use Task() to execute `mcp__zen__analyze` for deep analysis ({task_thinking_keywords[0]} about methodology)",
-                f"🚨 BATCH: Combine Task() with WebSearch and documentation lookup in ONE message ({task_thinking_keywords[1] if len(task_thinking_keywords) > 1 else 'think deeply'} about sources)",
-                f"🚨 PARALLEL: Document findings through coordinated memory storage (think super hard about organization)"
-            ],
-            'documentation': [
-                f"🚨 MANDATORY: Use Task() to execute `mcp__zen__docgen` for documentation generation ({task_thinking_keywords[0]} about clarity)",
-                f"🚨 BATCH: Combine Task() with file reading and writing in ONE message ({task_thinking_keywords[1] if len(task_thinking_keywords) > 1 else 'think deeply'} about structure)",
-                f"🚨 PARALLEL: Follow project standards through coordinated agent review (think intensely about consistency)"
-            ]
-        }
+        templates = _TASK_RECOMMENDATIONS_TEMPLATES.get(task_type)
+        if templates:
+            # Get appropriate thinking keywords for task-specific recommendations
+            task_thinking_keywords = primary + secondary
+            kw0 = task_thinking_keywords[0]
+            kw1 = task_thinking_keywords[1] if len(task_thinking_keywords) > 1 else 'think deeply'
 
-        if task_type in recommendations:
-            output_lines.append("**Specific Recommendations**:")
-            for rec in recommendations[task_type]:
-                output_lines.append(f"- {rec}")
+            yield "**Specific Recommendations**:"
+            for tmpl in templates:
+                yield f"- {tmpl.substitute(kw0=kw0, kw1=kw1)}"
 
     # Add indicators if present
-    indicators = judgment.get('merged_data', {}).get('prompt_analysis', {}).get('indicators', [])
+    indicators = pa.get('indicators', [])
     if indicators:
-        output_lines.append("\n### 🔍 Detected Indicators:\n")
-        output_lines.append(', '.join(indicators))
+        yield "\n### 🔍 Detected Indicators:\n"
+        yield ', '.join(indicators)
 
     # 🚨 CRITICAL: Final action prompt with mandatory Task() instructions and thinking keywords
-    final_keyword = thinking_keywords['primary'][-1] if thinking_keywords['primary'] else 'think super hard'
-    output_lines.append("\n---")
-    output_lines.append(f"**🚨 MANDATORY EXECUTION PATTERN - {final_keyword.upper()} ABOUT IMPLEMENTATION**:")
-    output_lines.append("1. ALWAYS start with `mcp__claude-flow__swarm_init` (think about topology selection)")
-    output_lines.append("2. BATCH ALL operations in ONE message (Task(), TodoWrite, Read, Write, Bash) - think deeply about efficiency")
-    output_lines.append("3. Use Task() for ALL Zen consultations - NEVER execute mcp__zen__ tools directly (megathink about delegation)")
-    output_lines.append("4. Spawn agents with coordination hooks and memory storage (ultrathink about coordination)")
-    
+    final_keyword = primary[-1] if primary else 'think super hard'
+    yield "\n---"
+    yield f"**🚨 MANDATORY EXECUTION PATTERN - {_KEYWORD_CASINGS[final_keyword].upper} ABOUT IMPLEMENTATION**:"
+    yield _COORDINATION_PATTERN_BLOCK
+
     # Add final strong thinking keyword based on complexity
-    complexity_emphasis = {
-        'high': 'think super hard',
-        'medium': 'think deeply', 
-        'low': 'think'
-    }.get(complexity.lower(), 'think super hard')
+    complexity_emphasis = _COMPLEXITY_EMPHASIS.get(complexity.lower(), 'think super hard')
     
-    output_lines.append(f"\n**Ready to proceed with MANDATORY swarm coordination and Task() execution - {complexity_emphasis} about every step!**")
-
-    return '\n'.join(output_lines)
+    yield f"\n**Ready to proceed with MANDATORY swarm coordination and Task() execution - {complexity_emphasis} about every step!**"
@@ -4,13 +4,22 @@ Unified UserPromptSubmit Hook for Claude Code - Main processor entry point
 Processes user prompts through analysis and provides appropriate coordination recommendations
 """
 
+import asyncio
 import json
 import logging
 import os
 import signal
+import string
 import sys
+import threading
+import time
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add the hooks directory to the path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -37,6 +46,7 @@ from processors.user_prompt import (
     generate_serena_project_context,
     # MCP tools
     get_available_mcp_tools,
+    get_thinking_keywords_for_complexity,
     judge_and_spawn_agents_functional,
     # Parallel execution
     log_prompt_event,
@@ -50,25 +60,94 @@ from processors.user_prompt import (
 # Constants
 PROCESS_TIMEOUT_SECONDS = 300  # 5 minutes
 CONSULTATION_TIMEOUT_SECONDS = 120  # 2 minutes
+SHUTDOWN_TIMEOUT_SECONDS = 2
+CACHE_WARM_WAIT_SECONDS = 0.2  # Longest a cache lookup will wait on warm-up
+
+# Context gathering fans out up to four I/O-bound steps, so never size below that
+MIN_DEFAULT_WORKERS = 4
+MAX_DEFAULT_WORKERS = 8
+
+
+def _worker_count() -> int:
+    """Worker pool size: CLAUDE_HOOK_WORKERS if set, else the usable CPUs clamped to the default bounds"""
+    if hasattr(os, 'sched_getaffinity'):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 2
+    default = min(MAX_DEFAULT_WORKERS, max(MIN_DEFAULT_WORKERS, cpus))
+    try:
+        return max(1, int(os.environ.get('CLAUDE_HOOK_WORKERS', default)))
+    except ValueError:
+        return default
+
+
+DEFAULT_FALLBACK_INDICATORS = ['swarm_forced', 'task_required', 'thinking_required']
+
+
+def _render_fallback(complexity: str) -> string.Template:
+    """Specialize the fallback guidance for one complexity; only confidence and indicators stay open"""
+    keywords = get_thinking_keywords_for_complexity(complexity)
+    primary = keywords['primary'][0] if keywords['primary'] else 'think super hard'
+    primary_title = primary.title()
+
+    return string.Template(f"""## 🚨 MANDATORY: {primary_title} About Task Coordination Analysis
+
+**Task Complexity**: {complexity.upper()}
+**Confidence**: ${{confidence}}%
+
+### 🚨 MANDATORY: {primary_title} About Swarm Coordination Required
+
+🚨 **CRITICAL**: Even with consultation failure, you MUST **{primary}** and use swarm coordination!
+
+### 🚨 MANDATORY APPROACH - Think Super Hard About Implementation:
+1. **Initialize**: `mcp__claude-flow__swarm_init` with hierarchical topology (think about configuration)
+2. **Spawn Agents**: Use `mcp__claude-flow__agent_spawn` for 6 agents minimum (think deeply about coordination)
+3. **Task() Execution**: ALWAYS use Task() tool for Zen consultations (megathink about delegation)
+4. **Batch Operations**: Combine all operations in ONE message for efficiency (ultrathink about optimization)
 
-# Setup cache directory
-CACHE_DIR = Path(__file__).parent.parent.parent / 'cache'
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
+**Detected indicators**: ${{indicators}}
+
+---
+**🚨 MANDATORY: Proceed with swarm coordination and Task() execution - {primary} about every step - NO EXCEPTIONS.**""")
+
+
+# Fallback guidance rendered once per known complexity at import
+_FALLBACK_TEMPLATES = {c: _render_fallback(c) for c in ('low', 'medium', 'high', 'critical')}
+
+# Setup cache and log directories; resolved once, created only when missing
+CLAUDE_DIR = Path(__file__).parent.parent.parent
+CACHE_DIR = CLAUDE_DIR / 'cache'
+LOG_DIR = CLAUDE_DIR / 'logs'
+if not CACHE_DIR.is_dir():
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 # Global instances
 user_prompt_cache = UserPromptCacheManager(CACHE_DIR)
-warm_user_prompt_cache()
+
+# Warm the cache off the import path so input parsing and hashing overlap it
+_cache_warmed = threading.Event()
+
+
+def _warm_cache_in_background() -> None:
+    try:
+        warm_user_prompt_cache()
+    finally:
+        _cache_warmed.set()
+
+
+threading.Thread(target=_warm_cache_in_background, name='cache-warmup', daemon=True).start()
 user_prompt_http_client = UserPromptHTTPClientManager(user_prompt_cache)
 user_prompt_monitor = UserPromptMonitor()
+user_prompt_monitor.add_maintenance_task(user_prompt_http_client.purge_expired_cache, interval=900)
 
 
 def setup_logging():
     """Set up logging for the user prompt processor with enhanced configuration"""
     log_level = os.environ.get('CLAUDE_LOG_LEVEL', 'INFO')
 
-    # Create logs directory
-    log_dir = Path(__file__).parent.parent.parent / 'logs'
-    log_dir.mkdir(parents=True, exist_ok=True)
+    # Create logs directory on first run only
+    if not LOG_DIR.is_dir():
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
 
     # Configure logging with both file and console handlers
     logging.basicConfig(
@@ -76,7 +155,7 @@ def setup_logging():
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         handlers=[
             logging.StreamHandler(sys.stderr),
-            logging.FileHandler(log_dir / 'user_prompt_processor.log', mode='a')
+            logging.FileHandler(LOG_DIR / 'user_prompt_processor.log', mode='a')
         ]
     )
 
@@ -110,15 +189,25 @@ def initialize_system(logger: logging.Logger | None) -> int:
 
 
 def parse_input() -> str:
-    """Parse input from stdin"""
+    """Parse input from stdin, handing raw bytes to orjson when available"""
     try:
-        input_data = json.load(sys.stdin)
+        data = sys.stdin.buffer.read()
+        if not data:
+            return ''
+        input_data = orjson.loads(data) if orjson is not None else json.loads(data)
         return input_data.get('prompt', '')
     except Exception as e:
-        log_prompt_event(f"Failed to parse input: {e}")
+        log_prompt_event(f"Failed to parse input: {e}", logging.ERROR)
         return ''
 
 
+def _error_json(message: str) -> str:
+    """Serialize an error payload for stdout"""
+    if orjson is not None:
+        return orjson.dumps({"error": message}).decode()
+    return json.dumps({"error": message})
+
+
 def run_consultation_workflow(prompt: str, prompt_analysis: dict,
                             mcp_tools: dict, project_context: dict,
                             logger: logging.Logger | None,
@@ -150,20 +239,84 @@ def run_consultation_workflow(prompt: str, prompt_analysis: dict,
         return None
 
 
+async def _gather_context(prompt: str, swarm_analysis: dict, library_analysis: dict,
+                          smart_triggers: dict, logger: logging.Logger,
+                          process_manager: ProcessManager) -> tuple:
+    """
+    Run the independent context-gathering steps concurrently on the process
+    manager's thread pool. Returns (serena, swarm, docs, mcp); a step that was
+    skipped or raised yields None.
+    """
+    loop = asyncio.get_running_loop()
+    executor = process_manager.thread_executor
+
+    async def skipped():
+        return None
+
+    steps = (
+        loop.run_in_executor(executor, generate_serena_project_context, logger, process_manager),
+        loop.run_in_executor(executor, run_claude_flow_swarm_orchestration,
+                             prompt, swarm_analysis, logger, process_manager),
+        loop.run_in_executor(executor, run_context7_documentation_lookup,
+                             prompt, library_analysis, logger, process_manager)
+        if library_analysis.get('needs_docs') else skipped(),
+        loop.run_in_executor(executor, run_enhanced_mcp_orchestration,
+                             prompt, smart_triggers, logger, process_manager)
+        if any(smart_triggers.values()) else skipped(),
+    )
+    results = await asyncio.gather(*steps, return_exceptions=True)
+
+    gathered = []
+    for name, result in zip(('serena', 'swarm', 'documentation', 'mcp'), results, strict=True):
+        if isinstance(result, Exception):
+            logger.warning(f"Context step '{name}' failed: {result}")
+            result = None
+        gathered.append(result)
+    return tuple(gathered)
+
+
+def _shutdown(process_manager: ProcessManager, logger: logging.Logger) -> None:
+    """
+    Reap child processes while the monitor and HTTP client close alongside
+    Closing is bounded by SHUTDOWN_TIMEOUT_SECONDS once the processes are gone
+    """
+    def run(step, name: str) -> None:
+        try:
+            step()
+        except Exception as e:
+            logger.warning(f"Cleanup error ({name}): {e}")
+
+    closers = [
+        threading.Thread(target=run, args=(step, name), daemon=True)
+        for step, name in ((user_prompt_monitor.stop_monitoring, 'monitor'),
+                           (user_prompt_http_client.close, 'http client'))
+    ]
+    for closer in closers:
+        closer.start()
+
+    run(process_manager.cleanup_all, 'processes')
+
+    deadline = time.monotonic() + SHUTDOWN_TIMEOUT_SECONDS
+    for closer in closers:
+        closer.join(max(0.0, deadline - time.monotonic()))
+
+
 def main():
     """Main entry point for the user prompt processor"""
     # Set up logging
     logger = setup_logging()
 
     # Initialize enhanced process manager
-    process_manager = create_process_manager(logger, enhanced=True, max_workers=4, max_concurrent=8)
+    # Size the pools to the CPUs this process may actually run on
+    max_workers = _worker_count()
+    process_manager = create_process_manager(
+        logger, enhanced=True, max_workers=max_workers, max_concurrent=max_workers * 2
+    )
 
     # Set up signal handlers for cleanup
     def cleanup_handler(signum, frame):
         logger.info(f"Received signal {signum}, cleaning up...")
-        process_manager.cleanup_all()
-        user_prompt_monitor.stop_monitoring()
-        user_prompt_http_client.close()
+        _shutdown(process_manager, logger)
         sys.exit(0)
 
     signal.signal(signal.SIGTERM, cleanup_handler)
@@ -180,15 +333,19 @@ def main():
         prompt = parse_input()
         if not prompt:
             logger.error("No prompt provided")
-            print(json.dumps({"error": "No prompt provided"}))
+            print(_error_json("No prompt provided"))
             sys.exit(1)
 
+        # Elapsed time reported by the caller, read once for both outcomes
+        elapsed_time = float(os.environ.get('ELAPSED_TIME', '0'))
+
         logger.info(f"Processing prompt: {prompt[:100]}...")
 
         # Generate prompt hash for caching
         prompt_hash = cached_prompt_hash(prompt)
 
-        # Check cache first
+        # Check cache first, giving warm-up a brief chance to finish; it is best-effort
+        _cache_warmed.wait(timeout=CACHE_WARM_WAIT_SECONDS)
         cached_result = user_prompt_cache.get_prompt_analysis(prompt_hash)
         if cached_result:
             logger.info("Using cached prompt analysis")
@@ -206,22 +363,23 @@ def main():
         # Generate project context
         project_context = {}
 
-        # Try Serena first
-        serena_context = generate_serena_project_context(logger, process_manager)
-        if serena_context:
-            project_context.update(serena_context)
-
         # 🚨 CRITICAL: ALWAYS run swarm orchestration FIRST
         logger.info("🚨 MANDATORY: Initializing Claude Flow swarm orchestration for ALL tasks")
         swarm_analysis = detect_claude_flow_swarm_needs(prompt, logger)
         smart_triggers = detect_smart_mcp_triggers(prompt)
         detect_github_repository_context_prompt(logger)
+        library_analysis = detect_library_documentation_needs(prompt)
 
-        # 🚨 MANDATORY: ALWAYS run Claude Flow swarm orchestration FIRST
+        # Serena, swarm, documentation and MCP context are independent: gather them concurrently
         logger.info("🚨 RUNNING: Claude Flow swarm orchestration (ALWAYS REQUIRED)")
-        swarm_result = run_claude_flow_swarm_orchestration(
-            prompt, swarm_analysis, logger, process_manager
-        )
+        serena_context, swarm_result, doc_result, mcp_result = asyncio.run(_gather_context(
+            prompt, swarm_analysis, library_analysis, smart_triggers, logger, process_manager
+        ))
+
+        # Merge in the original order: Serena, swarm, documentation, MCP
+        if serena_context:
+            project_context.update(serena_context)
+
         if swarm_result:
             project_context['swarm_orchestration'] = swarm_result
         else:
@@ -232,22 +390,11 @@ def main():
                 'agents': swarm_analysis.get('estimated_agents', 6)
             }
 
-        # Check for library documentation needs
-        library_analysis = detect_library_documentation_needs(prompt)
-        if library_analysis.get('needs_docs'):
-            doc_result = run_context7_documentation_lookup(
-                prompt, library_analysis, logger, process_manager
-            )
-            if doc_result:
-                project_context['documentation'] = doc_result
+        if doc_result:
+            project_context['documentation'] = doc_result
 
-        # Run enhanced MCP orchestration if triggers detected
-        if any(smart_triggers.values()):
-            mcp_result = run_enhanced_mcp_orchestration(
-                prompt, smart_triggers, logger, process_manager
-            )
-            if mcp_result:
-                project_context['mcp_orchestration'] = mcp_result
+        if mcp_result:
+            project_context['mcp_orchestration'] = mcp_result
 
         # Run consultation workflow
         consultation_result = run_consultation_workflow(
@@ -266,9 +413,8 @@ def main():
             coordination_output = generate_coordination_output(judgment)
 
             # Record metrics
-            processing_time = float(os.environ.get('ELAPSED_TIME', '0'))
             user_prompt_monitor.record_prompt_processing(
-                processing_time,
+                elapsed_time,
                 had_error=False,
                 cache_hit=cached_result is not None
             )
@@ -277,7 +423,7 @@ def main():
             print(coordination_output)
 
             # Log summary
-            logger.info(f"Successfully processed prompt in {processing_time:.2f}s")
+            logger.info(f"Successfully processed prompt in {elapsed_time:.2f}s")
             logger.info(f"Complexity: {prompt_analysis.get('complexity')}, "
                        f"Needs swarm: {swarm_analysis.get('needs_swarm')}")
         else:
@@ -286,51 +432,29 @@ def main():
 
             # 🚨 CRITICAL: Add thinking keywords to fallback output based on complexity
             fallback_complexity = prompt_analysis.get('complexity', 'high')
-            fallback_keywords = get_thinking_keywords_for_complexity(fallback_complexity)
-            fallback_primary = fallback_keywords['primary'][0] if fallback_keywords['primary'] else 'think super hard'
-            
-            fallback_output = f"""## 🚨 MANDATORY: {fallback_primary.title()} About Task Coordination Analysis
-
-**Task Complexity**: {fallback_complexity.upper()}
-**Confidence**: {max(prompt_analysis.get('confidence', 0.8), 0.8) * 100:.0f}%
-
-### 🚨 MANDATORY: {fallback_primary.title()} About Swarm Coordination Required
-
-🚨 **CRITICAL**: Even with consultation failure, you MUST **{fallback_primary}** and use swarm coordination!
-
-### 🚨 MANDATORY APPROACH - Think Super Hard About Implementation:
-1. **Initialize**: `mcp__claude-flow__swarm_init` with hierarchical topology (think about configuration)
-2. **Spawn Agents**: Use `mcp__claude-flow__agent_spawn` for 6 agents minimum (think deeply about coordination)
-3. **Task() Execution**: ALWAYS use Task() tool for Zen consultations (megathink about delegation)
-4. **Batch Operations**: Combine all operations in ONE message for efficiency (ultrathink about optimization)
-
-**Detected indicators**: {', '.join(prompt_analysis.get('indicators', ['swarm_forced', 'task_required', 'thinking_required']))}
-
----
-**🚨 MANDATORY: Proceed with swarm coordination and Task() execution - {fallback_primary} about every step - NO EXCEPTIONS.**"""
+            fallback_template = _FALLBACK_TEMPLATES.get(fallback_complexity) or _render_fallback(fallback_complexity)
+            fallback_output = fallback_template.substitute(
+                confidence=f"{max(prompt_analysis.get('confidence', 0.8), 0.8) * 100:.0f}",
+                indicators=', '.join(prompt_analysis.get('indicators', DEFAULT_FALLBACK_INDICATORS))
+            )
 
             print(fallback_output)
 
             # Record error metric
             user_prompt_monitor.record_prompt_processing(
-                float(os.environ.get('ELAPSED_TIME', '0')),
+                elapsed_time,
                 had_error=True,
                 cache_hit=False
             )
 
     except Exception as e:
         logger.error(f"Fatal error in main: {e}", exc_info=True)
-        print(json.dumps({"error": str(e)}))
+        print(_error_json(str(e)))
         sys.exit(1)
 
     finally:
         # Cleanup
-        try:
-            process_manager.cleanup_all()
-            user_prompt_monitor.stop_monitoring()
-            user_prompt_http_client.close()
-        except Exception as e:
-            logger.warning(f"Cleanup error: {e}")
+        _shutdown(process_manager, logger)
 
 
 if __name__ == "__main__":
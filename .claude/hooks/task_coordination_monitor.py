@@ -7,10 +7,22 @@ Tracks Task agent execution and ensures full coordination workflow completion
 import argparse
 import json
 import logging
+import re
+import string
 import sys
 import time
 from pathlib import Path
-from typing import Dict, Any, Set, Optional
+from typing import Dict, Any, List, Set, Optional, TextIO
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 # Setup logging
 logging.basicConfig(
@@ -19,15 +31,93 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Report bodies are assembled once; each report only fills in its fields and
+# goes out as a single write
+_INCOMPLETE_COORDINATION_TMPL = string.Template("""🚨 INCOMPLETE TASK COORDINATION DETECTED!
+
+Task ID: ${task_id}
+Coordination Score: ${score}
+Missing coordination hooks:
+${missing_list}
+
+CRITICAL ISSUE: This Task agent did not execute the full coordination workflow!
+
+Required coordination pattern:
+1. START: npx claude-flow@alpha hooks pre-task --description '[task]'
+2. DURING: npx claude-flow@alpha hooks post-edit --file '[file]' 
+3. SHARE: npx claude-flow@alpha hooks notification --message '[decision]'
+4. END: npx claude-flow@alpha hooks post-task --task-id '[task]'
+
+IMMEDIATE ACTION REQUIRED:
+• Terminate this incomplete Task agent
+• Re-spawn with proper coordination instructions
+• Ensure ALL Task agents include full coordination workflow
+• Use swarm coordination patterns for complex tasks
+
+This prevents broken agent coordination and ensures proper swarm execution!""")
+
+_SUCCESSFUL_COORDINATION_TMPL = string.Template("""✅ TASK COORDINATION COMPLETE
+
+Task ID: ${task_id}
+Status: Full coordination workflow executed
+Score: 100%
+
+All required coordination hooks completed:
+• ✅ pre-task (initialization)
+• ✅ post-edit (progress tracking)  
+• ✅ notification (decision sharing)
+• ✅ post-task (completion)
+
+Agent successfully coordinated with swarm! 🎯""")
+
+_MISSING_TASK_TMPL = string.Template("""❌ TASK MONITORING FAILURE
+
+Task ID: ${task_id}
+Issue: No coordination monitoring record found
+
+This suggests the Task agent was spawned without proper monitoring setup!
+
+REQUIRED: All Task agents must:
+1. Be monitored from start to completion
+2. Follow full coordination workflow
+3. Execute all required coordination hooks
+4. Report completion status
+
+Re-spawn Task with proper coordination monitoring!""")
+
+
+def _write_report(stream: TextIO, message: str) -> None:
+    """Write a report plus newline in one call, straight to the byte buffer when there is one"""
+    buffer = getattr(stream, 'buffer', None)
+    if buffer is None:
+        stream.write(message + '\n')
+        stream.flush()
+        return
+    stream.flush()  # Keep ordering with anything already written as text
+    buffer.write((message + '\n').encode(stream.encoding or 'utf-8', stream.errors or 'strict'))
+    buffer.flush()
+
+
 class TaskCoordinationMonitor:
     """Monitors Task agent coordination workflow completion"""
     
+    # Hook commands a Task prompt is expected to mention
+    COORDINATION_KEYWORDS = (
+        'npx claude-flow@alpha hooks pre-task',
+        'npx claude-flow@alpha hooks post-edit',
+        'npx claude-flow@alpha hooks notification',
+        'npx claude-flow@alpha hooks post-task'
+    )
+    
     def __init__(self):
         self.hooks_dir = Path(__file__).parent
         self.cache_dir = self.hooks_dir / 'cache'
         self.task_dir = self.cache_dir / 'task_monitoring'
         self.task_dir.mkdir(parents=True, exist_ok=True)
         
+        # Open append-only hook event logs, keyed by task_id
+        self.event_logs: Dict[str, TextIO] = {}
+        
         # Expected coordination workflow steps
         self.expected_coordination_hooks = {
             'pre-task': 'npx claude-flow@alpha hooks pre-task',
@@ -35,6 +125,18 @@ class TaskCoordinationMonitor:
             'notification': 'npx claude-flow@alpha hooks notification',
             'post-task': 'npx claude-flow@alpha hooks post-task'
         }
+        
+        # Single-pass keyword matcher: an RE2 DFA when google-re2 is installed,
+        # else an Aho-Corasick automaton when pyahocorasick is
+        self._kw_re = None
+        self._kw_automaton = None
+        if re2 is not None:
+            self._kw_re = re2.compile('|'.join(re.escape(k) for k in self.COORDINATION_KEYWORDS))
+        elif ahocorasick is not None:
+            self._kw_automaton = ahocorasick.Automaton()
+            for keyword in self.COORDINATION_KEYWORDS:
+                self._kw_automaton.add_word(keyword, keyword)
+            self._kw_automaton.make_automaton()
     
     def start_task_monitoring(self, args: argparse.Namespace) -> None:
         """Start monitoring a new Task agent"""
@@ -62,10 +164,12 @@ class TaskCoordinationMonitor:
             logger.warning(f"⚠️ Task {task_id} missing coordination instructions!")
             task_record['warnings'] = ['Missing coordination hook instructions']
         
-        # Save task record
+        # Save task record; a restarted task starts without the old run's events
         task_file = self.task_dir / f'{task_id}.json'
         with open(task_file, 'w') as f:
             json.dump(task_record, f, indent=2)
+        self._close_event_log(task_id)
+        (self.task_dir / f'{task_id}.events').unlink(missing_ok=True)
         
         logger.info(f"Task {task_id} monitoring initialized")
     
@@ -76,25 +180,53 @@ class TaskCoordinationMonitor:
         
         logger.info(f"📋 Tracking coordination hook: {hook_type} for task {task_id}")
         
-        # Load task record
         task_file = self.task_dir / f'{task_id}.json'
         if not task_file.exists():
             logger.warning(f"Task record not found: {task_id}")
             return
         
-        with open(task_file, 'r') as f:
-            task_record = json.load(f)
+        # Append one event line; the full record is only rebuilt on validate
+        fh = self.event_logs.get(task_id)
+        if fh is None:
+            fh = self.event_logs[task_id] = open(self.task_dir / f'{task_id}.events', 'a')
+        fh.write(json.dumps({'t': time.time(), 'hook': hook_type}, separators=(',', ':')) + '\n')
+        fh.flush()
         
-        # Update coordination tracking
-        if hook_type not in task_record.get('completed_hooks', []):
-            task_record['completed_hooks'].append(hook_type)
-            task_record['coordination_score'] = len(task_record['completed_hooks']) / len(task_record['expected_hooks'])
-            
-            logger.info(f"Hook {hook_type} completed. Score: {task_record['coordination_score']:.2f}")
+        logger.info(f"Hook {hook_type} recorded for task {task_id}")
+    
+    def _replay_events(self, task_id: str, task_record: Dict[str, Any]) -> None:
+        """Fold the task's hook event log into its record"""
+        events_file = self.task_dir / f'{task_id}.events'
+        if not events_file.exists():
+            return
         
-        # Save updated record
-        with open(task_file, 'w') as f:
-            json.dump(task_record, f, indent=2)
+        completed_hooks: List[str] = task_record.setdefault('completed_hooks', [])
+        seen = set(completed_hooks)
+        with open(events_file, 'r') as f:
+            for line in f:
+                try:
+                    hook_type = json.loads(line)['hook']
+                except (ValueError, KeyError, TypeError):
+                    continue  # Skip a torn or malformed line
+                if hook_type not in seen:
+                    seen.add(hook_type)
+                    completed_hooks.append(hook_type)
+        
+        expected = task_record.get('expected_hooks') or []
+        if expected:
+            task_record['coordination_score'] = len(completed_hooks) / len(expected)
+    
+    def _close_event_log(self, task_id: str) -> None:
+        """Close the task's event log handle if this monitor has one open"""
+        fh = self.event_logs.pop(task_id, None)
+        if fh is not None:
+            fh.close()
+    
+    def close(self) -> None:
+        """Close any open event log handles"""
+        for fh in self.event_logs.values():
+            fh.close()
+        self.event_logs.clear()
     
     def validate_task_completion(self, args: argparse.Namespace) -> None:
         """Validate Task agent completed full coordination workflow"""
@@ -112,6 +244,9 @@ class TaskCoordinationMonitor:
         with open(task_file, 'r') as f:
             task_record = json.load(f)
         
+        # Materialize completed hooks from the append-only event log
+        self._replay_events(task_id, task_record)
+        
         # Check coordination completion
         completed_hooks = set(task_record.get('completed_hooks', []))
         expected_hooks = set(task_record.get('expected_hooks', []))
@@ -119,99 +254,54 @@ class TaskCoordinationMonitor:
         
         coordination_score = task_record.get('coordination_score', 0.0)
         
-        if coordination_score < 1.0:
-            logger.error(f"❌ INCOMPLETE TASK COORDINATION: {task_id}")
-            self._report_incomplete_coordination(task_id, missing_hooks, coordination_score)
-        else:
-            logger.info(f"✅ Task {task_id} completed full coordination workflow")
-            self._report_successful_coordination(task_id)
-        
-        # Mark task as completed
+        # Mark task as completed before reporting, since an incomplete report exits
         task_record['status'] = 'completed'
         task_record['end_time'] = time.time()
         task_record['duration'] = task_record['end_time'] - task_record['start_time']
         
         with open(task_file, 'w') as f:
             json.dump(task_record, f, indent=2)
+        
+        # Events are now folded into the record
+        self._close_event_log(task_id)
+        (self.task_dir / f'{task_id}.events').unlink(missing_ok=True)
+        
+        if coordination_score < 1.0:
+            logger.error(f"❌ INCOMPLETE TASK COORDINATION: {task_id}")
+            self._report_incomplete_coordination(task_id, missing_hooks, coordination_score)
+        else:
+            logger.info(f"✅ Task {task_id} completed full coordination workflow")
+            self._report_successful_coordination(task_id)
     
     def _analyze_coordination_instructions(self, prompt: str) -> bool:
         """Check if prompt contains required coordination instructions"""
-        coordination_keywords = [
-            'npx claude-flow@alpha hooks pre-task',
-            'npx claude-flow@alpha hooks post-edit',
-            'npx claude-flow@alpha hooks notification', 
-            'npx claude-flow@alpha hooks post-task'
-        ]
-        
-        found_hooks = sum(1 for keyword in coordination_keywords if keyword in prompt)
+        if self._kw_re is not None:
+            found_hooks = len(set(self._kw_re.findall(prompt)))
+        elif self._kw_automaton is not None:
+            found_hooks = len({keyword for _, keyword in self._kw_automaton.iter(prompt)})
+        else:
+            found_hooks = sum(1 for keyword in self.COORDINATION_KEYWORDS if keyword in prompt)
         return found_hooks >= 3  # At least 3 out of 4 hooks should be mentioned
     
     def _report_incomplete_coordination(self, task_id: str, missing_hooks: Set[str], score: float) -> None:
         """Report incomplete Task coordination to Claude"""
-        missing_list = '\n'.join(f"• {hook}" for hook in missing_hooks)
-        
-        error_message = f"""🚨 INCOMPLETE TASK COORDINATION DETECTED!
-
-Task ID: {task_id}
-Coordination Score: {score:.1%}
-Missing coordination hooks:
-{missing_list}
-
-CRITICAL ISSUE: This Task agent did not execute the full coordination workflow!
-
-Required coordination pattern:
-1. START: npx claude-flow@alpha hooks pre-task --description '[task]'
-2. DURING: npx claude-flow@alpha hooks post-edit --file '[file]' 
-3. SHARE: npx claude-flow@alpha hooks notification --message '[decision]'
-4. END: npx claude-flow@alpha hooks post-task --task-id '[task]'
-
-IMMEDIATE ACTION REQUIRED:
-• Terminate this incomplete Task agent
-• Re-spawn with proper coordination instructions
-• Ensure ALL Task agents include full coordination workflow
-• Use swarm coordination patterns for complex tasks
-
-This prevents broken agent coordination and ensures proper swarm execution!"""
-        
-        print(error_message, file=sys.stderr)
+        error_message = _INCOMPLETE_COORDINATION_TMPL.substitute(
+            task_id=task_id,
+            score=f"{score:.1%}",
+            missing_list='\n'.join(f"• {hook}" for hook in missing_hooks)
+        )
+        _write_report(sys.stderr, error_message)
         sys.exit(2)  # Block execution and alert Claude
     
     def _report_successful_coordination(self, task_id: str) -> None:
         """Report successful Task coordination"""
-        success_message = f"""✅ TASK COORDINATION COMPLETE
-
-Task ID: {task_id}
-Status: Full coordination workflow executed
-Score: 100%
-
-All required coordination hooks completed:
-• ✅ pre-task (initialization)
-• ✅ post-edit (progress tracking)  
-• ✅ notification (decision sharing)
-• ✅ post-task (completion)
-
-Agent successfully coordinated with swarm! 🎯"""
-        
-        print(success_message)  # Success info for user
+        success_message = _SUCCESSFUL_COORDINATION_TMPL.substitute(task_id=task_id)
+        _write_report(sys.stdout, success_message)  # Success info for user
     
     def _report_missing_task(self, task_id: str) -> None:
         """Report missing task record"""
-        error_message = f"""❌ TASK MONITORING FAILURE
-
-Task ID: {task_id}
-Issue: No coordination monitoring record found
-
-This suggests the Task agent was spawned without proper monitoring setup!
-
-REQUIRED: All Task agents must:
-1. Be monitored from start to completion
-2. Follow full coordination workflow
-3. Execute all required coordination hooks
-4. Report completion status
-
-Re-spawn Task with proper coordination monitoring!"""
-        
-        print(error_message, file=sys.stderr)
+        error_message = _MISSING_TASK_TMPL.substitute(task_id=task_id)
+        _write_report(sys.stderr, error_message)
         sys.exit(2)  # Block and alert Claude
 
 def main():
@@ -226,15 +316,18 @@ def main():
     args = parser.parse_args()
     monitor = TaskCoordinationMonitor()
     
-    if args.action == 'start':
-        monitor.start_task_monitoring(args)
-    elif args.action == 'track':
-        monitor.track_coordination_hook(args)
-    elif args.action == 'validate':
-        monitor.validate_task_completion(args)
-    else:
-        logger.error(f"Unknown action: {args.action}")
-        sys.exit(1)
+    try:
+        if args.action == 'start':
+            monitor.start_task_monitoring(args)
+        elif args.action == 'track':
+            monitor.track_coordination_hook(args)
+        elif args.action == 'validate':
+            monitor.validate_task_completion(args)
+        else:
+            logger.error(f"Unknown action: {args.action}")
+            sys.exit(1)
+    finally:
+        monitor.close()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
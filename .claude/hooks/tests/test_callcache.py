@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent workflow call cache
+"""
+
+import logging
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from processors.user_prompt import _callcache
+from processors.user_prompt import workflows
+
+
+class CallCacheTestCase(unittest.TestCase):
+    """Points the call cache at a throwaway directory and enables it"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        patches = [
+            mock.patch.object(_callcache, 'CALLCACHE_DIR', Path(self._tmp.name)),
+            mock.patch.object(_callcache, 'CALLCACHE_ENABLED', True),
+            mock.patch.object(_callcache, '_cache', None),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.addCleanup(self._close_cache)
+
+    def _close_cache(self):
+        if _callcache._cache is not None:
+            _callcache._cache.close()
+        self._tmp.cleanup()
+
+    def make_builder(self):
+        """A cached builder that counts how often it really runs"""
+        calls = []
+
+        def build(prompt, workflow):
+            calls.append((prompt, workflow))
+            return f"{workflow}:{prompt}"
+
+        return _callcache.cached(build), calls
+
+
+class TestCached(CallCacheTestCase):
+    """Test the cached decorator"""
+
+    def test_miss_then_hit(self):
+        """Test a repeated call is served from the cache"""
+        build, calls = self.make_builder()
+
+        self.assertEqual(build("p", "chat"), "chat:p")
+        self.assertEqual(build("p", "chat"), "chat:p")
+        self.assertEqual(len(calls), 1)
+
+    def test_key_covers_every_argument(self):
+        """Test calls differing in any argument are cached separately"""
+        build, calls = self.make_builder()
+
+        build("p", "chat")
+        build("p", "debug")
+        build("q", "chat")
+        self.assertEqual(len(calls), 3)
+
+    def test_version_bump_invalidates(self):
+        """Test entries written under an older WORKFLOW_VERSION are ignored"""
+        build, calls = self.make_builder()
+        build("p", "chat")
+
+        with mock.patch.object(_callcache, 'WORKFLOW_VERSION', _callcache.WORKFLOW_VERSION + 1):
+            rebuilt, new_calls = self.make_builder()
+            rebuilt("p", "chat")
+        self.assertEqual(len(new_calls), 1)
+
+    def test_disabled_never_opens_cache(self):
+        """Test the disabled path always runs the function and skips the disk"""
+        build, calls = self.make_builder()
+
+        with mock.patch.object(_callcache, 'CALLCACHE_ENABLED', False):
+            build("p", "chat")
+            build("p", "chat")
+        self.assertEqual(len(calls), 2)
+        self.assertIsNone(_callcache._cache)
+
+    def test_cache_failure_falls_back(self):
+        """Test an unusable cache never breaks the call"""
+        build, calls = self.make_builder()
+
+        with mock.patch.object(_callcache, '_get_cache', side_effect=OSError("disk gone")):
+            self.assertEqual(build("p", "chat"), "chat:p")
+        self.assertEqual(len(calls), 1)
+
+
+class TestCachedWorkflows(CallCacheTestCase):
+    """Test the cached workflow generators"""
+
+    def test_hit_still_logs(self):
+        """Test log output does not depend on cache state"""
+        logger = logging.getLogger('test_callcache')
+        analysis = {'estimated_agents': 2, 'suggested_topology': 'mesh'}
+
+        for _ in range(2):
+            with self.assertLogs(logger, level='INFO') as logs:
+                workflows.run_claude_flow_swarm_orchestration("p", analysis, logger, None)
+            self.assertIn("Generating Claude Flow swarm orchestration instructions", logs.output[0])
+
+    def test_irrelevant_analysis_fields_share_entry(self):
+        """Test fields that do not shape the output do not split the cache"""
+        first = workflows.run_claude_flow_swarm_orchestration(
+            "p", {'estimated_agents': 2, 'confidence': 0.1}, None, None
+        )
+        second = workflows.run_claude_flow_swarm_orchestration(
+            "p", {'estimated_agents': 2, 'confidence': 0.9}, None, None
+        )
+        self.assertEqual(second.output, first.output)
+        self.assertEqual(len(_callcache._get_cache()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the enhanced process manager
+"""
+
+import asyncio
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from processors.user_prompt import enhanced_process_management
+from processors.user_prompt.enhanced_process_management import (
+    EnhancedProcessManager,
+    ExecutionResult,
+    ProcessExecutionRequest,
+)
+
+
+class TestFallbackParallelExecution(unittest.TestCase):
+    """Test the thread pool fallback used when the hook executor is unavailable"""
+
+    def setUp(self):
+        self.manager = EnhancedProcessManager(max_workers=2)
+        self.addCleanup(self.manager.cleanup_all)
+
+        # Stands in for a command that outlives the batch deadline
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def fake_execute(self, request):
+        if request.command == 'slow':
+            self.release.wait(5)
+        return ExecutionResult(
+            command=request.command, return_code=0, stdout=request.command,
+            stderr="", execution_time=0.0, success=True
+        )
+
+    def run_fallback(self, commands, timeout):
+        requests = [ProcessExecutionRequest(command=cmd, timeout=timeout, shell=True) for cmd in commands]
+        with mock.patch.object(self.manager, '_execute_single_request', self.fake_execute):
+            return asyncio.run(self.manager._fallback_parallel_execution(requests))
+
+    def test_results_follow_request_order(self):
+        """Test every request gets its own result, in request order"""
+        results = self.run_fallback(['a', 'b', 'c'], timeout=5)
+        self.assertEqual([r.stdout for r in results], ['a', 'b', 'c'])
+        self.assertTrue(all(r.success for r in results))
+
+    def test_deadline_fails_only_unfinished_requests(self):
+        """Test requests that finished before the deadline keep their results"""
+        with mock.patch.object(enhanced_process_management, 'BATCH_TIMEOUT_BUFFER', 0):
+            results = self.run_fallback(['slow', 'fast1', 'fast2'], timeout=0.2)
+
+        self.assertEqual([r.command for r in results], ['slow', 'fast1', 'fast2'])
+        self.assertFalse(results[0].success)
+        self.assertIn("timed out", results[0].error)
+        self.assertEqual([r.stdout for r in results[1:]], ['fast1', 'fast2'])
+        self.assertTrue(all(r.success for r in results[1:]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for the parallel MCP integration helpers
+"""
+
+import unittest
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from processors.user_prompt.parallel_integration import _flags_for, _flatten_flags
+
+
+class TestFlattenFlags(unittest.TestCase):
+    """Test flattening MCP params into CLI flags"""
+
+    def setUp(self):
+        _flags_for.cache_clear()
+
+    def test_values_become_key_value_pairs(self):
+        """Test plain values keep their order as --key value pairs"""
+        self.assertEqual(
+            _flatten_flags({'b': 'x', 'a': 2, 'c': 1.5}),
+            ('--b', 'x', '--a', '2', '--c', '1.5')
+        )
+
+    def test_booleans_are_bare_flags(self):
+        """Test True adds a bare flag and False adds nothing"""
+        self.assertEqual(_flatten_flags({'force': True, 'dry': False, 'n': 0}), ('--force', '--n', '0'))
+
+    def test_true_and_one_are_cached_separately(self):
+        """Test equal values of different types do not share a cache entry"""
+        self.assertEqual(_flatten_flags({'k': True}), ('--k',))
+        self.assertEqual(_flatten_flags({'k': 1}), ('--k', '1'))
+        self.assertEqual(_flatten_flags({'k': True}), ('--k',))
+
+    def test_repeated_params_hit_the_cache(self):
+        """Test an identical param set is served from the cache"""
+        _flatten_flags({'a': 'x'})
+        _flatten_flags({'a': 'x'})
+        info = _flags_for.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+
+    def test_unhashable_values_bypass_the_cache(self):
+        """Test list and dict values are flattened without being cached"""
+        self.assertEqual(
+            _flatten_flags({'ids': [1, 2], 'opts': {'x': 1}}),
+            ('--ids', '[1, 2]', '--opts', "{'x': 1}")
+        )
+        self.assertEqual(_flags_for.cache_info().currsize, 0)
+
+    def test_empty_params(self):
+        """Test empty params produce no flags"""
+        self.assertEqual(_flatten_flags({}), ())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for the basic process manager
+"""
+
+import os
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+import sys
+
+import psutil
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from processors.user_prompt import process_management
+
+# The module rebinds ProcessManager to the enhanced manager when that imports;
+# the factory's return annotation still names the basic class it defines
+BaseProcessManager = process_management.create_process_manager.__annotations__['return']
+
+
+def _echo(text):
+    """A portable command printing text"""
+    return [sys.executable, '-c', f'print({text!r})']
+
+
+class TestExecuteCommandsParallel(unittest.TestCase):
+    """Test parallel command execution"""
+
+    def setUp(self):
+        self.manager = BaseProcessManager(thread_workers=1)
+        self.addCleanup(self.manager.cleanup_all)
+
+    def test_results_follow_command_order(self):
+        """Test results line up with their commands"""
+        results = self.manager.execute_commands_parallel([_echo('a'), _echo('b'), _echo('c')], timeout=30)
+        self.assertEqual([stdout.strip() for _, stdout, _ in results], ['a', 'b', 'c'])
+        self.assertTrue(all(code == 0 for code, _, _ in results))
+
+    def test_queued_commands_are_not_timed_out(self):
+        """Test commands waiting for a free worker get their own timeout, not a share of one"""
+        sleeper = [sys.executable, '-c', 'import time; time.sleep(0.6)']
+        with mock.patch.object(process_management, 'BATCH_TIMEOUT_BUFFER', 0):
+            results = self.manager.execute_commands_parallel([sleeper] * 3, timeout=1)
+        self.assertEqual([code for code, _, _ in results], [0, 0, 0])
+
+    def test_max_workers_avoids_waiting_on_own_pool(self):
+        """Test a call from a pool task with max_workers does not deadlock the shared pool"""
+        future = self.manager.thread_executor.submit(
+            self.manager.execute_commands_parallel, [_echo('a'), _echo('b')], 30, False, 2
+        )
+        results = future.result(timeout=30)
+        self.assertEqual([stdout.strip() for _, stdout, _ in results], ['a', 'b'])
+
+
+def _gone(proc):
+    """True once a process has exited (a zombie counts: it no longer runs)"""
+    try:
+        return proc.status() == psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return True
+
+
+def _wait_for(predicate, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.02)
+
+
+class TestKillProcessTrees(unittest.TestCase):
+    """Test batched process tree termination"""
+
+    def test_kills_parent_and_descendants(self):
+        """Test each tree is terminated, grandchildren included"""
+        spawner = (
+            "import subprocess, sys, time; "
+            "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)']); "
+            "time.sleep(30)"
+        )
+        procs = [psutil.Popen([sys.executable, '-c', spawner]) for _ in range(2)]
+        for proc in procs:
+            self.addCleanup(lambda p=proc: p.kill() if p.poll() is None else None)
+        _wait_for(lambda: all(proc.children() for proc in procs))
+        victims = [*procs, *(child for proc in procs for child in proc.children())]
+
+        BaseProcessManager().kill_process_trees([proc.pid for proc in procs])
+
+        for proc in procs:
+            proc.wait(timeout=5)
+        _wait_for(lambda: all(_gone(victim) for victim in victims))
+
+    def test_missing_pids_are_skipped(self):
+        """Test a pid that no longer exists is ignored"""
+        proc = psutil.Popen([sys.executable, '-c', 'pass'])
+        proc.wait()
+        BaseProcessManager().kill_process_trees([proc.pid])
+
+
+class TestFindAndKillZombieProcesses(unittest.TestCase):
+    """Test the basic zombie scan"""
+
+    def setUp(self):
+        patch = mock.patch.object(process_management, 'ENHANCED_AVAILABLE', False)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def scan(self, procs):
+        with mock.patch.object(process_management.psutil, 'process_iter', return_value=procs):
+            return process_management.find_and_kill_zombie_processes()
+
+    @staticmethod
+    def fake_proc(**info):
+        proc = mock.Mock()
+        proc.info = {'pid': 4242, 'name': 'node', 'status': psutil.STATUS_RUNNING,
+                     'cmdline': None, 'create_time': time.time(), 'ppid': 1, **info}
+        return proc
+
+    def test_own_zombie_child_is_reaped(self):
+        """Test a zombie child of this process is reaped with waitpid"""
+        child = psutil.Popen([sys.executable, '-c', 'pass'])
+        _wait_for(lambda: child.status() == psutil.STATUS_ZOMBIE)
+        child.info = child.as_dict(['pid', 'name', 'status', 'cmdline', 'create_time', 'ppid'])
+
+        self.assertEqual(self.scan([child]), 1)
+        with self.assertRaises(ChildProcessError):
+            os.waitpid(child.pid, os.WNOHANG)
+
+    def test_foreign_zombie_nudges_parent(self):
+        """Test another process's zombie gets its parent a SIGCHLD and is not counted"""
+        zombie = self.fake_proc(status=psutil.STATUS_ZOMBIE, ppid=4000)
+        with mock.patch.object(process_management.os, 'kill') as kill:
+            self.assertEqual(self.scan([zombie]), 0)
+        kill.assert_called_once_with(4000, process_management.signal.SIGCHLD)
+
+    def test_only_old_claude_flow_processes_are_killed(self):
+        """Test the age threshold and the marker match over the whole argv"""
+        old = self.fake_proc(cmdline=['node', '/opt/claude-flow/cli.js'], create_time=time.time() - 1000)
+        young = self.fake_proc(cmdline=['node', '/opt/claude-flow/cli.js'])
+        other = self.fake_proc(cmdline=['node', 'server.js'], create_time=time.time() - 1000)
+        kernel_thread = self.fake_proc(cmdline=[], create_time=time.time() - 1000)
+
+        self.assertEqual(self.scan([old, young, other, kernel_thread]), 1)
+        old.terminate.assert_called_once()
+        for proc in (young, other, kernel_thread):
+            proc.terminate.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for the Task coordination monitor's hook event log
+"""
+
+import argparse
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from task_coordination_monitor import TaskCoordinationMonitor
+
+ALL_HOOKS = ('pre-task', 'post-edit', 'notification', 'post-task')
+
+
+class TestCoordinationEventLog(unittest.TestCase):
+    """Test tracking hooks through the append-only event log"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.monitor = TaskCoordinationMonitor()
+        self.monitor.task_dir = Path(tmp.name)
+        self.addCleanup(self.monitor.close)
+
+        self.start()
+        self.task_file = self.monitor.task_dir / 't1.json'
+        self.events_file = self.monitor.task_dir / 't1.events'
+
+    def start(self):
+        self.monitor.start_task_monitoring(
+            argparse.Namespace(task_id='t1', description='d', prompt='p')
+        )
+
+    def track(self, *hooks):
+        for hook in hooks:
+            self.monitor.track_coordination_hook(argparse.Namespace(task_id='t1', hook_type=hook))
+
+    def validate(self):
+        """Validate t1, returning the exit code (None when it did not exit)"""
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            try:
+                self.monitor.validate_task_completion(argparse.Namespace(task_id='t1'))
+            except SystemExit as e:
+                return e.code
+        return None
+
+    def test_track_then_validate(self):
+        """Test tracked hooks are folded into the record on validate"""
+        self.track(*ALL_HOOKS, 'post-edit')
+
+        self.assertIsNone(self.validate())
+        record = json.loads(self.task_file.read_text())
+        self.assertEqual(record['completed_hooks'], list(ALL_HOOKS))
+        self.assertEqual(record['coordination_score'], 1.0)
+        self.assertEqual(record['status'], 'completed')
+
+    def test_events_file_removed_after_validate(self):
+        """Test the event log is deleted once folded into the record"""
+        self.track(*ALL_HOOKS)
+        self.assertTrue(self.events_file.exists())
+
+        self.validate()
+        self.assertFalse(self.events_file.exists())
+
+    def test_malformed_and_torn_lines_are_skipped(self):
+        """Test bad lines in the event log do not stop the replay"""
+        self.track('pre-task', 'post-edit')
+        self.monitor.close()
+        with open(self.events_file, 'a') as f:
+            f.write('not json\n')
+            f.write('{"t":1,"other":"x"}\n')
+            f.write('[1, 2]\n')
+            f.write('{"t":1,"hook":"notifica')  # torn final write
+
+        record = json.loads(self.task_file.read_text())
+        self.monitor._replay_events('t1', record)
+        self.assertEqual(record['completed_hooks'], ['pre-task', 'post-edit'])
+        self.assertEqual(record['coordination_score'], 0.5)
+
+    def test_incomplete_coordination_blocks(self):
+        """Test validating with missing hooks exits with code 2 after saving the record"""
+        self.track('pre-task')
+        self.assertEqual(self.validate(), 2)
+
+        record = json.loads(self.task_file.read_text())
+        self.assertEqual(record['status'], 'completed')
+        self.assertEqual(record['completed_hooks'], ['pre-task'])
+        self.assertFalse(self.events_file.exists())
+
+    def test_restart_does_not_replay_old_events(self):
+        """Test a restarted task only counts hooks tracked since the restart"""
+        self.track('pre-task', 'post-edit', 'notification')
+        self.assertEqual(self.validate(), 2)
+
+        self.start()
+        self.track('post-task')
+        self.assertEqual(self.validate(), 2)
+        record = json.loads(self.task_file.read_text())
+        self.assertEqual(record['completed_hooks'], ['post-task'])
+
+    def test_restart_discards_unvalidated_events(self):
+        """Test starting a task again drops events left by a run never validated"""
+        self.track('pre-task')
+        self.start()
+        self.assertFalse(self.events_file.exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for the workflow instruction generators
+"""
+
+import json
+import pickle
+import unittest
+from pathlib import Path
+from unittest import mock
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from processors.user_prompt import _callcache
+from processors.user_prompt.workflows import (
+    GitHubSwarmInstructions,
+    SwarmInstructions,
+    ZenInstructions,
+    _InstructionResult,
+    _generate_coordination_output_fast,
+    _iter_coordination_lines,
+    generate_coordination_output,
+    run_claude_flow_swarm_orchestration,
+    run_github_claude_flow_orchestration,
+    run_zen_consultation_functional,
+)
+
+
+class TestInstructionResults(unittest.TestCase):
+    """Test the lazy instruction result objects"""
+
+    def setUp(self):
+        # Keep the persistent call cache out of the way of generator tests
+        patch = mock.patch.object(_callcache, 'CALLCACHE_ENABLED', False)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_base_is_abstract(self):
+        """Test the base result cannot be instantiated without render()"""
+        with self.assertRaises(TypeError):
+            _InstructionResult()
+
+    def test_swarm_to_dict_matches_old_shape(self):
+        """Test the swarm result rebuilds the old result dict"""
+        result = run_claude_flow_swarm_orchestration(
+            "build it", {'estimated_agents': 2, 'suggested_topology': 'mesh'}, None, None
+        )
+        self.assertIsInstance(result, SwarmInstructions)
+        self.assertEqual(result.spawned_agents, ['coordinator', 'researcher'])
+
+        as_dict = result.to_dict()
+        self.assertEqual(list(as_dict), ['success', 'spawned_agents', 'output'])
+        self.assertTrue(as_dict['success'])
+        self.assertEqual(as_dict['output'], result.output)
+        self.assertEqual(json.loads(json.dumps(as_dict)), as_dict)
+
+    def test_github_to_dict_matches_old_shape(self):
+        """Test the GitHub swarm result rebuilds the old result dict"""
+        result = run_github_claude_flow_orchestration(
+            "review pr", {'suggested_operations': ['list_issues']}, None, None
+        )
+        self.assertIsInstance(result, GitHubSwarmInstructions)
+        self.assertIsInstance(result.spawned_agents, list)
+
+        as_dict = result.to_dict()
+        self.assertEqual(list(as_dict), ['success', 'spawned_agents', 'operations', 'output'])
+        self.assertIn('mcp__github__list_issues', as_dict['output'])
+        json.dumps(as_dict)
+
+    def test_zen_to_dict_matches_old_shape(self):
+        """Test the Zen result rebuilds the old result dict"""
+        result = run_zen_consultation_functional(
+            {'prompt': "why"}, {'suggested_workflow': 'debug', 'complexity': 'high'}, None, None
+        )
+        self.assertIsInstance(result, ZenInstructions)
+        self.assertEqual(list(result.to_dict()), ['success', 'workflow', 'output', 'consultation_params'])
+
+    def test_dict_style_reads(self):
+        """Test the dict-style accessors of the old result dicts"""
+        result = SwarmInstructions("p", 'mesh', 1, ['coordinator'])
+        self.assertTrue(result['success'])
+        self.assertEqual(result['output'], result.output)
+        self.assertEqual(result.get('missing', 'default'), 'default')
+        with self.assertRaises(KeyError):
+            result['missing']
+
+    def test_pickling_stays_lazy(self):
+        """Test pickling an unrendered result does not render it"""
+        result = SwarmInstructions("p", 'mesh', 1, ['coordinator'])
+        restored = pickle.loads(pickle.dumps(result))
+        self.assertNotIn('output', result.__dict__)
+        self.assertNotIn('output', restored.__dict__)
+        self.assertEqual(restored.output, result.output)
+
+
+class TestCoordinationOutput(unittest.TestCase):
+    """Test the coordination output renderers"""
+
+    def test_low_general_fast_path_matches_full_path(self):
+        """Test the prerendered general/low template never drifts from the full renderer"""
+        cases = [
+            ({}, {'complexity': 'low'}),
+            ({'agent_count': 3, 'coordination_strategy': 'mesh'},
+             {'complexity': 'low', 'confidence': 0.87, 'suggested_workflow': 'debug'}),
+            ({'agent_count': 8}, {'complexity': 'LOW', 'confidence': 1.0, 'type': 'general'}),
+        ]
+        for judgment, analysis in cases:
+            with self.subTest(judgment=judgment, analysis=analysis):
+                full = '\n'.join(_iter_coordination_lines(judgment, analysis, None, analysis['complexity']))
+                self.assertEqual(_generate_coordination_output_fast(judgment, analysis), full)
+
+                judgment_with_analysis = {**judgment, 'prompt_analysis': analysis}
+                self.assertEqual(generate_coordination_output(judgment_with_analysis), full)
+
+
+if __name__ == '__main__':
+    unittest.main()